@@ -6,7 +6,7 @@ from flask import Flask, request, jsonify, send_file, render_template_string
 import json, time
 
 from script_engine.audio.tts_renderer import render_block
-from script_engine.audio.mixer import mix_scene
+from script_engine.audio.mixer import mix_scene, check_id
 
 # ---------------------------------------------------------
 # DIRECTORIES
@@ -96,21 +96,59 @@ def serve_audio(filename):
 def render_scene():
     try:
         data = request.json
-        scene_id = data["scene_id"]
+        scene_id = check_id(data["scene_id"])
         blocks = data["audio_blocks"]
+        for blk in blocks:
+            check_id(blk["block_type"], "block_type")
 
         block_paths = []
         for blk in blocks:
             p = render_block(blk, scene_id)
             block_paths.append(p)
 
-        final_audio = mix_scene(scene_id, block_paths)
+        final_audio = mix_scene(scene_id, [p for p in block_paths if p])
 
         return jsonify({
             "status": "ok",
             "final_audio": final_audio
         })
 
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+# ---------------------------------------------------------
+# STREAMED RENDER — one block at a time, mix when the stream closes
+# ---------------------------------------------------------
+@app.route("/render_block", methods=["POST"])
+def render_single_block():
+    try:
+        data = request.json
+        check_id(data["scene_id"])
+        check_id(data["block"]["block_type"], "block_type")
+        path = render_block(data["block"], data["scene_id"])
+        if not path:
+            return jsonify({"status": "error", "message": "tts failed"}), 502
+        return jsonify({"status": "ok", "path": path})
+
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@app.route("/mix_scene", methods=["POST"])
+def mix_rendered_scene():
+    try:
+        data = request.json
+        final_audio = mix_scene(data["scene_id"], [p for p in data["block_paths"] if p])
+        return jsonify({"status": "ok", "final_audio": final_audio})
+
+    except ValueError as e:
+        # scene_id / block path rejected by mixer (outside AUDIO_DIR)
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -20,6 +20,7 @@ import json
 import time
 from datetime import datetime
 
+from script_engine.jsonio import write_json
 from script_engine.script_engine_v3 import generate_script
 from script_engine.director.director_brain import ProgrammingDirector
 from script_engine.audio.audio_block_renderer import render_script_sequence
@@ -59,8 +60,7 @@ def write_broadcast_block(block):
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
     out_path = f"{DATA}/broadcast/block_{ts}.json"
 
-    with open(out_path, "w") as f:
-        json.dump(block, f, indent=2)
+    write_json(out_path, block)
 
     print(f"[Broadcast] ✔ Wrote block → {out_path}")
     return out_path
@@ -10,6 +10,8 @@ import json
 from datetime import datetime
 from shutil import copy2
 
+from script_engine.jsonio import write_json
+
 BASE = "/var/www/toknnews-live/data"
 SHOW_ROOT = f"{BASE}/shows"
 BROADCAST_ROOT = f"{BASE}/broadcast"
@@ -58,8 +60,7 @@ def assemble_show(block_files):
 
     # Write episode metadata
     meta_path = os.path.join(show_dir, "episode.json")
-    with open(meta_path, "w") as f:
-        json.dump(episode_meta, f, indent=2)
+    write_json(meta_path, episode_meta)
 
     # === Build master episode-level mix ===
     from .episode_mixer import build_episode_mix
@@ -67,7 +68,6 @@ def assemble_show(block_files):
     episode_meta["episode_master_mix"] = os.path.basename(master_mix) if master_mix else None
 
     # rewrite metadata to include master mix
-    with open(meta_path, "w") as f:
-        json.dump(episode_meta, f, indent=2)
+    write_json(meta_path, episode_meta)
 
     return show_dir
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import os, json, glob, datetime
+import os, sys, json, glob, datetime
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import write_json
 
 SCENES_DIR = "/var/www/toknnews/data/scenes"
 OUT_PATH   = "/var/www/toknnews/data/scenes.json"
@@ -45,8 +47,7 @@ def main():
 
     data["generated_at"] = datetime.datetime.utcnow().isoformat()
 
-    with open(OUT_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    write_json(OUT_PATH, data)
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,6 @@
-import json, os
+import json, os, sys
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import write_json
 from datetime import datetime, timezone
 
 base = "/var/www/toknnews/data"
@@ -50,7 +52,6 @@ index = {
     "counts": daily_counts
 }
 
-with open(os.path.join(base, "scenes_index.json"), "w") as f:
-    json.dump(index, f, indent=2)
+write_json(os.path.join(base, "scenes_index.json"), index)
 
 print("✅ scenes_index.json rebuilt (MM/DD/YY).")
@@ -5,7 +5,9 @@ Handles atomic writes, validation, compile logging,
 and continuity tracking.
 """
 
-import os, json, time, tempfile, shutil
+import os, sys, json, time, tempfile, shutil
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import dumpb
 
 DATA_DIR = "/var/www/toknnews/data"
 LOG_FILE = os.path.join(DATA_DIR, "compile_log.jsonl")
@@ -17,8 +19,8 @@ CONTINUITY_FILE = os.path.join(DATA_DIR, "continuity_log.json")
 def atomic_write(path: str, data: dict | list):
     """Write JSON atomically to avoid corruption."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    tmp = tempfile.NamedTemporaryFile("w", delete=False, dir=os.path.dirname(path))
-    json.dump(data, tmp, indent=2)
+    tmp = tempfile.NamedTemporaryFile("wb", delete=False, dir=os.path.dirname(path))
+    tmp.write(dumpb(data))
     tmp.flush()
     os.fsync(tmp.fileno())
     tmp.close()
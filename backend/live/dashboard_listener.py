@@ -104,6 +104,63 @@ async def get_system_stats():
     except Exception as e:
         return {"error": str(e)}
 
+# ------------------------------------------------------------
+# Scene queries (indexed, filtered server-side)
+# ------------------------------------------------------------
+from db import (fetch_recent, fetch_recent_by_source, fetch_recent_by_character,
+                fetch_range_by_day, load_script, load_script_by_ref)
+
+def _scene_list(rows):
+    # list views never need the full structured script
+    for r in rows:
+        r.pop("script", None)
+    return rows
+
+@app.get("/api/scenes")
+def get_scenes(source: str = None, character: str = None, limit: int = 50):
+    limit = max(1, min(limit, 1000))
+    try:
+        if source:
+            rows = fetch_recent_by_source(source, limit)
+        elif character:
+            rows = fetch_recent_by_character(character, limit)
+        else:
+            rows = fetch_recent(limit)
+        return JSONResponse(_scene_list(rows))
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+@app.get("/api/scenes/day/{day}")
+def get_scenes_for_day(day: str, days: int = 1):
+    try:
+        return JSONResponse(_scene_list(fetch_range_by_day(day, max(1, min(days, 60)))))
+    except ValueError:
+        return JSONResponse({"error": "day must be YYYY-MM-DD"}, status_code=400)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+@app.get("/api/scene/{scene_id}/script")
+def get_scene_script(scene_id: str):
+    # script bodies are only decompressed when a specific scene is opened
+    try:
+        script = load_script(scene_id)
+        if script is None:
+            return JSONResponse({"error": "not found"}, status_code=404)
+        return JSONResponse(script)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+@app.get("/api/script/{script_ref}")
+def get_script_by_ref(script_ref: str):
+    # scenes.json / snapshot entries carry script_ref instead of the body
+    try:
+        script = load_script_by_ref(script_ref)
+        if script is None:
+            return JSONResponse({"error": "not found"}, status_code=404)
+        return JSONResponse(script)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
 # ------------------------------------------------------------
 # WebSocket push
 # ------------------------------------------------------------
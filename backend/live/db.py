@@ -2,25 +2,224 @@
 # =========================================================
 # TOKNNews Database Utility Layer  (SQLite)
 # =========================================================
+# • One shared connection per thread (no reconnect per call)
+# • WAL journal so prompt worker, compiler and dashboard
+#   readers stop blocking each other
+# • Tuned pragmas + prepared-statement cache
+# • Schema migrations run once per process (user_version)
+# • executemany batch insert / update APIs
+# • Script bodies live in a compressed, content-addressed
+#   blob table; scene rows keep only a script_ref digest
+# =========================================================
 import sqlite3
 import os
-from contextlib import contextmanager
+import sys
+import json
+import zlib
+import hashlib
+import threading
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta, timezone
+
+try:
+    import zstandard as zstd
+except ImportError:  # optional — zlib fallback keeps blobs readable
+    zstd = None
 
 DB_PATH = "/var/www/toknnews/data/toknnews.db"
 
-# Ensure DB exists
-if not os.path.exists(DB_PATH):
-    raise FileNotFoundError(f"Database not found: {DB_PATH}")
+# Applied to every new connection (order matters: WAL first)
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),    # durable under WAL, no fsync per commit
+    ("cache_size", -65536),       # 64 MB page cache (negative = KiB)
+    ("mmap_size", 268435456),     # 256 MB memory-mapped reads
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 30000),
+)
+STATEMENT_CACHE = 256  # prepared statements kept per connection
+ZSTD_LEVEL = 6         # script blobs: good ratio, fast decode
 
-@contextmanager
-def get_conn():
-    """Context-managed connection with row factory and safe close."""
-    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+_local = threading.local()
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+# ---------------------------------------------------------
+#  Schema migrations (append only — never edit a shipped step)
+# ---------------------------------------------------------
+# The ledger (prompt worker) and the scene compiler share the
+# `scenes` table; v1 gives it the union of both column sets.
+SCENE_COLUMNS = (
+    ("id", "TEXT PRIMARY KEY"),
+    ("time", "TEXT"),
+    ("character", "TEXT"),
+    ("topic", "TEXT"),
+    ("source", "TEXT"),
+    ("script", "TEXT"),
+    ("status", "TEXT"),
+    ("reply_to", "TEXT"),
+    ("characters", "TEXT"),
+    ("hash", "TEXT"),
+    ("headline", "TEXT"),
+    ("sentiment", "TEXT"),
+    ("url", "TEXT"),
+    ("summary", "TEXT"),
+    ("sora_prompt", "TEXT"),
+    ("prompt_score", "REAL"),
+    ("render_status", "TEXT"),
+    ("created_at", "TEXT DEFAULT CURRENT_TIMESTAMP"),
+)
+
+def _migrate_v1(conn):
+    """Unified scenes table; add any columns an older schema lacks."""
+    cols = ", ".join(f"{name} {decl}" for name, decl in SCENE_COLUMNS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS scenes ({cols});")
+    have = {row[1] for row in conn.execute("PRAGMA table_info(scenes);")}
+    for name, decl in SCENE_COLUMNS:
+        if name not in have:
+            # ALTER TABLE cannot add PRIMARY KEY / non-constant defaults
+            decl = decl.split(" ")[0]
+            conn.execute(f"ALTER TABLE scenes ADD COLUMN {name} {decl};")
+
+def _migrate_v2(conn):
+    """Indexes for dedupe / recency / per-source / per-character queries.
+
+    `time` holds naive-UTC ISO-8601 so range scans compare lexicographically;
+    ledger rows written before v2 only had created_at, so backfill from it.
+    """
+    conn.execute("""UPDATE scenes SET time = REPLACE(created_at, ' ', 'T')
+                    WHERE time IS NULL AND created_at IS NOT NULL;""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scenes_hash_time ON scenes(hash, time);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scenes_time ON scenes(time);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scenes_source_time ON scenes(source, time);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_scenes_character_time ON scenes(character, time);")
+    conn.execute("ANALYZE scenes;")
+
+def _migrate_v3(conn):
+    """Move script payloads out of the hot scenes table into script_blobs."""
+    conn.execute("""CREATE TABLE IF NOT EXISTS script_blobs (
+                        digest TEXT PRIMARY KEY,
+                        codec TEXT NOT NULL,
+                        raw_size INTEGER NOT NULL,
+                        body BLOB NOT NULL);""")
+    have = {row[1] for row in conn.execute("PRAGMA table_info(scenes);")}
+    if "script_ref" not in have:
+        conn.execute("ALTER TABLE scenes ADD COLUMN script_ref TEXT;")
+    rows = conn.execute("""SELECT id, script FROM scenes
+                           WHERE script IS NOT NULL AND script_ref IS NULL;""").fetchall()
+    for scene_id, script in rows:
+        try:
+            payload = json.loads(script)
+        except Exception:
+            payload = script
+        ref = _put_script(conn, payload)
+        conn.execute("UPDATE scenes SET script_ref = ?, script = NULL WHERE id = ?;",
+                     (ref, scene_id))
+
+def _migrate_v4(conn):
+    """Backfill the dedupe hash on compiler rows written without one.
+
+    is_duplicate() only sees rows with a hash; older compiler rows kept it
+    in scenes.json alone. Same key as the compiler: md5("source:title").
+    Ledger rows (no topic) are left alone so they never block a compile.
+    """
+    rows = conn.execute("""SELECT id, source, topic FROM scenes
+                           WHERE hash IS NULL AND topic IS NOT NULL;""").fetchall()
+    conn.executemany("UPDATE scenes SET hash = ? WHERE id = ?;",
+                     [(hashlib.md5(f"{source}:{topic}".encode()).hexdigest(), scene_id)
+                      for scene_id, source, topic in rows])
+
+MIGRATIONS = [
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+    _migrate_v4,
+]
+
+
+def migrate(conn):
+    """Apply pending migrations, tracked in PRAGMA user_version."""
+    version = conn.execute("PRAGMA user_version;").fetchone()[0]
+    pending = MIGRATIONS[version:]
+    if not pending:
+        return version
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        # Re-read under the write lock: another process may have won
+        version = conn.execute("PRAGMA user_version;").fetchone()[0]
+        for step in MIGRATIONS[version:]:
+            step(conn)
+        conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)};")
+        conn.execute("COMMIT;")
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+    return len(MIGRATIONS)
+
+
+# ---------------------------------------------------------
+#  Connections
+# ---------------------------------------------------------
+def _connect(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(
+        path,
+        timeout=30,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE,
+    )
     conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value};")
+
+    # Migrations run once per process, not on every write
+    with _migrate_lock:
+        if path not in _migrated:
+            migrate(conn)
+            _migrated.add(path)
+    return conn
+
+
+def shared_conn(path=None):
+    """Return this thread's long-lived connection to `path` (default DB_PATH)."""
+    path = path or DB_PATH
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns[path] = _connect(path)
+    return conn
+
+
+def close_conn(path=None):
+    """Close this thread's shared connection (e.g. before fork)."""
+    path = path or DB_PATH
+    conns = getattr(_local, "conns", {})
+    conn = conns.pop(path, None)
+    if conn is not None:
+        conn.close()
+
+
+@contextmanager
+def get_conn(path=None):
+    """Context-managed access to the shared connection (autocommit)."""
+    yield shared_conn(path)
+
+
+@contextmanager
+def transaction(path=None):
+    """Group several statements into one write transaction."""
+    conn = shared_conn(path)
+    conn.execute("BEGIN IMMEDIATE;")
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        conn.execute("ROLLBACK;")
+        raise
+    conn.execute("COMMIT;")
+
 
 def init_db():
     """Re-initialize schema if needed."""
@@ -31,26 +230,247 @@ def init_db():
         schema = f.read()
     with get_conn() as conn:
         conn.executescript(schema)
+        migrate(conn)
+
+
+# ---------------------------------------------------------
+#  Statements (module constants so the statement cache hits)
+# ---------------------------------------------------------
+INSERT_SCENE_SQL = """INSERT OR IGNORE INTO scenes
+             (id, headline, source, sentiment, url, time)
+             VALUES (?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%S', 'now'));"""
+
+UPDATE_PROMPT_SQL = """UPDATE scenes
+             SET summary=?, sora_prompt=?, prompt_score=?, render_status='ready'
+             WHERE id=?;"""
+
+SAVE_COMPILED_SQL = """INSERT OR REPLACE INTO scenes
+             (id, time, character, topic, source, script_ref, status, reply_to, characters, hash)
+             VALUES (:id, :time, :character, :topic, :source, :script_ref, :status,
+                     :reply_to, :characters, :hash);"""
+
+FETCH_RECENT_SQL = "SELECT * FROM scenes ORDER BY time DESC LIMIT ?;"
+
+# Indexed lookups — each must resolve to an index SEARCH (see check_query_plans)
+DUPLICATE_SQL = "SELECT 1 FROM scenes WHERE hash = ? AND time >= ? LIMIT 1;"
+
+RECENT_BY_SOURCE_SQL = """SELECT * FROM scenes WHERE source = ?
+             ORDER BY time DESC LIMIT ?;"""
+
+RECENT_BY_CHARACTER_SQL = """SELECT * FROM scenes WHERE character = ?
+             ORDER BY time DESC LIMIT ?;"""
+
+RANGE_SQL = """SELECT * FROM scenes WHERE time >= ? AND time < ?
+             ORDER BY time;"""
+
+COUNT_BY_DAY_SQL = """SELECT substr(time, 1, 10) AS day, COUNT(*) AS n
+             FROM scenes WHERE time >= ? GROUP BY day ORDER BY day;"""
+
+INDEXED_QUERIES = {
+    # name: (sql, sample params, index the plan must use)
+    "duplicate_in_window": (DUPLICATE_SQL, ("h", "2000-01-01T00:00:00"), "idx_scenes_hash_time"),
+    "recent": (FETCH_RECENT_SQL, (10,), "idx_scenes_time"),
+    "recent_by_source": (RECENT_BY_SOURCE_SQL, ("RSS", 10), "idx_scenes_source_time"),
+    "recent_by_character": (RECENT_BY_CHARACTER_SQL, ("chip", 10), "idx_scenes_character_time"),
+    "range_by_day": (RANGE_SQL, ("2000-01-01", "2000-01-02"), "idx_scenes_time"),
+    "count_by_day": (COUNT_BY_DAY_SQL, ("2000-01-01",), "idx_scenes_time"),
+}
+
+
+def to_utc_iso(value):
+    """Normalize an ISO timestamp (any offset, or 'Z') to naive-UTC ISO text."""
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except Exception:
+        return None
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat(timespec="seconds")
+
+
+# ---------------------------------------------------------
+#  Script blobs — content-addressed, compressed, loaded lazily
+# ---------------------------------------------------------
+PUT_SCRIPT_SQL = """INSERT OR IGNORE INTO script_blobs (digest, codec, raw_size, body)
+             VALUES (?, ?, ?, ?);"""
+
+LOAD_SCRIPT_SQL = """SELECT b.codec, b.body FROM scenes s
+             JOIN script_blobs b ON b.digest = s.script_ref
+             WHERE s.id = ?;"""
+
+LOAD_SCRIPT_REF_SQL = "SELECT codec, body FROM script_blobs WHERE digest = ?;"
+
+
+def encode_script(payload):
+    """Canonical JSON → (digest, codec, raw_size, compressed body)."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"),
+                     ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    if zstd is not None:
+        return digest, "zstd", len(raw), zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return digest, "zlib", len(raw), zlib.compress(raw, 6)
+
+
+def decode_script(codec, body):
+    if codec == "zstd":
+        if zstd is None:
+            raise RuntimeError("script blob is zstd-compressed but zstandard is not installed")
+        raw = zstd.ZstdDecompressor().decompress(body)
+    else:
+        raw = zlib.decompress(body)
+    return json.loads(raw)
+
+
+def script_digest(payload):
+    """Digest a payload would be stored under (no DB access)."""
+    return encode_script(payload)[0]
+
+
+def _put_script(conn, payload):
+    digest, codec, size, body = encode_script(payload)
+    conn.execute(PUT_SCRIPT_SQL, (digest, codec, size, body))
+    return digest
+
 
 def insert_scene(scene_id, headline, source, sentiment=None, url=None):
     """Insert a new scene record (compiler-safe)."""
-    sql = """INSERT OR IGNORE INTO scenes
-             (id, headline, source, sentiment, url)
-             VALUES (?, ?, ?, ?, ?);"""
     with get_conn() as conn:
-        conn.execute(sql, (scene_id, headline, source, sentiment, url))
+        conn.execute(INSERT_SCENE_SQL, (scene_id, headline, source, sentiment, url))
+
+def insert_scenes(rows):
+    """Batch insert_scene: rows of (scene_id, headline, source, sentiment, url)."""
+    rows = list(rows)
+    if not rows:
+        return 0
+    with transaction() as conn:
+        conn.executemany(INSERT_SCENE_SQL, rows)
+    return len(rows)
 
 def update_prompt(scene_id, summary, sora_prompt, score):
     """Update summary + Sora prompt once generated."""
-    sql = """UPDATE scenes
-             SET summary=?, sora_prompt=?, prompt_score=?, render_status='ready'
-             WHERE id=?;"""
     with get_conn() as conn:
-        conn.execute(sql, (summary, sora_prompt, score, scene_id))
+        conn.execute(UPDATE_PROMPT_SQL, (summary, sora_prompt, score, scene_id))
+
+def update_prompts(rows):
+    """Batch update_prompt: rows of (scene_id, summary, sora_prompt, score)."""
+    params = [(summary, prompt, score, scene_id) for scene_id, summary, prompt, score in rows]
+    if not params:
+        return 0
+    with transaction() as conn:
+        conn.executemany(UPDATE_PROMPT_SQL, params)
+    return len(params)
+
+def save_compiled_scene(scene):
+    """
+    Upsert one compiler scene dict. The structured script (dict or JSON
+    string) goes to script_blobs; the scenes row only keeps its digest.
+    Returns the script_ref digest (None if the scene has no script).
+    """
+    script = scene.get("script")
+    if isinstance(script, str):
+        try:
+            script = json.loads(script)
+        except Exception:
+            pass
+    row = {name: scene.get(name) for name in
+           ("id", "time", "character", "topic", "source",
+            "status", "reply_to", "characters", "hash")}
+    with transaction() as conn:
+        row["script_ref"] = _put_script(conn, script) if script is not None else None
+        conn.execute(SAVE_COMPILED_SQL, row)
+    return row["script_ref"]
+
+def store_script(payload):
+    """Store a script body on its own; returns its digest."""
+    with get_conn() as conn:
+        return _put_script(conn, payload)
+
+def load_script(scene_id):
+    """Full structured script for one scene, or None."""
+    with get_conn() as conn:
+        row = conn.execute(LOAD_SCRIPT_SQL, (scene_id,)).fetchone()
+    return decode_script(row["codec"], row["body"]) if row else None
+
+def load_script_by_ref(digest):
+    """Full structured script by content digest (scenes.json script_ref)."""
+    with get_conn() as conn:
+        row = conn.execute(LOAD_SCRIPT_REF_SQL, (digest,)).fetchone()
+    return decode_script(row["codec"], row["body"]) if row else None
 
 def fetch_recent(limit=10):
     """Fetch most recent scenes."""
-    sql = "SELECT * FROM scenes ORDER BY created_at DESC LIMIT ?;"
     with get_conn() as conn:
-        cur = conn.execute(sql, (limit,))
+        cur = conn.execute(FETCH_RECENT_SQL, (limit,))
+        return [dict(row) for row in cur.fetchall()]
+
+def is_duplicate(scene_hash, window_hours=24):
+    """True if a scene with this hash was stored within the window."""
+    since = (datetime.utcnow() - timedelta(hours=window_hours)).isoformat(timespec="seconds")
+    with get_conn() as conn:
+        return conn.execute(DUPLICATE_SQL, (scene_hash, since)).fetchone() is not None
+
+def fetch_recent_by_source(source, limit=50):
+    """Newest scenes from one source."""
+    with get_conn() as conn:
+        cur = conn.execute(RECENT_BY_SOURCE_SQL, (source, limit))
+        return [dict(row) for row in cur.fetchall()]
+
+def fetch_recent_by_character(character, limit=50):
+    """Newest scenes led by one character."""
+    with get_conn() as conn:
+        cur = conn.execute(RECENT_BY_CHARACTER_SQL, (character, limit))
+        return [dict(row) for row in cur.fetchall()]
+
+def fetch_range_by_day(day, days=1):
+    """Scenes from `day` (YYYY-MM-DD, UTC) spanning `days` days, oldest first."""
+    start = datetime.strptime(day, "%Y-%m-%d")
+    end = start + timedelta(days=days)
+    with get_conn() as conn:
+        cur = conn.execute(RANGE_SQL, (start.isoformat(), end.isoformat()))
         return [dict(row) for row in cur.fetchall()]
+
+def count_by_day(since_day):
+    """{YYYY-MM-DD: scene count} for every day on or after since_day."""
+    with get_conn() as conn:
+        return {row["day"]: row["n"] for row in conn.execute(COUNT_BY_DAY_SQL, (since_day,))}
+
+
+# ---------------------------------------------------------
+#  Query-plan guard: fail if an indexed query falls back to a scan
+# ---------------------------------------------------------
+def check_query_plans(path=None):
+    """
+    Run EXPLAIN QUERY PLAN over INDEXED_QUERIES.
+    Returns {name: [plan details]}; raises AssertionError listing any
+    query that scans the table, uses the wrong index, or sorts in a
+    temp B-tree instead of walking the index.
+    """
+    plans, bad = {}, []
+    shared_conn(path)  # make sure migrations (and indexes) are applied
+    # Fresh, uncached connection: cached EXPLAIN statements can outlive DDL
+    conn = sqlite3.connect(path or DB_PATH, cached_statements=0)
+    conn.row_factory = sqlite3.Row
+    with closing(conn):
+        for name, (sql, params, index) in INDEXED_QUERIES.items():
+            rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+            details = [row["detail"] for row in rows]
+            plans[name] = details
+            if not any(f"INDEX {index}" in d for d in details):
+                bad.append(f"{name}: expected {index}, got {' | '.join(details)}")
+            for d in details:
+                if "TEMP B-TREE FOR ORDER BY" in d:
+                    bad.append(f"{name}: {d}")
+    if bad:
+        raise AssertionError("Unindexed scene queries:\n  " + "\n  ".join(bad))
+    return plans
+
+if __name__ == "__main__":
+    # python3 db.py [--check-plans] [db_path]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if "--check-plans" in sys.argv:
+        try:
+            for name, details in check_query_plans(args[0] if args else None).items():
+                print(f"[DB] ✅ {name}: {' | '.join(details)}")
+        except AssertionError as e:
+            print(f"[DB] ❌ {e}")
+            sys.exit(1)
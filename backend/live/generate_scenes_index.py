@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import os, json, glob, datetime
+import os, sys, json, glob, datetime
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import write_json
 
 SCENES_DIR = "/var/www/toknnews/data/scenes"
 OUT_PATH   = "/var/www/toknnews/data/scenes_index.json"
@@ -29,8 +31,7 @@ def main():
         "count": len(items),
         "items": items
     }
-    with open(OUT_PATH, "w") as f:
-        json.dump(payload, f, indent=2)
+    write_json(OUT_PATH, payload)
 
 if __name__ == "__main__":
     main()
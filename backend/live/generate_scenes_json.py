@@ -11,7 +11,7 @@
 
 import os, json, datetime, hashlib, uuid
 from scene_compiler_live import compile_scene
-from db import insert_scene
+from db import insert_scenes
 
 # toggle minimal logging
 VERBOSE = True
@@ -41,7 +41,7 @@ def generate_from_feed(path, source_name="Unknown", character="chip"):
             print(f"[Feed] {source_name}: invalid format")
         return 0
 
-    count = 0
+    ledger_rows = []
     for item in data:
         headline = item.get("headline") or item.get("title") or ""
         source = item.get("source") or source_name
@@ -55,19 +55,22 @@ def generate_from_feed(path, source_name="Unknown", character="chip"):
             print(f"[Feed] {source}: compile error: {e}")
             continue
 
-        # Insert into ledger
-        try:
-            insert_scene(
-                str(uuid.uuid4()),
-                headline,
-                source,
-                scene.get("sentiment", "neutral"),
-                item.get("url") or item.get("link")
-            )
-            count += 1
-        except Exception as e:
-            print(f"[Feed] {source}: DB insert error: {e}")
+        # Queue for the ledger (written in one batch below)
+        if not scene:
             continue
+        ledger_rows.append((
+            str(uuid.uuid4()),
+            headline,
+            source,
+            scene.get("sentiment", "neutral"),
+            item.get("url") or item.get("link")
+        ))
+
+    count = 0
+    try:
+        count = insert_scenes(ledger_rows)
+    except Exception as e:
+        print(f"[Feed] {source_name}: DB insert error: {e}")
 
     if VERBOSE:
         print(f"[Feed] {source_name}: {count} scenes processed")
@@ -4,7 +4,9 @@ TOKNNews Heartbeat Updater
 Keeps a live record of compiler health and recent status.
 """
 
-import os, json, time
+import os, sys, json, time
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import write_json
 
 DATA_DIR = "/var/www/toknnews-live/data"
 HEARTBEAT_PATH = os.path.join(DATA_DIR, "heartbeat.json")
@@ -32,8 +34,7 @@ def update_heartbeat(headline: str, sentiment: str, runtime: float, status: str
         "system_uptime": os.popen("uptime -p").read().strip()
     }
 
-    with open(HEARTBEAT_PATH, "w") as f:
-        json.dump(heartbeat, f, indent=2)
+    write_json(HEARTBEAT_PATH, heartbeat)
 
     print(f"[Heartbeat] 🩺 Updated ({status}) → {headline}")
     return heartbeat
@@ -5,7 +5,9 @@ Unifies RSS, API, and Reddit sources into one deduped, normalized feed.
 Writes /data/raw/rss_latest.json and updates heartbeat.
 """
 
-import os, json, time, hashlib, requests, feedparser
+import os, sys, json, time, hashlib, requests, feedparser
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import write_json
 from datetime import datetime
 from heartbeat_updater import update_heartbeat
 
@@ -174,11 +176,8 @@ def ingest_all():
             "items": reddit_items
         }
         reddit_path = os.path.join(DATA_DIR, "raw/reddit_training_feed.json")
-        tmp_reddit = reddit_path + ".tmp"
         os.makedirs(os.path.dirname(reddit_path), exist_ok=True)
-        with open(tmp_reddit, "w") as f:
-            json.dump(reddit_output, f, indent=2)
-        os.replace(tmp_reddit, reddit_path)
+        write_json(reddit_path, reddit_output)
         print(f"[HybridIngest] 🧠 Saved {len(reddit_items)} Reddit posts for sentiment training.")
 
     all_items = [i for i in all_items if i.get("title")]
@@ -224,11 +223,8 @@ def ingest_all():
     print(f"[Dashboard] ✅ Merged daily_counts.json ({len(existing_counts)} total days)")
     """
     # Atomic write
-    tmp_path = OUTPUT_PATH + ".tmp"
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-    with open(tmp_path, "w") as f:
-        json.dump(output, f, indent=2)
-    os.replace(tmp_path, OUTPUT_PATH)
+    write_json(OUTPUT_PATH, output)
 
     # Log + heartbeat
     entry = {
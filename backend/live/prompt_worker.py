@@ -15,7 +15,7 @@ from newspaper import Article
 import random
 from contextlib import closing
 from datetime import datetime
-from db import update_prompt, get_conn
+from db import update_prompts, get_conn
 
 DB_PATH = "/var/www/toknnews/data/toknnews.db"
 PROMPT_FEED = "/var/www/toknnews/data/prompts/feed.jsonl"
@@ -172,6 +172,7 @@ def main():
             time.sleep(CHECK_INTERVAL)
             continue
 
+        updates = []
         for s in scenes:
             headline = s["headline"]
             sentiment = s.get("sentiment", "neutral")
@@ -181,11 +182,14 @@ def main():
             sora_prompt = build_sora_prompt(headline, summary, sentiment)
             prompt_score = round(random.uniform(0.6, 0.98), 2)
 
-            update_prompt(s["id"], summary, sora_prompt, prompt_score)
+            updates.append((s["id"], summary, sora_prompt, prompt_score))
             append_to_feed(s["id"], headline, sora_prompt)
 
             print(f"[PromptWorker] + {headline[:60]}...")
 
+        # one write transaction per batch instead of one per scene
+        update_prompts(updates)
+
         time.sleep(CHECK_INTERVAL)
 
 if __name__ == "__main__":
@@ -8,7 +8,9 @@ Handles:
  - Heartbeat update
 """
 
-import os, json, time, subprocess, datetime
+import os, sys, time, subprocess, datetime
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import write_json
 
 ROOT = "/var/www/toknnews-live/backend/live"
 DATA = "/var/www/toknnews-live/data"
@@ -38,8 +40,7 @@ def update_heartbeat(status="success", error=None):
         "system_uptime": os.popen("uptime -p").read().strip()
     }
 
-    with open(hb_path, "w") as f:
-        json.dump(heartbeat, f, indent=2)
+    write_json(hb_path, heartbeat)
 
     log(f"🩺 Heartbeat updated ({status})")
 
@@ -15,12 +15,18 @@ This compiler:
 This file is a full replacement.
 """
 
-import os, json, hashlib, sqlite3, textwrap, re
+import os, json, hashlib, textwrap, time
 from datetime import datetime, timedelta, timezone
 from collections import Counter
 
 # === IMPORT: Script Engine V3 ===
-from backend.script_engine.script_engine_v3 import generate_script
+from backend.script_engine.script_engine_v3 import stream_script
+
+# === IMPORT: artifact JSON (compact, orjson-backed) ===
+from backend.script_engine.jsonio import write_json, load_json
+
+# === IMPORT: shared SQLite layer (WAL, migrations run once at startup) ===
+from db import save_compiled_scene, store_script, is_duplicate, to_utc_iso
 
 
 # === PATHS ===
@@ -28,21 +34,34 @@ DATA_DIR = "/var/www/toknnews/data"
 ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
 MASTER_PATH = os.path.join(DATA_DIR, "scenes.json")
 LATEST_PATH = os.path.join(DATA_DIR, "latest_scene.json")
-DB_PATH = os.path.join(DATA_DIR, "toknnews.db")
 MAX_SCENES = 10000
 
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(ARCHIVE_DIR, exist_ok=True)
 
 
-# === UTIL: strip HTML ===
-def strip_html(s):
-    if not s: return ""
-    s = re.sub(r'<[^>]+>', '', s)
-    s = re.sub(r'https?://\S+', '', s)
-    s = re.sub(r'\b\S+\.(jpg|jpeg|png|gif|webp|svg)\b', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s[:1000]
+# === UTIL: strip HTML (shared precompiled sanitizer) ===
+from backend.script_engine.sanitizer import strip_html
+
+
+# === UTIL: metadata-only scene entry for scenes.json / snapshot ===
+def scene_entry(scene):
+    """
+    Listing entries carry a script_ref instead of the full script payload;
+    readers load the body lazily via db.load_script / load_script_by_ref.
+    Legacy entries with an inline script are moved into the blob store.
+    """
+    entry = {k: v for k, v in scene.items() if k != "script"}
+    script = scene.get("script")
+    if isinstance(script, dict) and not entry.get("script_ref"):
+        try:
+            entry["script_ref"] = store_script(script)
+        except Exception as e:
+            print(f"[DB] ⚠️ Could not store script blob, keeping inline: {e}")
+            return scene
+    elif script is not None and not isinstance(script, dict):
+        entry["script"] = script   # plain-text legacy summaries are tiny
+    return entry
 
 
 # === UTIL: load RSS (used in Auto mode) ===
@@ -82,20 +101,6 @@ def load_rss_headlines(path="/var/www/toknnews/data/raw/rss_latest.json", limit=
     return scenes
 
 
-# === DB Helper ===
-def open_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS scenes(
-            id TEXT PRIMARY KEY,
-            time TEXT, character TEXT, topic TEXT, source TEXT,
-            script TEXT, status TEXT, reply_to TEXT, characters TEXT, hash TEXT
-        )
-    """)
-    return conn
-
-
 # =====================================================================
 # === MAIN COMPILER (STRUCTURED SCRIPT ENGINE ENABLED) ================
 # =====================================================================
@@ -122,15 +127,15 @@ def compile_scene(headline, source="manual", character="chip"):
         # === HASH FOR DEDUPE ===
         scene_hash = hashlib.md5(f"{source}:{title}".encode()).hexdigest()
 
+        # === DEDUPE LAST 24 HOURS ===
+        # indexed (hash, time) lookup instead of scanning every scene
+        if is_duplicate(scene_hash, window_hours=24):
+            print("[SKIP] duplicate headline already exists in last-24-hour window")
+            return
+
         # === LOAD EXISTING ===
-        existing = []
-        if os.path.exists(MASTER_PATH):
-            try:
-                existing = json.load(open(MASTER_PATH)).get("scenes", [])
-            except Exception:
-                existing = []
+        existing = (load_json(MASTER_PATH) or {}).get("scenes", [])
 
-        # === DEDUPE LAST 24 HOURS ===
         def to_naive_utc(ts_str):
             try:
                 dt = datetime.fromisoformat(str(ts_str).replace("Z", "+00:00"))
@@ -140,25 +145,13 @@ def compile_scene(headline, source="manual", character="chip"):
             except Exception:
                 return None
 
-        cutoff = datetime.utcnow() - timedelta(hours=24)
-        recent_hashes = set()
-        for s in existing:
-            t = s.get("time")
-            if not t: continue
-            dt = to_naive_utc(t)
-            if dt and dt >= cutoff:
-                h = s.get("hash")
-                if h: recent_hashes.add(h)
-
-        if scene_hash in recent_hashes:
-            print("[SKIP] duplicate headline already exists in last-24-hour window")
-            return
-
         # =====================================================================
         # === CALL SCRIPT ENGINE V3 (Core Upgrade in Module C-5) ===============
         # =====================================================================
 
-        script_payload = generate_script(
+        # Streamed: each timeline line goes to TTS as soon as it is written;
+        # the final mix is made when the line stream closes.
+        script_payload, lines = stream_script(
             headline=title,
             article_context=headline.get("description","") if isinstance(headline, dict) else "",
             cluster_articles=None,
@@ -166,13 +159,15 @@ def compile_scene(headline, source="manual", character="chip"):
         )
 
         # === AUDIO BLOCK RENDER (FINAL ROUTE VIA audio_block_renderer) ===
-        from backend.script_engine.audio.audio_block_renderer import render_audio_blocks
+        from backend.script_engine.audio.audio_block_renderer import render_audio_stream
 
-        scene_id = script_payload["unreal"]["scene_id"]
+        scene_id = script_payload["unreal"].get("scene_id") or f"scene_{int(time.time()*1000)}"
 
-        final_audio = render_audio_blocks(scene_id, script_payload["audio_blocks"])
+        rendered = render_audio_stream(scene_id, lines)
 
-        script_payload["audio_file"] = final_audio
+        script_payload["timeline"] = rendered["timeline"]
+        script_payload["audio_blocks"] = rendered["audio_blocks"]
+        script_payload["audio_file"] = rendered["final_audio"]
 
         # =====================================================================
         # === BUILD SCENE RECORD ==============================================
@@ -181,6 +176,7 @@ def compile_scene(headline, source="manual", character="chip"):
         preserved_time = headline.get("time") or headline.get("timestamp") if isinstance(headline, dict) else None
 
         scene = {
+            "id": int(time.time()*1000),
             "time": preserved_time or timestamp_iso,
             "source": source,
             "character": character,
@@ -188,15 +184,28 @@ def compile_scene(headline, source="manual", character="chip"):
             "script": script_payload,    # ← full structured script
             "status": "compiled",
             "hash": scene_hash,
+            "reply_to": None,
         }
 
-        # === APPEND + TRIM ===
-        existing.append(scene)
+        # === WRITE TO SQLITE (script → compressed blob, row keeps digest) ===
+        try:
+            scene_for_db = scene.copy()
+            scene_for_db["time"] = to_utc_iso(scene["time"]) or to_utc_iso(timestamp_iso)
+            scene_for_db["characters"] = json.dumps([scene.get("character","Chip")])
+
+            scene["script_ref"] = save_compiled_scene(scene_for_db)
+
+        except Exception as e:
+            print(f"[DB] ⚠️ Error persisting scene: {e}")
+
+        # === APPEND + TRIM (metadata only; legacy inline scripts slimmed) ===
+        existing = [scene_entry(s) for s in existing]
+        existing.append(scene_entry(scene))
         if len(existing) > MAX_SCENES:
             existing = existing[-MAX_SCENES:]
 
         master = {"generated_at": timestamp_iso, "scenes": existing}
-        json.dump(master, open(MASTER_PATH,"w"), indent=2)
+        write_json(MASTER_PATH, master)
 
         # === REFRESH DAILY COUNTS ===
         window_days = 60
@@ -218,42 +227,17 @@ def compile_scene(headline, source="manual", character="chip"):
             if day: counts[day] += 1
 
         dc_path = os.path.join(DATA_DIR, "daily_counts.json")
-        json.dump(dict(sorted(counts.items())), open(dc_path,"w"), indent=2)
+        write_json(dc_path, dict(sorted(counts.items())))
         print(f"[Dashboard] 🧮 daily_counts.json refreshed ({len(counts)} days)")
 
         # === SNAPSHOT (1000 newest) ===
         sorted_scenes = sorted(existing, key=lambda s: s.get("time",""), reverse=True)
         snap = {"generated_at": timestamp_iso, "scenes": sorted_scenes[:1000]}
-        tmp = os.path.join(DATA_DIR,"scenes_snapshot.json.tmp")
-        json.dump(snap, open(tmp,"w"), indent=2)
-        os.replace(tmp, os.path.join(DATA_DIR,"scenes_snapshot.json"))
+        write_json(os.path.join(DATA_DIR,"scenes_snapshot.json"), snap)
         print(f"[Dashboard] 🪶 Snapshot refreshed ({len(snap['scenes'])} scenes)")
 
-        # === latest_scene.json ===
-        json.dump(scene, open(LATEST_PATH,"w"), indent=2)
-
-        # === WRITE TO SQLITE ===
-        try:
-            import time
-            scene.setdefault("id", int(time.time()*1000))
-            scene.setdefault("reply_to", None)
-            conn = open_db(); c = conn.cursor()
-
-            # script must be stored as JSON string
-            scene_for_db = scene.copy()
-            scene_for_db["script"] = json.dumps(scene["script"])
-            scene_for_db["characters"] = json.dumps([scene.get("character","Chip")])
-
-            c.execute("""
-                INSERT OR REPLACE INTO scenes
-                (id,time,character,topic,source,script,status,reply_to,characters)
-                VALUES (:id,:time,:character,:topic,:source,:script,:status,:reply_to,:characters)
-            """, scene_for_db)
-
-            conn.commit(); conn.close()
-
-        except Exception as e:
-            print(f"[DB] ⚠️ Error persisting scene: {e}")
+        # === latest_scene.json (the one scene readers open: full script) ===
+        write_json(LATEST_PATH, scene)
 
         from backend.script_engine.unreal_exporter import export_unreal_package
         export_unreal_package(script_payload)
@@ -1,47 +1,417 @@
 #!/usr/bin/env python3
 """
-ToknNews Topic Clusterer (v1)
+ToknNews Topic Clusterer (v2)
 
-Groups recent enriched stories into small clusters based on:
- - domain
- - sentiment
- - keyword overlap (very light)
-Later: replace with OpenAI-driven clustering logic.
+Groups enriched stories into event clusters with an online, embedding
+based clusterer whose state survives across cycles:
+
+ - Each story's headline (+ summary) is embedded once (embedding cache)
+ - Assignment is one matrix-vector product against the running
+   centroids: O(clusters) per story, no rebuild from scratch
+ - A story joins its nearest cluster at >= TOKN_CLUSTER_ASSIGN_SIM,
+   otherwise it starts a new cluster
+ - Clusters whose centroids drift together (>= TOKN_CLUSTER_MERGE_SIM)
+   are merged; loose clusters (mean member similarity below
+   TOKN_CLUSTER_SPLIT_SIM) are split in two with 2-means when the
+   halves are further apart than the assignment threshold
+ - Clusters not updated for TOKN_CLUSTER_TTL_HOURS expire
+ - State: TOKN_CLUSTER_STATE (JSON members) + sidecar .npz (vectors),
+   stamped with the embedding model and dim; a different model or dim
+   (e.g. TOKN_EMBED_BACKEND switched) discards the old clusters
+
+If embeddings are unavailable the v1 (topic, domain, sentiment) keyword
+grouping is used for that batch.
+
+    python3 topic_clusterer.py --stats | --reset
 """
 
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
 from collections import defaultdict
 
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.keyword_matcher import first
+from backend.script_engine.jsonio import write_json
+
+STATE_PATH = os.getenv("TOKN_CLUSTER_STATE", "/var/www/toknnews-live/data/topic_clusters.json")
+ASSIGN_SIM = float(os.getenv("TOKN_CLUSTER_ASSIGN_SIM", "0.60"))
+MERGE_SIM = float(os.getenv("TOKN_CLUSTER_MERGE_SIM", "0.82"))
+SPLIT_SIM = float(os.getenv("TOKN_CLUSTER_SPLIT_SIM", "0.65"))
+SPLIT_MIN = int(os.getenv("TOKN_CLUSTER_SPLIT_MIN", "8"))
+TTL_HOURS = float(os.getenv("TOKN_CLUSTER_TTL_HOURS", "36"))
+MAX_MEMBERS = 50          # newest members kept per cluster
+MEMBER_FIELDS = ("headline", "summary", "source", "sentiment", "importance", "domain", "url", "timestamp")
+
+
+def _story_key(article):
+    text = (article.get("headline") or "").strip().lower()
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
 
-def cluster_articles(articles):
-    """
-    articles: list[dict] enriched items from ingest.
-    Returns:
-        list of clusters, where each cluster is a list of article dicts
-    """
-    if not articles:
-        return []
 
+def _story_text(article):
+    headline = article.get("headline") or ""
+    summary = (article.get("summary") or "").strip()
+    return f"{headline}. {summary[:300]}" if summary else headline
+
+
+# ---------------------------------------------------------
+# Keyword grouping (v1, fallback)
+# ---------------------------------------------------------
+def keyword_clusters(articles):
     clusters = defaultdict(list)
 
     for a in articles:
         domain = a.get("domain", "general").lower()
         sentiment = a.get("sentiment", "neutral").lower()
 
-        # Cheap keyword extraction
-        headline = (a.get("headline") or "").lower()
-        if "bitcoin" in headline or "btc" in headline:
-            topic = "bitcoin"
-        elif "ethereum" in headline or "eth" in headline:
-            topic = "ethereum"
-        elif "defi" in headline:
-            topic = "defi"
-        elif "ai" in headline or "machine learning" in headline:
-            topic = "ai"
-        else:
-            topic = domain
+        # Cheap keyword extraction (keyword_matcher "cluster_topic")
+        topic = first(a.get("headline"), "cluster_topic", domain)
 
         key = (topic, domain, sentiment)
         clusters[key].append(a)
 
     # Convert dict → list of clusters
     return list(clusters.values())
+
+
+# ---------------------------------------------------------
+# Online clusterer
+# ---------------------------------------------------------
+class OnlineClusterer:
+    """
+    Running-centroid clusterer. Per cluster:
+      sum / count  -> centroid (mean of every story ever assigned)
+      members      -> newest MAX_MEMBERS stories (dicts) + their vectors
+    """
+
+    def __init__(self, path=STATE_PATH):
+        import numpy as np
+        self.np = np
+        self.path = path
+        self.clusters = {}        # id -> cluster dict
+        self.index = {}           # story key -> cluster id
+        self.next_id = 1
+        self.model = None         # embedding model id / dim the vectors were made with
+        self.dim = None
+        self._matrix = None       # (ids, normalized centroid matrix), rebuilt lazily
+        self.load()
+
+    # ---------------- persistence ----------------
+    def _vec_path(self):
+        return os.path.splitext(self.path)[0] + ".npz"
+
+    def load(self):
+        np = self.np
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            vecs = np.load(self._vec_path())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[TopicClusterer] ⚠️ state unreadable, starting fresh: {e}")
+            return
+
+        self.next_id = state.get("next_id", 1)
+        self.model = state.get("model")
+        self.dim = state.get("dim")
+        for c in state.get("clusters", []):
+            cid = c["id"]
+            if f"sum_{cid}" not in vecs:
+                continue
+            c["sum"] = vecs[f"sum_{cid}"].astype(np.float32)
+            c["vecs"] = vecs[f"vecs_{cid}"].astype(np.float32)
+            self.clusters[cid] = c
+            for m in c["members"]:
+                self.index[m["key"]] = cid
+            self.dim = self.dim or len(c["sum"])
+        self._matrix = None
+
+    def ensure_space(self, model, dim):
+        """Drop clusters built with another embedding model / dim."""
+        stale = (self.model is not None and self.model != model) or \
+                (self.dim is not None and self.dim != dim)
+        if stale and self.clusters:
+            print(f"[TopicClusterer] ⚠️ embeddings changed ({self.model}/{self.dim} -> "
+                  f"{model}/{dim}), discarding {len(self.clusters)} clusters")
+            self.clusters, self.index, self._matrix = {}, {}, None
+        self.model, self.dim = model, dim
+
+    def save(self):
+        np = self.np
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        arrays, meta = {}, []
+        for cid, c in self.clusters.items():
+            arrays[f"sum_{cid}"] = c["sum"]
+            arrays[f"vecs_{cid}"] = c["vecs"].astype(np.float16)
+            meta.append({k: v for k, v in c.items() if k not in ("sum", "vecs")})
+
+        tmp = self._vec_path() + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, self._vec_path())
+        write_json(self.path, {"next_id": self.next_id, "saved_at": time.time(),
+                               "model": self.model, "dim": self.dim, "clusters": meta})
+
+    # ---------------- centroid matrix ----------------
+    def _centroids(self):
+        if self._matrix is None:
+            np = self.np
+            ids = list(self.clusters)
+            if ids:
+                m = np.stack([self.clusters[i]["sum"] for i in ids])
+                m /= np.maximum(np.linalg.norm(m, axis=1, keepdims=True), 1e-12)
+            else:
+                m = np.zeros((0, 0), dtype=np.float32)
+            self._matrix = (ids, m)
+        return self._matrix
+
+    def _centroid(self, c):
+        norm = float(self.np.linalg.norm(c["sum"]))
+        return c["sum"] / norm if norm else c["sum"]
+
+    # ---------------- cluster ops ----------------
+    def _new_cluster(self, vec, now):
+        cid = self.next_id
+        self.next_id += 1
+        c = {"id": cid, "created": now, "updated": now, "count": 0, "members": [],
+             "sum": self.np.zeros_like(vec), "vecs": self.np.zeros((0, len(vec)), dtype=self.np.float32)}
+        self.clusters[cid] = c
+        return c
+
+    def _add(self, c, article, key, vec, now):
+        np = self.np
+        member = {k: article[k] for k in MEMBER_FIELDS if k in article}
+        member.update(key=key, added=now)
+        c["members"].append(member)
+        c["vecs"] = np.vstack([c["vecs"], vec[None, :]])
+        if len(c["members"]) > MAX_MEMBERS:
+            for old in c["members"][:-MAX_MEMBERS]:
+                self.index.pop(old["key"], None)
+            c["members"] = c["members"][-MAX_MEMBERS:]
+            c["vecs"] = c["vecs"][-MAX_MEMBERS:]
+        c["sum"] = c["sum"] + vec
+        c["count"] += 1
+        c["updated"] = now
+        self.index[key] = c["id"]
+
+    def _assign(self, article, vec, now):
+        key = _story_key(article)
+        if key in self.index and self.index[key] in self.clusters:
+            return self.index[key]
+
+        ids, matrix = self._centroids()
+        if ids:
+            sims = matrix @ vec
+            best = int(sims.argmax())
+            if sims[best] >= ASSIGN_SIM:
+                c = self.clusters[ids[best]]
+                self._add(c, article, key, vec, now)
+                # keep the cached row current instead of rebuilding the matrix
+                matrix[best] = self._centroid(c)
+                return c["id"]
+
+        c = self._new_cluster(vec, now)
+        self._add(c, article, key, vec, now)
+        self._matrix = None
+        return c["id"]
+
+    def _merge(self, touched):
+        """Fold clusters whose centroids are within MERGE_SIM into the older one."""
+        merged = 0
+        for cid in sorted(touched):
+            if cid not in self.clusters:
+                continue
+            ids, matrix = self._centroids()
+            row = ids.index(cid)
+            sims = matrix @ matrix[row]
+            sims[row] = -1.0
+            best = int(sims.argmax()) if len(ids) > 1 else row
+            if best == row or sims[best] < MERGE_SIM:
+                continue
+            keep, drop = sorted((cid, ids[best]))
+            a, b = self.clusters[keep], self.clusters.pop(drop)
+            members = sorted(zip(a["members"] + b["members"], list(a["vecs"]) + list(b["vecs"])),
+                             key=lambda mv: mv[0]["added"])[-MAX_MEMBERS:]
+            a["members"] = [m for m, _ in members]
+            a["vecs"] = self.np.stack([v for _, v in members])
+            a["sum"] = a["sum"] + b["sum"]
+            a["count"] += b["count"]
+            a["updated"] = max(a["updated"], b["updated"])
+            a["created"] = min(a["created"], b["created"])
+            for m in b["members"]:
+                self.index[m["key"]] = keep
+            touched.add(keep)
+            self._matrix = None
+            merged += 1
+        return merged
+
+    def _split(self, touched):
+        """2-means split of touched clusters whose members have drifted apart."""
+        np = self.np
+        split = 0
+        for cid in list(touched):
+            c = self.clusters.get(cid)
+            if c is None or len(c["members"]) < SPLIT_MIN:
+                continue
+            vecs = c["vecs"]
+            if float((vecs @ self._centroid(c)).mean()) >= SPLIT_SIM:
+                continue
+
+            # seeds: member farthest from the centroid, then farthest from it
+            a = int((vecs @ self._centroid(c)).argmin())
+            b = int((vecs @ vecs[a]).argmin())
+            seeds = vecs[[a, b]]
+            for _ in range(5):
+                labels = (vecs @ seeds.T).argmax(axis=1)
+                if labels.min() == labels.max():
+                    break
+                for j in (0, 1):
+                    s = vecs[labels == j].sum(axis=0)
+                    seeds[j] = s / max(float(np.linalg.norm(s)), 1e-12)
+            if min((labels == 0).sum(), (labels == 1).sum()) < 2:
+                continue
+            # halves that would re-join on the next story are not worth splitting
+            if float(seeds[0] @ seeds[1]) >= ASSIGN_SIM:
+                continue
+
+            members = c["members"]
+            c["members"] = [m for m, l in zip(members, labels) if l == 0]
+            c["vecs"] = vecs[labels == 0]
+            c["sum"] = c["vecs"].sum(axis=0)
+            c["count"] = len(c["members"])
+            other = self._new_cluster(vecs[0], c["updated"])
+            other["created"] = c["created"]
+            for m, v in zip([m for m, l in zip(members, labels) if l == 1], vecs[labels == 1]):
+                self._add(other, m, m["key"], v, m["added"])
+            other["updated"] = c["updated"]
+            self._matrix = None
+            split += 1
+        return split
+
+    def expire(self, now=None):
+        now = now or time.time()
+        cutoff = now - TTL_HOURS * 3600
+        dead = [cid for cid, c in self.clusters.items() if c["updated"] < cutoff]
+        for cid in dead:
+            for m in self.clusters.pop(cid)["members"]:
+                self.index.pop(m["key"], None)
+        if dead:
+            self._matrix = None
+        return len(dead)
+
+    # ---------------- public ----------------
+    def update(self, articles, vectors, now=None):
+        """
+        Assign each article (with its unit vector) to a cluster, then
+        merge / split the clusters that changed and expire stale ones.
+        Returns {cluster_id: [articles from this batch]}.
+        """
+        now = now or time.time()
+        self.expire(now)
+        batch = defaultdict(list)
+        touched = set()
+        for article, vec in zip(articles, vectors):
+            cid = self._assign(article, vec, now)
+            batch[cid].append(article)
+            touched.add(cid)
+
+        merged = self._merge(touched)
+        touched = {cid for cid in touched if cid in self.clusters}
+        split = self._split(touched)
+        if merged or split:
+            print(f"[TopicClusterer] merged {merged}, split {split}")
+
+        # merges / splits may have moved batch articles: re-key by current owner
+        out = defaultdict(list)
+        for cid, group in batch.items():
+            for a in group:
+                out[self.index.get(_story_key(a), cid)].append(a)
+        return dict(out)
+
+    def members(self, cid):
+        c = self.clusters.get(cid)
+        return list(c["members"]) if c else []
+
+    def stats(self):
+        sizes = sorted((c["count"] for c in self.clusters.values()), reverse=True)
+        return {
+            "clusters": len(self.clusters),
+            "stories_indexed": len(self.index),
+            "largest": sizes[:5],
+            "singletons": sum(1 for s in sizes if s == 1),
+            "path": self.path,
+        }
+
+
+_clusterer = None
+_clusterer_lock = threading.Lock()
+
+
+def get_clusterer():
+    global _clusterer
+    with _clusterer_lock:
+        if _clusterer is None:
+            _clusterer = OnlineClusterer()
+        return _clusterer
+
+
+def cluster_articles(articles, with_history=False):
+    """
+    articles: list[dict] enriched items from ingest.
+    Returns:
+        list of clusters, where each cluster is a list of article dicts.
+        with_history=True appends earlier cycles' members of each cluster
+        (trimmed dicts) after this batch's articles.
+    """
+    if not articles:
+        return []
+
+    try:
+        from backend.script_engine.hybrid_tone.embedding_engine import embed_texts, get_backend
+        clusterer = get_clusterer()
+        backend = get_backend()
+        vectors = embed_texts([_story_text(a) for a in articles], backend=backend)
+    except Exception as e:
+        print(f"[TopicClusterer] ⚠️ embeddings unavailable, keyword grouping: {e}")
+        return keyword_clusters(articles)
+
+    embedded = [(a, v) for a, v in zip(articles, vectors) if v.any()]
+    missing = [a for a, v in zip(articles, vectors) if not v.any()]
+    if not embedded:
+        return keyword_clusters(missing)
+
+    with _clusterer_lock:
+        try:
+            clusterer.ensure_space(f"{backend.name}:{backend.model}", int(vectors.shape[1]))
+            groups = clusterer.update([a for a, _ in embedded], [v for _, v in embedded])
+        except Exception as e:
+            print(f"[TopicClusterer] ⚠️ clustering failed, keyword grouping: {type(e).__name__}: {e}")
+            return keyword_clusters(articles)
+        clusters = []
+        for cid, group in groups.items():
+            if with_history:
+                seen = {_story_key(a) for a in group}
+                group = group + [m for m in reversed(clusterer.members(cid)) if m["key"] not in seen]
+            clusters.append(group)
+        try:
+            clusterer.save()
+        except OSError as e:
+            print(f"[TopicClusterer] ⚠️ could not save state: {e}")
+
+    return clusters + keyword_clusters(missing)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--reset" in args:
+        for p in (STATE_PATH, os.path.splitext(STATE_PATH)[0] + ".npz"):
+            if os.path.exists(p):
+                os.remove(p)
+        print("[TopicClusterer] ✅ state cleared")
+    else:
+        print(json.dumps(get_clusterer().stats(), indent=2))
@@ -7,6 +7,8 @@ Produces valid MP3 audio files only.
 import os, requests
 
 AUDIO_DIR = "/var/www/toknnews/data/audio"
+# ELEVEN_API_BASE points renderers at a stand-in (script_engine.standin_server)
+ELEVEN_API_BASE = os.getenv("ELEVEN_API_BASE", "https://api.elevenlabs.io").rstrip("/")
 os.makedirs(AUDIO_DIR, exist_ok=True)
 
 ELEVEN_API_KEY = os.getenv("ELEVEN_API_KEY")
@@ -21,7 +23,7 @@ def render_block(block, scene_id):
         print("[Audio] Missing ELEVEN_API_KEY")
         return None
 
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+    url = f"{ELEVEN_API_BASE}/v1/text-to-speech/{voice_id}"
 
     headers = {
         "xi-api-key": ELEVEN_API_KEY,
@@ -1,4 +1,6 @@
-import json, os, fcntl, time
+import json, os, sys, fcntl, time
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.jsonio import dump
 
 HEARTBEAT = "/var/www/toknnews/data/heartbeat.json"
 
@@ -10,6 +12,6 @@ def update_field(key, value):
         data[key] = value
         data["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
         f.seek(0)
-        json.dump(data, f, indent=2)
+        dump(data, f)
         f.truncate()
         fcntl.flock(f, fcntl.LOCK_UN)
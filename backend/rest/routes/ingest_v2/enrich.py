@@ -1,10 +1,12 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 import os, json, time
-from openai import OpenAI
+from script_engine.llm_client import chat
+from script_engine.llm_usage import usage_context
+from script_engine.rolling_brain import observe_story
+from script_engine.keyword_matcher import labels
 
 router = APIRouter(prefix="/ingest/v2")
-client = OpenAI()
 
 # Canonical domains mapped to primary anchors
 PRIMARY_ROUTING = {
@@ -85,19 +87,21 @@ Given the headline and summary, return Chip’s natural reaction in JSON:
 """
 
 def classify_domain(headline: str):
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[{"role": "user", "content": DOMAIN_PROMPT + f"\nHeadline: {headline}"}],
-        response_format={"type": "json_object"}
-    )
+    with usage_context(line_type="enrich_domain"):
+        resp = chat(
+            model="gpt-4.1-mini",
+            messages=[{"role": "user", "content": DOMAIN_PROMPT + f"\nHeadline: {headline}"}],
+            response_format={"type": "json_object"}
+        )
     return json.loads(resp.choices[0].message.content)["domain"]
 
 def run_base_analysis(headline: str):
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[{"role": "user", "content": f"Headline: {headline}\n{BASE_ANALYSIS_PROMPT}"}],
-        response_format={"type": "json_object"}
-    )
+    with usage_context(line_type="enrich_analysis"):
+        resp = chat(
+            model="gpt-4.1-mini",
+            messages=[{"role": "user", "content": f"Headline: {headline}\n{BASE_ANALYSIS_PROMPT}"}],
+            response_format={"type": "json_object"}
+        )
     return json.loads(resp.choices[0].message.content)
 
 def chip_should_appear(domain: str, importance: int):
@@ -110,25 +114,22 @@ def chip_should_appear(domain: str, importance: int):
     return False  # light stories handled by desk anchors
 
 def determine_primary_secondary(domain: str, headline: str):
-    h = headline.lower()
+    # overrides for primary (keyword_matcher "enrich_route", one scan)
+    cues = labels(headline, "enrich_route")
 
-    # overrides for primary
-    if any(x in h for x in ["sec", "ruling", "lawsuit", "regulator"]):
+    if "legal" in cues:
         return ("Lawson Black", None)
 
-    if any(x in h for x in ["raises", "series", "funding", "startup"]):
+    if "funding" in cues:
         return ("Cap Silver", "Neura Grey")  # AI startup? Cap leads.
 
-    if any(x in h for x in ["staking", "apy", "yield", "liquidity"]):
+    if "yield" in cues:
         return ("Reef Gold", "Cash Green")
 
-    if any(x in h for x in ["ai", "llm", "model", "neural"]):
-        # If it's AI funding → Cap primary, Neura secondary
-        if any(y in h for y in ["raises", "funding"]):
-            return ("Cap Silver", "Neura Grey")
+    if "ai" in cues:
         return ("Neura Grey", None)
 
-    if any(x in h for x in ["meme", "trend", "viral"]):
+    if "meme" in cues:
         return ("Bitsy Gold", "Rex Vol")
 
     # fallback domain mapping
@@ -137,11 +138,12 @@ def determine_primary_secondary(domain: str, headline: str):
 
 def get_chip_reaction(headline: str, summary: str):
     payload = f"Headline: {headline}\nSummary: {summary}\n{CHIP_REACTION_PROMPT}"
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[{"role": "user", "content": payload}],
-        response_format={"type": "json_object"}
-    )
+    with usage_context(persona="chip", line_type="enrich_chip_reaction"):
+        resp = chat(
+            model="gpt-4.1-mini",
+            messages=[{"role": "user", "content": payload}],
+            response_format={"type": "json_object"}
+        )
     return json.loads(resp.choices[0].message.content)
 
 @router.post("/enrich")
@@ -184,4 +186,10 @@ def enrich_item(item: Item):
         "reason_secondary": f"Secondary chosen by nuance in headline." if secondary else None
     }
 
+    # Feed the rolling brain as soon as the story is understood
+    try:
+        observe_story(enriched)
+    except Exception as e:
+        print(f"[Enrich] ⚠️ rolling brain update failed: {e}")
+
     return enriched
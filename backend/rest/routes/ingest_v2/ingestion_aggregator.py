@@ -14,6 +14,10 @@ import time
 import os
 import hashlib
 
+from script_engine.jsonio import write_json
+from script_engine.rolling_brain import observe_stories
+from script_engine.keyword_matcher import first
+
 ROLLING_PATH = "/var/www/toknnews-live/data/rolling_stories.json"
 # Path for Chip's dynamic top-story rundown feed
 TOP_STORIES_PATH = "/var/www/toknnews-live/data/top_stories.json"
@@ -22,8 +26,7 @@ TOP_STORIES_PATH = "/var/www/toknnews-live/data/top_stories.json"
 # Save top stories (Chip's rundown input)
 # ---------------------------------------------------------
 def save_top_stories(stories):
-    with open(TOP_STORIES_PATH, "w", encoding="utf-8") as f:
-        json.dump(stories, f, indent=2)
+    write_json(TOP_STORIES_PATH, stories)
 
 
 # ---------------------------------------------------------
@@ -85,26 +88,14 @@ def load_rolling():
 # Save updated stories
 # ---------------------------------------------------------
 def save_rolling(stories):
-    with open(ROLLING_PATH, "w", encoding="utf-8") as f:
-        json.dump(stories, f, indent=2)
+    write_json(ROLLING_PATH, stories)
 
 
 # ---------------------------------------------------------
 # Simple domain classifier (stub — will expand later)
 # ---------------------------------------------------------
 def classify_domain(text):
-    t = text.lower()
-    if "defi" in t or "liquidity" in t or "protocol" in t:
-        return "defi"
-    if "sec" in t or "regulat" in t or "legal" in t:
-        return "regulation"
-    if "bitcoin" in t or "btc" in t:
-        return "bitcoin"
-    if "macro" in t or "fed" in t or "interest" in t:
-        return "macro"
-    if "ai" in t or "gpu" in t or "model" in t:
-        return "ai_tech"
-    return "general"
+    return first(text, "ingest_domain", "general")
 
 
 # ---------------------------------------------------------
@@ -130,6 +121,7 @@ def update_stories(new_headlines):
     """
     rolling = load_rolling()
     existing_hashes = {item["hash"] for item in rolling}
+    fresh = []
 
     for story in new_headlines:
         h = hash_headline(story["headline"])
@@ -138,7 +130,7 @@ def update_stories(new_headlines):
 
         domain = story.get("domain") or classify_domain(story["headline"])
 
-        rolling.append({
+        entry = {
             "headline": story["headline"],
             "summary": story.get("summary", ""),
             "sentiment": story.get("sentiment", "neutral"),
@@ -147,7 +139,9 @@ def update_stories(new_headlines):
             "timestamp": story.get("ts", time.time()),
             "timestamp": story.get("timestamp", time.time()),
             "hash": h
-        })
+        }
+        rolling.append(entry)
+        fresh.append({**story, **entry})
 
         existing_hashes.add(h)
 
@@ -156,6 +150,12 @@ def update_stories(new_headlines):
 
     save_rolling(rolling)
 
+    # Incremental rolling-brain update (already-seen stories are skipped)
+    try:
+        observe_stories(fresh)
+    except Exception as e:
+        print(f"[Aggregator] ⚠️ rolling brain update failed: {e}")
+
     # ---------------------------------------------------------
     # ALSO BUILD TOP STORIES DYNAMICALLY FOR CHIP / PD
     # ---------------------------------------------------------
@@ -1,8 +1,8 @@
 from fastapi import APIRouter
 import subprocess
-import json
 import time
-import os
+
+from script_engine.jsonio import write_json
 
 router = APIRouter(prefix="/ingest/v2")
 
@@ -14,8 +14,7 @@ def submit_story(data: dict):
     try:
         # Write temp json
         path = f"/var/www/toknnews-live/data/pending_story.json"
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        write_json(path, data)
 
         # Trigger compiler
         subprocess.Popen(
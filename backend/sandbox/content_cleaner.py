@@ -1,30 +1,9 @@
-import re, html
+import sys
 
-def clean_text(raw: str) -> str:
-    """
-    Removes HTML, URLs, &amp; entities, and excess whitespace.
-    Keeps only readable English text for feed summaries.
-    """
-    if not raw:
-        return ""
+# clean_text now lives in the shared precompiled sanitizer:
+# removes HTML, URLs, image names, entities and excess whitespace,
+# trimmed to 1000 characters for feed summaries.
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.sanitizer import clean_text
 
-    # Decode HTML entities (&amp;, &lt;, etc.)
-    s = html.unescape(raw)
-
-    # Remove HTML tags like <p> or <a href=...>
-    s = re.sub(r"<[^>]+>", " ", s)
-
-    # Remove full URLs (https:// or http://)
-    s = re.sub(r"https?://[^\s)]+", " ", s)
-
-    # Remove links that start with www.
-    s = re.sub(r"www\.[^\s)]+", " ", s)
-
-    # Remove leftover HTML entities like &amp;
-    s = re.sub(r"&[a-z]+;", " ", s)
-
-    # Collapse multiple spaces into one
-    s = re.sub(r"\s+", " ", s).strip()
-
-    # Trim to first 1000 characters for safety
-    return s[:1000]
+__all__ = ["clean_text"]   # re-exported for the sandbox scripts
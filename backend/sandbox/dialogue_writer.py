@@ -10,7 +10,6 @@ Dry-run by default: prints output to console before writing.
 
 import os, sys, json
 from datetime import datetime
-from openai import OpenAI
 from metrics_logger import log_metric
 from textblob import TextBlob
 
@@ -19,8 +18,9 @@ GO_LIVE = False  # change to True to write to chip_latest.txt
 INPUT_SCENE_PATH = "/var/www/toknnews/devdata/latest_scene.json"
 OUTPUT_PATH = "/var/www/toknnews/devdata/audio_scripts/chip_latest.txt"
 
-# === OpenAI client ===
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# === OpenAI client (shared: pooling, timeouts, retries, limiter) ===
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.llm_client import chat
 
 # === LOAD scene ===
 if not os.path.exists(INPUT_SCENE_PATH):
@@ -53,7 +53,7 @@ print("==============================\n")
 
 # === GENERATE dialogue ===
 try:
-    response = client.chat.completions.create(
+    response = chat(
         model="gpt-4o-mini",
         messages=[{"role": "system", "content": "You are a professional AI news anchor."},
                   {"role": "user", "content": prompt}],
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+memory_index.py — vector index for ToknNews Memory DB recall
+
+Recall used to SELECT every memory, json-decode each embedding and score
+rows one at a time on every query. This keeps the embeddings as one
+contiguous float32 matrix on disk instead:
+
+ - vectors.f32 : (count, dim) float32, rows L2-normalized, memory-mapped
+ - ids.i64     : memories.id for each row
+ - meta.json   : dim, count, last synced id, ANN state
+ - appends are incremental (sync() only reads ids > last_id)
+ - top-k is one matrix-vector product + np.argpartition
+ - above TOKN_MEMORY_ANN_MIN rows an IVF index (spherical k-means
+   centroids + inverted lists) is built; queries score only the
+   TOKN_MEMORY_NPROBE nearest lists plus rows appended since the build
+
+    python3 memory_index.py --sync | --build | --stats | --bench 1000000
+"""
+
+import os, sys, json, time, struct, sqlite3, fcntl
+import numpy as np
+
+DEV_ROOT = "/var/www/toknnews/devdata"
+DB_PATH = os.path.join(DEV_ROOT, "memories.db")
+INDEX_DIR = os.getenv("TOKN_MEMORY_INDEX_DIR", os.path.join(DEV_ROOT, "memory_index"))
+
+ANN_MIN = int(os.getenv("TOKN_MEMORY_ANN_MIN", "50000"))
+NPROBE = int(os.getenv("TOKN_MEMORY_NPROBE", "16"))
+REBUILD_FRACTION = 0.2        # rebuild IVF once the unindexed tail exceeds this
+KMEANS_ITERS = 8
+SCAN_CHUNK = 262144           # rows per exact-scan block
+
+
+# -------------------------------------------------------------------
+# Embedding blobs (memories.embedding column)
+#   header: b"TE", version, dtype (0 = float32, 1 = int8), dim (uint32)
+#   float32: dim * 4 bytes
+#   int8:    float32 scale + dim bytes  (value = q * scale)
+# -------------------------------------------------------------------
+BLOB_MAGIC = b"TE"
+BLOB_VERSION = 1
+_HEADER = struct.Struct("<2sBBI")
+_DTYPES = {"float32": 0, "int8": 1}
+EMBED_DTYPE = os.getenv("TOKN_MEMORY_EMBED_DTYPE", "float32")
+
+
+def encode_embedding(vec, dtype=EMBED_DTYPE):
+    """float vector -> versioned binary blob (float32, or int8 + per-vector scale)."""
+    vec = np.asarray(vec, dtype=np.float32).ravel()
+    header = _HEADER.pack(BLOB_MAGIC, BLOB_VERSION, _DTYPES[dtype], vec.size)
+    if dtype == "int8":
+        peak = float(np.abs(vec).max()) if vec.size else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        q = np.clip(np.rint(vec / scale), -127, 127).astype(np.int8)
+        return header + struct.pack("<f", scale) + q.tobytes()
+    return header + vec.tobytes()
+
+
+def encode_embeddings(vectors, dtype=EMBED_DTYPE):
+    return [encode_embedding(v, dtype) for v in vectors]
+
+
+def _decode_blob(raw):
+    magic, version, dtype, dim = _HEADER.unpack_from(raw)
+    body = raw[_HEADER.size:]
+    if dtype == 1:
+        (scale,) = struct.unpack_from("<f", body)
+        q = np.frombuffer(body, dtype=np.int8, count=dim, offset=4)
+        return q.astype(np.float32) * np.float32(scale)
+    return np.frombuffer(body, dtype=np.float32, count=dim)
+
+
+def is_legacy_embedding(value):
+    """True for JSON text / header-less rows that migrate_embeddings() rewrites."""
+    if value is None:
+        return False
+    raw = bytes(value) if isinstance(value, (bytes, memoryview)) else None
+    return raw is None or not raw.startswith(BLOB_MAGIC)
+
+
+def decode_embedding(value):
+    """Versioned blob, JSON list (legacy) or raw float32 bytes -> float32 vector, or None."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, memoryview)):
+        raw = bytes(value)
+        if raw.startswith(BLOB_MAGIC) and len(raw) >= _HEADER.size:
+            try:
+                return _decode_blob(raw)
+            except (struct.error, ValueError):
+                return None
+        text = raw.strip()
+        if not (text.startswith(b"[") and text.endswith(b"]")):
+            return np.frombuffer(raw, dtype=np.float32) if len(raw) % 4 == 0 else None
+        try:
+            value = text.decode("utf-8")
+        except UnicodeDecodeError:
+            return np.frombuffer(raw, dtype=np.float32) if len(raw) % 4 == 0 else None
+    try:
+        return np.asarray(json.loads(value), dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_rows(mat):
+    mat = np.asarray(mat, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+# -------------------------------------------------------------------
+# Index
+# -------------------------------------------------------------------
+class MemoryIndex:
+    def __init__(self, path=INDEX_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._vec_path = os.path.join(path, "vectors.f32")
+        self._ids_path = os.path.join(path, "ids.i64")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._lock_path = os.path.join(path, ".lock")
+        self._mat = None
+        self._ids = None
+        self._ann = None
+        self._mapped = (None, None)   # (count, ann built) the maps were opened at
+        self.meta = self._read_meta()
+
+    # --- metadata / maps -------------------------------------------
+    def _read_meta(self):
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"dim": None, "count": 0, "last_id": 0, "ann": None}
+
+    def _write_meta(self):
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def _locked(self):
+        f = open(self._lock_path, "a")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return f
+
+    def refresh(self):
+        """Pick up rows appended by another process."""
+        self.meta = self._read_meta()
+
+    def _maps(self):
+        count, ann = self.meta["count"], self.meta.get("ann")
+        key = (count, ann and ann.get("built"))
+        if self._mapped != key:
+            if count:
+                self._mat = np.memmap(self._vec_path, dtype=np.float32, mode="r",
+                                      shape=(count, self.meta["dim"]))
+                self._ids = np.memmap(self._ids_path, dtype=np.int64, mode="r", shape=(count,))
+            else:
+                self._mat = self._ids = None
+            self._ann = None
+            if ann:
+                self._ann = (
+                    np.load(os.path.join(self.path, "ivf_centroids.npy")),
+                    np.load(os.path.join(self.path, "ivf_order.npy"), mmap_mode="r"),
+                    np.load(os.path.join(self.path, "ivf_offsets.npy")),
+                )
+            self._mapped = key
+        return self._mat, self._ids, self._ann
+
+    @property
+    def count(self):
+        return self.meta["count"]
+
+    # --- writes ------------------------------------------------------
+    def append(self, ids, vectors):
+        """Append rows (memories.id, embedding). Returns rows added."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(ids):
+            return 0
+        lock = self._locked()
+        try:
+            self.meta = self._read_meta()
+            dim = self.meta["dim"] or vectors.shape[1]
+            if vectors.shape[1] != dim:
+                print(f"[MemoryIndex] ⚠️ skipping {len(ids)} rows: dim {vectors.shape[1]} != {dim}")
+                return 0
+            ids = np.asarray(ids, dtype=np.int64)
+            # a concurrent sync may have appended these rows since the
+            # caller read last_id (outside the lock): keep only newer ids
+            fresh = ids > self.meta["last_id"]
+            if not fresh.all():
+                ids, vectors = ids[fresh], vectors[fresh]
+                if not len(ids):
+                    return 0
+            count = self.meta["count"]
+            # drop orphan rows a crash left past meta["count"] before appending,
+            # so row i of vectors.f32 always belongs to ids.i64[i]
+            with open(self._vec_path, "ab") as f:
+                f.truncate(count * dim * 4)
+                f.write(_normalize_rows(vectors).tobytes())
+            with open(self._ids_path, "ab") as f:
+                f.truncate(count * 8)
+                f.write(ids.tobytes())
+            self.meta.update(dim=dim, count=self.meta["count"] + len(ids),
+                             last_id=max(self.meta["last_id"], int(ids.max())))
+            self._write_meta()
+        finally:
+            lock.close()
+        self._maybe_build_ann()
+        return len(ids)
+
+    def sync(self, db_path=DB_PATH, batch=10000):
+        """Append memories with id > last synced id. Returns rows added."""
+        if not os.path.exists(db_path):
+            return 0
+        self.refresh()
+        conn = sqlite3.connect(db_path)
+        added = 0
+        try:
+            cur = conn.execute(
+                "SELECT id, embedding FROM memories WHERE id > ? AND embedding IS NOT NULL ORDER BY id",
+                (self.meta["last_id"],)
+            )
+            while True:
+                rows = cur.fetchmany(batch)
+                if not rows:
+                    break
+                ids, vecs = [], []
+                for rid, emb in rows:
+                    vec = decode_embedding(emb)
+                    if vec is not None and vec.size:
+                        ids.append(rid)
+                        vecs.append(vec)
+                if vecs and len({v.size for v in vecs}) == 1:
+                    added += self.append(ids, np.stack(vecs))
+                elif vecs:
+                    dim = self.meta["dim"] or vecs[0].size
+                    keep = [(i, v) for i, v in zip(ids, vecs) if v.size == dim]
+                    if keep:
+                        added += self.append([i for i, _ in keep], np.stack([v for _, v in keep]))
+        finally:
+            conn.close()
+        return added
+
+    # --- ANN -------------------------------------------------------------
+    def _maybe_build_ann(self):
+        n = self.meta["count"]
+        ann = self.meta.get("ann")
+        if n < ANN_MIN:
+            return
+        if ann is None or n - ann["count"] > REBUILD_FRACTION * ann["count"]:
+            self.build_ann()
+
+    def build_ann(self, nlist=None, seed=7):
+        """Spherical k-means IVF over the current rows."""
+        mat, _, _ = self._maps()
+        n = self.meta["count"]
+        if not n:
+            return
+        t0 = time.perf_counter()
+        nlist = nlist or int(min(4096, max(16, np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(mat[np.sort(rng.choice(n, size=min(n, nlist * 32), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            empty = ~sums.any(axis=1)
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = _normalize_rows(sums)
+
+        assign = np.empty(n, dtype=np.int32)
+        for start in range(0, n, SCAN_CHUNK):
+            block = np.asarray(mat[start:start + SCAN_CHUNK])
+            assign[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        offsets = np.searchsorted(assign[order], np.arange(nlist + 1)).astype(np.int64)
+
+        lock = self._locked()
+        try:
+            np.save(os.path.join(self.path, "ivf_centroids.npy"), centroids)
+            np.save(os.path.join(self.path, "ivf_order.npy"), order)
+            np.save(os.path.join(self.path, "ivf_offsets.npy"), offsets)
+            self.meta = self._read_meta()
+            self.meta["ann"] = {"nlist": nlist, "count": n, "built": time.time()}
+            self._write_meta()
+        finally:
+            lock.close()
+        print(f"[MemoryIndex] 🧭 IVF built: {n} rows, {nlist} lists "
+              f"in {time.perf_counter() - t0:.1f}s")
+
+    # --- search ----------------------------------------------------------
+    def search(self, query_vec, top_k=5, nprobe=NPROBE, exact=False):
+        """[(score, memories.id)] best first."""
+        mat, ids, ann = self._maps()
+        if mat is None or not top_k:
+            return []
+        q = np.asarray(query_vec, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(q))
+        if not norm or q.size != mat.shape[1]:
+            return []
+        q = q / norm
+
+        if ann is not None and not exact:
+            centroids, order, offsets = ann
+            covered = self.meta["ann"]["count"]
+            probe = np.argpartition(-(centroids @ q), min(nprobe, len(centroids)) - 1)[:nprobe]
+            rows = np.concatenate(
+                [order[offsets[c]:offsets[c + 1]] for c in probe]
+                + [np.arange(covered, len(mat), dtype=np.int64)]
+            )
+            rows.sort()                       # sequential reads from the memmap
+            scores = mat[rows] @ q
+        else:
+            rows = None
+            scores = np.empty(len(mat), dtype=np.float32)
+            for start in range(0, len(mat), SCAN_CHUNK):
+                scores[start:start + SCAN_CHUNK] = mat[start:start + SCAN_CHUNK] @ q
+
+        k = min(top_k, len(scores))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        picked = rows[top] if rows is not None else top
+        return [(float(scores[t]), int(ids[p])) for t, p in zip(top, picked)]
+
+    def stats(self):
+        return {**self.meta, "path": self.path,
+                "bytes": os.path.getsize(self._vec_path) if os.path.exists(self._vec_path) else 0}
+
+
+_index = None
+
+def get_index(path=INDEX_DIR):
+    """Shared index for this process (created on first use)."""
+    global _index
+    if _index is None or _index.path != path:
+        _index = MemoryIndex(path)
+    return _index
+
+
+def fetch_memories(db_path, hits):
+    """Rows for [(score, id)] hits, in hit order: (score, id, character, topic, text)."""
+    if not hits:
+        return []
+    conn = sqlite3.connect(db_path)
+    try:
+        ids = [rid for _, rid in hits]
+        rows = conn.execute(
+            f"SELECT id, character, topic, text FROM memories WHERE id IN ({','.join('?' * len(ids))})",
+            ids
+        ).fetchall()
+    finally:
+        conn.close()
+    by_id = {r[0]: r[1:] for r in rows}
+    return [(score, rid, *by_id[rid]) for score, rid in hits if rid in by_id]
+
+
+# -------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------
+def bench(n=1000000, dim=384, queries=50, top_k=10):
+    import tempfile, shutil
+    tmp = tempfile.mkdtemp(prefix="memidx_")
+    try:
+        rng = np.random.default_rng(1)
+        # clustered data, so IVF has structure to find
+        centers = _normalize_rows(rng.normal(size=(2000, dim)))
+        idx = MemoryIndex(tmp)
+        t0 = time.perf_counter()
+        global ANN_MIN
+        ann_min, ANN_MIN = ANN_MIN, n + 1          # build once at the end
+        for start in range(0, n, 100000):
+            m = min(100000, n - start)
+            vecs = centers[rng.integers(0, len(centers), m)] + 0.35 * rng.normal(size=(m, dim)) / np.sqrt(dim)
+            idx.append(np.arange(start + 1, start + m + 1), vecs.astype(np.float32))
+        ANN_MIN = ann_min
+        print(f"[MemoryIndex] appended {n} rows in {time.perf_counter() - t0:.1f}s")
+
+        qs = centers[rng.integers(0, len(centers), queries)] + 0.35 * rng.normal(size=(queries, dim)) / np.sqrt(dim)
+        t0 = time.perf_counter()
+        truth = [set(r for _, r in idx.search(q, top_k, exact=True)) for q in qs]
+        exact_ms = (time.perf_counter() - t0) * 1000 / queries
+        idx.build_ann()
+        t0 = time.perf_counter()
+        got = [set(r for _, r in idx.search(q, top_k)) for q in qs]
+        ann_ms = (time.perf_counter() - t0) * 1000 / queries
+        recall = np.mean([len(a & b) / top_k for a, b in zip(truth, got)])
+        print(f"  exact scan : {exact_ms:.1f} ms/query")
+        print(f"  IVF        : {ann_ms:.1f} ms/query (nprobe={NPROBE}, recall@{top_k}={recall:.3f})")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--bench" in args:
+        i = args.index("--bench")
+        bench(int(args[i + 1]) if len(args) > i + 1 else 1000000)
+    else:
+        index = get_index()
+        if "--sync" in args:
+            print(f"[MemoryIndex] ➕ {index.sync()} rows synced from {DB_PATH}")
+        if "--build" in args:
+            index.build_ann()
+        print(json.dumps(index.stats(), indent=2))
@@ -2,13 +2,23 @@
 # Purpose: Insert the latest spoken lines into a sandbox SQLite DB (memories.db)
 # Scope:   Dev-only (reads chip_latest.txt + latest_narrative.json)
 # Output:  /var/www/toknnews/devdata/memories.db → table: memories
+# Embeddings: versioned binary blobs (float32, or int8 + scale with
+#             TOKN_MEMORY_EMBED_DTYPE=int8), see memory_index.encode_embedding.
+#             Older JSON-text rows are migrated in place (--migrate, or
+#             automatically on the next run).
 
-import os, sqlite3, json
+import os, sys, sqlite3, json
 from datetime import datetime, timezone
 
-# === MiniLM local embedding model (offline) ===
-from sentence_transformers import SentenceTransformer
-model = SentenceTransformer("all-MiniLM-L6-v2")
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.hybrid_tone.embedding_engine import get_backend
+from memory_index import get_index, encode_embeddings, decode_embedding, is_legacy_embedding
+
+EMBED_SCHEMA_VERSION = 1   # PRAGMA user_version once embeddings are binary
+
+# === MiniLM local embedding model (shared CPU backend, loaded on first use) ===
+def get_model():
+    return get_backend("local")
 
 DEV_ROOT = "/var/www/toknnews/devdata"
 AUDIO_DIR = os.path.join(DEV_ROOT, "audio_scripts")
@@ -30,6 +40,34 @@ def ensure_schema(conn):
     );
     """)
     conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_char_time ON memories(character, timestamp);")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < EMBED_SCHEMA_VERSION:
+        migrate_embeddings(conn)
+
+def migrate_embeddings(conn, batch=5000):
+    """Rewrite JSON-text embeddings as binary blobs (one transaction)."""
+    converted, last_id = 0, 0
+    with conn:
+        while True:
+            rows = conn.execute(
+                "SELECT id, embedding FROM memories WHERE id > ? AND embedding IS NOT NULL "
+                "ORDER BY id LIMIT ?", (last_id, batch)
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            legacy = [(rid, decode_embedding(emb)) for rid, emb in rows if is_legacy_embedding(emb)]
+            legacy = [(rid, vec) for rid, vec in legacy if vec is not None]
+            if legacy:
+                blobs = encode_embeddings([vec for _, vec in legacy])
+                conn.executemany(
+                    "UPDATE memories SET embedding = ? WHERE id = ?",
+                    [(blob, rid) for blob, (rid, _) in zip(blobs, legacy)]
+                )
+                converted += len(legacy)
+        conn.execute(f"PRAGMA user_version = {EMBED_SCHEMA_VERSION}")
+    if converted:
+        print(f"[Mem] 🔁 Migrated {converted} embeddings to binary blobs")
+    return converted
 
 def load_dialogue_lines():
     if not os.path.exists(TXT_PATH):
@@ -64,28 +102,40 @@ def main():
     try:
         ensure_schema(conn)
 
-        # === Generate embeddings for each dialogue line ===
-        records = []
-        for line in lines:
-            try:
-                emb = model.encode(line).tolist()       # 384-dim MiniLM vector
-                emb_json = json.dumps(emb)
-            except Exception as e:
-                print(f"[Mem] ⚠️ Embedding failed for line: {e}")
-                emb_json = None
-
-            records.append((character, ts, topic, line, sentiment, source, emb_json))
-
-        conn.executemany(
-            """INSERT INTO memories (character, timestamp, topic, text, sentiment, source, embedding)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            records
-        )
-        conn.commit()
+        # === Generate embeddings for all dialogue lines in one batch ===
+        try:
+            embs = encode_embeddings(get_model().encode(lines))  # 384-dim MiniLM blobs
+        except Exception as e:
+            print(f"[Mem] ⚠️ Embedding failed: {e}")
+            embs = [None] * len(lines)
+
+        records = [
+            (character, ts, topic, line, sentiment, source, emb)
+            for line, emb in zip(lines, embs)
+        ]
+
+        with conn:   # one transaction
+            conn.executemany(
+                """INSERT INTO memories (character, timestamp, topic, text, sentiment, source, embedding)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                records
+            )
         print(f"[Mem] 🧠 Inserted {len(lines)} lines with embeddings → {DB_PATH}")
 
+        # Append the new vectors to the recall index
+        print(f"[Mem] 🧭 Indexed {get_index().sync(DB_PATH)} new memories")
+
     finally:
         conn.close()
 
 if __name__ == "__main__":
-    main()
+    if "--migrate" in sys.argv[1:]:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            ensure_schema(conn)
+            migrate_embeddings(conn)
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+    else:
+        main()
@@ -1,47 +1,38 @@
 #!/usr/bin/env python3
 """
 memory_recall.py — semantic recall for ToknNews Memory DB
-Compares a new query sentence to all stored memories using cosine similarity.
+Compares a new query sentence to all stored memories using cosine similarity,
+via the memmapped vector index (memory_index.py) rather than per-row decode.
 """
 
-import sqlite3, json, numpy as np, sys, os
-from sentence_transformers import SentenceTransformer
+import sys, os
+
+from memory_index import get_index, fetch_memories
+
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.hybrid_tone.embedding_engine import get_backend
 
 DB_PATH = "/var/www/toknnews/devdata/memories.db"
-model = SentenceTransformer("all-MiniLM-L6-v2")
+
+def get_model():
+    """Shared local MiniLM backend; loads on first recall, not at import."""
+    return get_backend("local")
 
 def recall(query_text, top_k=5):
     if not os.path.exists(DB_PATH):
         print(f"[Recall] ❌ No memory DB found at {DB_PATH}")
         return
 
-    # Get query embedding
-    query_vec = np.array(model.encode(query_text), dtype=np.float32)
-
-    # Fetch memories
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("SELECT id, character, topic, text, embedding FROM memories WHERE embedding IS NOT NULL")
-    rows = cur.fetchall()
-    conn.close()
-
-    if not rows:
+    # Pull any new memories into the index (incremental)
+    index = get_index()
+    index.sync(DB_PATH)
+    if not index.count:
         print("[Recall] No memories with embeddings found.")
         return
 
-    # Compute cosine similarity
-    sims = []
-    for rid, character, topic, text, emb_json in rows:
-        try:
-            emb = np.array(json.loads(emb_json), dtype=np.float32)
-            sim = np.dot(query_vec, emb) / (np.linalg.norm(query_vec) * np.linalg.norm(emb))
-            sims.append((sim, rid, character, topic, text))
-        except Exception:
-            continue
-
-    # Sort by similarity
-    sims.sort(reverse=True, key=lambda x: x[0])
-    top = sims[:top_k]
+    # Get query embedding, top-k from the index
+    query_vec = get_model().encode(query_text)
+    top = fetch_memories(DB_PATH, index.search(query_vec, top_k))
 
     print(f"\n[Recall] 🔎 Top {top_k} most similar memories to:\n“{query_text}”\n")
     for score, rid, character, topic, text in top:
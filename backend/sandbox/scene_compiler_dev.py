@@ -1,13 +1,20 @@
-import os, json, hashlib, sqlite3, textwrap, re
+import os, sys, json, hashlib, sqlite3, textwrap, re
 from datetime import datetime, timedelta, timezone
 from collections import Counter
 from toknnews_scene_compiler_v1_8_studio_feedback import generate_scene
 # === ToknNews Semantic Recall (Sandbox) ===
 import sqlite3, numpy as np
-from sentence_transformers import SentenceTransformer
 
 RECALL_DB = "/var/www/toknnews/devdata/memories.db"
-recall_model = SentenceTransformer("all-MiniLM-L6-v2")
+_recall_model = None
+
+def recall_model():
+    """MiniLM loads on first recall, not at import (torch is slow to load)."""
+    global _recall_model
+    if _recall_model is None:
+        from sentence_transformers import SentenceTransformer
+        _recall_model = SentenceTransformer("all-MiniLM-L6-v2")
+    return _recall_model
 
 # === CONFIG ===
 DATA_DIR = "/var/www/toknnews/data"
@@ -20,13 +27,8 @@ MAX_SCENES = 10000
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(ARCHIVE_DIR, exist_ok=True)
 
-def strip_html(s):
-    if not s: return ""
-    s = re.sub(r'<[^>]+>', '', s)
-    s = re.sub(r'https?://\S+', '', s)
-    s = re.sub(r'\b\S+\.(jpg|jpeg|png|gif|webp|svg)\b', '', s, flags=re.IGNORECASE)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s[:1000]
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.sanitizer import strip_html
 
 # === LOAD RSS HEADLINES ===
 def load_rss_headlines(path="/var/www/toknnews/data/raw/rss_latest.json", limit=500):
@@ -90,7 +92,7 @@ def recall_context(query_text, top_k=3):
         print("[Recall] No memories with embeddings found.")
         return ""
 
-    q_vec = np.array(recall_model.encode(query_text), dtype=np.float32)
+    q_vec = np.array(recall_model().encode(query_text), dtype=np.float32)
     sims = []
     for text, emb_json in rows:
         try:
@@ -17,10 +17,9 @@ Includes:
 # -------------------------------------------------------------------
 # IMPORTS
 # -------------------------------------------------------------------
-import os, json, hashlib, sqlite3, textwrap, re, numpy as np
+import os, sys, json, hashlib, sqlite3, textwrap
 from datetime import datetime, timedelta, timezone
 from collections import Counter
-from sentence_transformers import SentenceTransformer  # <-- REQUIRED for MiniLM recall
 
 # try to load the real scene generator; fall back to stub if not found
 try:
@@ -49,22 +48,22 @@ os.makedirs(ARCHIVE_DIR, exist_ok=True)
 # -------------------------------------------------------------------
 # SANDBOX UTILS
 # -------------------------------------------------------------------
-def strip_html(s: str) -> str:
-    """Remove HTML tags, URLs, and extra whitespace."""
-    if not s:
-        return ""
-    s = re.sub(r"<[^>]+>", "", s)
-    s = re.sub(r"https?://\S+", "", s)
-    s = re.sub(r"\b\S+\.(jpg|jpeg|png|gif|webp|svg)\b", "", s, flags=re.IGNORECASE)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s[:1000]
+# strip_html: shared precompiled sanitizer (tags, URLs, images, entities)
+sys.path.append("/var/www/toknnews-repo")
+from backend.script_engine.sanitizer import strip_html
 
 
 # -------------------------------------------------------------------
 # MINI-LM MODEL (LOCAL OFFLINE)
 # -------------------------------------------------------------------
+from backend.script_engine.hybrid_tone.embedding_engine import get_backend
+from memory_index import get_index, fetch_memories
+
 RECALL_DB = os.path.join(DEV_DIR, "memories.db")
-recall_model = SentenceTransformer("all-MiniLM-L6-v2")
+
+def recall_model():
+    """Shared local MiniLM backend; loads on first recall (torch is slow to load)."""
+    return get_backend("local")
 
 
 # -------------------------------------------------------------------
@@ -76,27 +75,15 @@ def recall_context(query_text: str, top_k: int = 3) -> str:
         print(f"[Recall] ❌ No memory DB found at {RECALL_DB}")
         return ""
 
-    conn = sqlite3.connect(RECALL_DB)
-    cur = conn.cursor()
-    cur.execute("SELECT text, embedding FROM memories WHERE embedding IS NOT NULL")
-    rows = cur.fetchall()
-    conn.close()
-    if not rows:
+    # memmapped vector index, synced incrementally from memories.db
+    index = get_index()
+    index.sync(RECALL_DB)
+    if not index.count:
         print("[Recall] No memories with embeddings found.")
         return ""
 
-    q_vec = np.array(recall_model.encode(query_text), dtype=np.float32)
-    sims = []
-    for text, emb_json in rows:
-        try:
-            emb = np.array(json.loads(emb_json), dtype=np.float32)
-            sim = np.dot(q_vec, emb) / (np.linalg.norm(q_vec) * np.linalg.norm(emb))
-            sims.append((sim, text))
-        except Exception:
-            continue
-
-    sims.sort(reverse=True, key=lambda x: x[0])
-    top = [t for _, t in sims[:top_k]]
+    q_vec = recall_model().encode(query_text)
+    top = [row[-1] for row in fetch_memories(RECALL_DB, index.search(q_vec, top_k))]
     return "\n".join(f"- {t}" for t in top)
 
 
@@ -2,12 +2,24 @@
 """
 TOKNNews — Audio Block Renderer (Final)
 All audio generation is routed through the tokn-audio service.
+
+ - render_audio_blocks(): whole scene in one request (render + mix)
+ - render_audio_stream(): consumes timeline lines while they are still
+   being written, renders each one as soon as it arrives, and asks the
+   service for the final mix when the stream closes
 """
 
+import os
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-AUDIO_SERVER = "http://localhost:8999/render_scene"
+AUDIO_SERVICE = os.getenv("TOKN_AUDIO_SERVICE", "http://localhost:8999")
+AUDIO_SERVER = f"{AUDIO_SERVICE}/render_scene"
+TTS_WORKERS = int(os.getenv("TOKN_TTS_WORKERS", "3"))
+# A hung tokn-audio request must not block the scene / episode forever
+BLOCK_TIMEOUT = float(os.getenv("TOKN_AUDIO_BLOCK_TIMEOUT", "60"))
+MIX_TIMEOUT = float(os.getenv("TOKN_AUDIO_MIX_TIMEOUT", "180"))
 
 def render_audio_blocks(scene_id, audio_blocks):
     """
@@ -22,7 +34,7 @@ def render_audio_blocks(scene_id, audio_blocks):
     }
 
     try:
-        r = requests.post(AUDIO_SERVER, json=payload)
+        r = requests.post(AUDIO_SERVER, json=payload, timeout=MIX_TIMEOUT)
         data = r.json()
 
         if data.get("status") == "ok":
@@ -34,3 +46,76 @@ def render_audio_blocks(scene_id, audio_blocks):
     except Exception as e:
         print("[Audio] Exception:", e)
         return None
+
+
+# ---------------------------------------------------------
+# Streamed render (LLM → TTS hand-off)
+# ---------------------------------------------------------
+def line_to_audio_block(entry, seq):
+    """Timeline entry → tokn-audio block."""
+    from script_engine.character_brain.persona_loader import get_voice
+    speaker = entry.get("speaker") or entry.get("character")
+    return {
+        "seq": seq,
+        "character": speaker,
+        "voice_id": entry.get("voice_id") or get_voice(speaker),
+        "block_type": entry.get("type", "line"),
+        "text": entry["text"],
+        "content": entry["text"],
+        "timestamp": time.time()
+    }
+
+def _render_one(session, scene_id, block):
+    try:
+        r = session.post(f"{AUDIO_SERVICE}/render_block",
+                         json={"scene_id": scene_id, "block": block},
+                         timeout=BLOCK_TIMEOUT)
+        data = r.json()
+        if data.get("status") == "ok":
+            return data.get("path")
+        print(f"[Audio] Block {block['seq']} error:", data)
+    except Exception as e:
+        print(f"[Audio] Block {block['seq']} exception:", e)
+    return None
+
+def render_audio_stream(scene_id, lines, workers=TTS_WORKERS):
+    """
+    lines: iterator of timeline entries (script_engine_v3.stream_script).
+    Each line is sent to TTS the moment it is yielded; the final mix is
+    requested once the iterator is exhausted, in timeline order.
+
+    Returns {"timeline", "audio_blocks", "final_audio"}.
+    """
+    timeline, blocks, futures = [], [], []
+    session = requests.Session()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts") as pool:
+        for entry in lines:
+            timeline.append(entry)
+            if not entry.get("text"):
+                continue
+            block = line_to_audio_block(entry, len(blocks))
+            blocks.append(block)
+            futures.append(pool.submit(_render_one, session, scene_id, block))
+            print(f"[Audio] ▶ {block['block_type']} ({block['character']}) → TTS")
+
+        block_paths = [f.result() for f in futures]
+
+    for block, path in zip(blocks, block_paths):
+        block["audio_file"] = path
+
+    final_audio = None
+    if any(block_paths):
+        try:
+            r = session.post(f"{AUDIO_SERVICE}/mix_scene",
+                             json={"scene_id": scene_id, "block_paths": block_paths},
+                             timeout=MIX_TIMEOUT)
+            data = r.json()
+            if data.get("status") == "ok":
+                final_audio = data.get("final_audio")
+            else:
+                print("[Audio] Mix error:", data)
+        except Exception as e:
+            print("[Audio] Mix exception:", e)
+
+    return {"timeline": timeline, "audio_blocks": blocks, "final_audio": final_audio}
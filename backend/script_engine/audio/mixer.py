@@ -2,17 +2,48 @@
 """
 TOKNNews — Audio Mixer (Final Version)
 Accepts MP3 or WAV automatically.
+
+Block paths and scene ids arrive from HTTP callers (audio_dashboard),
+so mix_scene only reads files under AUDIO_DIR and only writes
+{scene_id}_final.mp3 for a plain scene id.
 """
 
 import os
-from pydub import AudioSegment
+import re
 
 AUDIO_DIR = "/var/www/toknnews/data/audio"
 
+# episode_12, scene_3, ep_20251019_04, standin_bench_..., test_scene
+SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+def check_id(value, what="scene_id"):
+    """Raise ValueError unless value is safe to embed in an audio filename."""
+    if not isinstance(value, str) or not SAFE_ID.match(value):
+        raise ValueError(f"invalid {what}: {value!r}")
+    return value
+
+
+def check_audio_path(p):
+    """Resolved path of p; ValueError unless it is a file inside AUDIO_DIR."""
+    if not isinstance(p, str) or not p:
+        raise ValueError(f"invalid block path: {p!r}")
+    root = os.path.realpath(AUDIO_DIR) + os.sep
+    real = os.path.realpath(p)
+    if not real.startswith(root) or not os.path.isfile(real):
+        raise ValueError(f"block path outside {AUDIO_DIR}: {p!r}")
+    return real
+
+
 def mix_scene(scene_id, block_paths):
+    check_id(scene_id)
+    paths = [check_audio_path(p) for p in block_paths]
+
+    from pydub import AudioSegment   # heavy; only the audio service mixes
+
     final = AudioSegment.empty()
 
-    for p in block_paths:
+    for p in paths:
         seg = AudioSegment.from_file(p)  # auto-detect format
         final += seg
 
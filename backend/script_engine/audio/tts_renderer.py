@@ -2,35 +2,55 @@
 """
 TOKNNews — ElevenLabs TTS Renderer (Final, Correct Version)
 Produces valid MP3 audio files.
+
+Nothing happens at import: requests, the Vault lookup (hvac) and the
+audio dir are set up on the first render_block().
 """
 
-import os, time, requests
+import os, time, threading
 
 AUDIO_DIR = "/var/www/toknnews/data/audio"
-os.makedirs(AUDIO_DIR, exist_ok=True)
-
-import hvac
+# ELEVEN_API_BASE points renderers at a stand-in (script_engine.standin_server)
+ELEVEN_API_BASE = os.getenv("ELEVEN_API_BASE", "https://api.elevenlabs.io").rstrip("/")
+_init_lock = threading.Lock()
+_ready = False
+ELEVEN_API_KEY = None
 
-try:
-    client = hvac.Client(url="http://localhost:8200", token="root")  # adjust if needed
-    secret = client.read("secret/elevenlabs")
-    ELEVEN_API_KEY = secret["data"]["api_key"]
-except Exception as e:
-    print("[Audio] Vault lookup failed:", e)
-    ELEVEN_API_KEY = os.getenv("ELEVEN_API_KEY") or None
+def _init():
+    """Vault key lookup (network) + audio dir, once, on first use."""
+    global _ready, ELEVEN_API_KEY
+    if _ready:
+        return
+    with _init_lock:
+        if _ready:
+            return
+        os.makedirs(AUDIO_DIR, exist_ok=True)
+        try:
+            import hvac
+            client = hvac.Client(url="http://localhost:8200", token="root")  # adjust if needed
+            secret = client.read("secret/elevenlabs")
+            ELEVEN_API_KEY = secret["data"]["api_key"]
+        except Exception as e:
+            print("[Audio] Vault lookup failed:", e)
+            ELEVEN_API_KEY = os.getenv("ELEVEN_API_KEY") or None
+        _ready = True
 
 def render_block(block, scene_id):
+    import requests
+    _init()
+
     voice_id = block["voice_id"]
     text = block["text"]
 
-    # Save as MP3, NOT WAV
-    out_path = f"{AUDIO_DIR}/{scene_id}_{block['block_type']}_{int(block['timestamp'])}.mp3"
+    # Save as MP3, NOT WAV (seq keeps streamed blocks from colliding)
+    seq = f"{block['seq']:02d}_" if "seq" in block else ""
+    out_path = f"{AUDIO_DIR}/{scene_id}_{seq}{block['block_type']}_{int(block['timestamp'])}.mp3"
 
     if not ELEVEN_API_KEY:
         print("[Audio] Missing ELEVEN_API_KEY")
         return None
 
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+    url = f"{ELEVEN_API_BASE}/v1/text-to-speech/{voice_id}"
 
     headers = {
         "xi-api-key": ELEVEN_API_KEY,
@@ -10,49 +10,32 @@ This module provides:
        generate_persona_line(character, enriched)
 """
 
-import json
-import os
+from script_engine.character_brain import character_store
 from script_engine.hybrid_tone.chip_tone_shaper import (
     compute_chip_tone_weight,
     apply_chip_tone_to_line,
 )
 
-BASE_DIR = os.path.dirname(__file__)
-
-BRAIN_PATH = os.path.join(BASE_DIR, "character_brain.json")
-MEMORY_PATH = os.path.join(BASE_DIR, "character_memory.json")
+BRAIN_PATH = character_store.FILES["brain"]
+MEMORY_PATH = character_store.DOCS["memory"]
 
 
 # ---------------------------------------------------------
 # Load character brain (DNA)
 # ---------------------------------------------------------
 def load_brain():
-    try:
-        with open(BRAIN_PATH, "r") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    return character_store.get("brain")
 
 
 # ---------------------------------------------------------
 # Load persistent memory (future adaptive behavior)
 # ---------------------------------------------------------
 def load_memory():
-    if not os.path.exists(MEMORY_PATH):
-        return {}
-    try:
-        with open(MEMORY_PATH, "r") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    return character_store.get_doc("memory")
 
 
 def save_memory(memory):
-    try:
-        with open(MEMORY_PATH, "w") as f:
-            json.dump(memory, f, indent=2)
-    except Exception:
-        pass
+    character_store.save("memory", memory)
 
 
 # ---------------------------------------------------------
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Character Data Store
+One in-process home for the character JSON files, parsed once.
+
+ - Read-only documents (brain, bible, voice map) are parsed on first use
+   and served from memory as frozen views: lookups never touch disk and
+   callers cannot mutate the shared copy
+ - Each file is re-stat'ed at most every TOKN_STORE_CHECK_SECONDS; a
+   changed (mtime, size) reloads it, so edits to character_brain.json
+   show up in a running engine without a restart
+ - Writable documents (character memory, director state) are kept as
+   one live dict per process; save() marks them dirty and a background
+   flush writes them at most every TOKN_STORE_FLUSH_SECONDS (and at
+   exit), so a burst of memory updates costs one file write
+
+    from script_engine.character_brain import character_store as store
+    persona = store.get("brain").get("chip", {})
+    mem = store.get_doc("memory"); mem["x"] = 1; store.save("memory", mem)
+
+    python3 -m script_engine.character_brain.character_store --stats
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+
+from script_engine.jsonio import loads, write_json
+
+BASE_DIR = os.path.dirname(__file__)
+ENGINE_DIR = os.path.dirname(BASE_DIR)
+
+CHECK_SECONDS = float(os.getenv("TOKN_STORE_CHECK_SECONDS", "1.0"))
+FLUSH_SECONDS = float(os.getenv("TOKN_STORE_FLUSH_SECONDS", "5.0"))
+
+# name -> path (read-only documents)
+FILES = {
+    "brain": os.path.join(BASE_DIR, "character_brain.json"),
+    "bible": os.path.join(os.path.dirname(ENGINE_DIR), "character_bible.json"),
+    "voice_map": os.path.join(ENGINE_DIR, "voice_map.json"),
+}
+
+# name -> path (writable documents, batched writes)
+DOCS = {
+    "memory": os.path.join(BASE_DIR, "character_memory.json"),
+}
+
+_lock = threading.RLock()
+_entries = {}        # name -> _Entry
+_defaults = {}       # name -> default factory for writable docs
+_flush_timer = None
+
+STATS = {"hits": 0, "loads": 0, "reloads": 0, "stats": 0, "saves": 0, "writes": 0,
+         "errors": 0}
+
+
+# ---------------------------------------------------------
+# Frozen views
+# ---------------------------------------------------------
+class FrozenDict(dict):
+    """dict that refuses mutation (still JSON-serializable)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("character_store documents are read-only; use get_doc() to write")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(obj):
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    """Mutable deep copy of a frozen (or plain) document."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+# ---------------------------------------------------------
+# Entries
+# ---------------------------------------------------------
+class _Entry:
+    def __init__(self, path, writable):
+        self.path = path
+        self.writable = writable
+        self.sig = None          # (mtime_ns, size) of the file we hold
+        self.checked = 0.0       # monotonic time of the last stat
+        self.data = None
+        self.dirty = False
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read(path, default):
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        STATS["errors"] += 1
+        print(f"[CharacterStore] ⚠️ could not parse {os.path.basename(path)}: {e}")
+        return default
+
+
+def _entry(name):
+    """Current entry for name, (re)loaded if the file changed. Caller holds _lock."""
+    entry = _entries.get(name)
+    if entry is None:
+        if name in FILES:
+            entry = _Entry(FILES[name], writable=False)
+        elif name in DOCS:
+            entry = _Entry(DOCS[name], writable=True)
+        else:
+            raise KeyError(f"unknown character document: {name}")
+        _entries[name] = entry
+
+    now = time.monotonic()
+    if entry.data is not None and now - entry.checked < CHECK_SECONDS:
+        STATS["hits"] += 1
+        return entry
+
+    entry.checked = now
+    STATS["stats"] += 1
+    sig = _signature(entry.path)
+    if entry.data is not None and sig == entry.sig:
+        STATS["hits"] += 1
+        return entry
+
+    if entry.dirty:
+        # our unflushed writes win over an outside edit
+        print(f"[CharacterStore] ⚠️ {os.path.basename(entry.path)} changed on disk "
+              f"with unsaved updates pending — keeping in-memory copy")
+        entry.sig = sig
+        return entry
+
+    reload = entry.data is not None
+    if entry.writable:
+        factory = _defaults.get(name, dict)
+        data = _read(entry.path, None)
+        entry.data = data if isinstance(data, dict) else factory()
+    else:
+        entry.data = freeze(_read(entry.path, {}))
+    entry.sig = sig
+    STATS["reloads" if reload else "loads"] += 1
+    if reload:
+        print(f"[CharacterStore] 🔄 reloaded {os.path.basename(entry.path)}")
+    return entry
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+def register(name, path, writable=True, default=None):
+    """Add a document (e.g. director state) to the store."""
+    with _lock:
+        (DOCS if writable else FILES)[name] = path
+        if default is not None:
+            _defaults[name] = default
+        _entries.pop(name, None)
+
+
+def get(name):
+    """Frozen, cached view of a read-only document."""
+    with _lock:
+        return _entry(name).data
+
+
+def get_doc(name):
+    """
+    The live dict for a writable document. It is shared within the
+    process; mutate it, then call save(name, doc) to persist.
+    """
+    with _lock:
+        entry = _entry(name)
+        if not entry.writable:
+            raise KeyError(f"{name} is read-only; use get()")
+        return entry.data
+
+
+def save(name, data=None, immediate=False):
+    """Mark a writable document dirty; written by the next flush."""
+    with _lock:
+        # no re-stat here: the caller's edits must not be swapped for a reload
+        entry = _entries.get(name) or _entry(name)
+        if not entry.writable:
+            raise KeyError(f"{name} is read-only")
+        if data is not None:
+            entry.data = data
+        entry.dirty = True
+        STATS["saves"] += 1
+        if immediate or FLUSH_SECONDS <= 0:
+            _flush_entry(entry)
+        else:
+            _schedule_flush()
+
+
+def _flush_entry(entry):
+    """Caller holds _lock."""
+    if not entry.dirty:
+        return
+    try:
+        write_json(entry.path, entry.data)
+        entry.dirty = False
+        entry.sig = _signature(entry.path)
+        entry.checked = time.monotonic()
+        STATS["writes"] += 1
+    except OSError as e:
+        STATS["errors"] += 1
+        print(f"[CharacterStore] ⚠️ write failed for {os.path.basename(entry.path)}: {e}")
+
+
+def _schedule_flush():
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(FLUSH_SECONDS, _timed_flush)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def _timed_flush():
+    global _flush_timer
+    with _lock:
+        _flush_timer = None
+    flush()
+
+
+def flush():
+    """Write every dirty document now."""
+    with _lock:
+        for entry in _entries.values():
+            if entry.writable:
+                _flush_entry(entry)
+
+
+def invalidate(name=None):
+    """Forget cached parses so the next lookup re-reads disk."""
+    with _lock:
+        for key in ([name] if name else list(_entries)):
+            entry = _entries.get(key)
+            if entry is not None and not entry.dirty:
+                _entries.pop(key)
+
+
+def stats():
+    with _lock:
+        s = dict(STATS)
+        s["documents"] = {
+            name: {"path": e.path, "loaded": e.data is not None, "dirty": e.dirty}
+            for name, e in _entries.items()
+        }
+    return s
+
+
+atexit.register(flush)
+
+
+if __name__ == "__main__":
+    if "--stats" in sys.argv[1:] or len(sys.argv) == 1:
+        names = list(FILES) + list(DOCS)
+        t0 = time.perf_counter()
+        for name in names:
+            get(name) if name in FILES else get_doc(name)
+        cold = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        for _ in range(10000):
+            get("brain").get("chip", {})
+        warm = (time.perf_counter() - t0) * 1000 / 10000
+        print(f"[CharacterStore] cold load {cold:.1f} ms, warm lookup {warm * 1000:.2f} µs")
+        print(json.dumps(stats(), indent=2))
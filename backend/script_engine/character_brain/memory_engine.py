@@ -9,33 +9,23 @@ Handles:
 - recency-preference for continuity
 """
 
-import json
-import os
 from datetime import datetime, timedelta
 
-BASE_DIR = os.path.dirname(__file__)
-MEM_PATH = os.path.join(BASE_DIR, "character_memory.json")
+from script_engine.character_brain import character_store
+
+MEM_PATH = character_store.DOCS["memory"]
 
 
 # -------------------------------
 # Load / Save
+# (cached in character_store; writes are batched)
 # -------------------------------
 def load_memory():
-    if not os.path.exists(MEM_PATH):
-        return {}
-    try:
-        with open(MEM_PATH, "r") as f:
-            return json.load(f)
-    except:
-        return {}
+    return character_store.get_doc("memory")
 
 
 def save_memory(mem):
-    try:
-        with open(MEM_PATH, "w") as f:
-            json.dump(mem, f, indent=2)
-    except:
-        pass
+    character_store.save("memory", mem)
 
 
 # -------------------------------
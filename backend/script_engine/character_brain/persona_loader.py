@@ -4,6 +4,9 @@ TOKNNews — Persona Loader (Module C-1)
 Loads longform character personas from character_brain.json
 and exposes deterministic access functions for the Script Engine.
 
+The brain is parsed once and held by character_store (frozen, reloaded
+when the file changes), so every lookup here is an in-memory dict hit.
+
 This module provides:
  - load_persona(character)
  - get_voice(character)
@@ -12,26 +15,13 @@ This module provides:
  - get_risk_phrasing(character)
  - get_lexicon(character)
  - get_cadence(character)
+ - get_domain(character)
  - safe fallbacks
 """
 
-import os
-import json
-
-BASE_DIR = os.path.dirname(__file__)
-BRAIN_PATH = os.path.join(BASE_DIR, "character_brain.json")
-
-
-# ---------------------------------------------------------
-# Load persona brain once at import
-# ---------------------------------------------------------
+from script_engine.character_brain import character_store
 
-try:
-    with open(BRAIN_PATH, "r", encoding="utf-8") as f:
-        _BRAIN = json.load(f)
-except Exception as e:
-    print(f"[PersonaLoader] ERROR loading brain: {e}")
-    _BRAIN = {}
+BRAIN_PATH = character_store.FILES["brain"]
 
 
 # ---------------------------------------------------------
@@ -40,8 +30,9 @@ except Exception as e:
 
 def _safe(character: str) -> dict:
     """Return persona dict or safe fallback."""
+    brain = character_store.get("brain")
     c = (character or "").lower()
-    return _BRAIN.get(c, _BRAIN.get("chip", {}))
+    return brain.get(c) or brain.get("chip", {})
 
 
 # ---------------------------------------------------------
@@ -140,6 +131,13 @@ def get_rules(character: str) -> dict:
     return _safe(character).get("rules", {})
 
 
+def get_domain(character: str) -> list:
+    """
+    Return the anchor's coverage domains (e.g. ['defi', 'onchain']).
+    """
+    return _safe(character).get("domains", [])
+
+
 # ---------------------------------------------------------
 # Debug helper
 # ---------------------------------------------------------
@@ -149,7 +147,7 @@ def debug_summary():
     Print a simple summary for troubleshooting.
     """
     print("=== Persona Loader Summary ===")
-    for key, p in _BRAIN.items():
+    for key, p in character_store.get("brain").items():
         print(f"- {key} :: voice={p.get('voice_id','')}  persona_lines={len(p.get('persona',[]))}")
 
 
@@ -4,7 +4,9 @@ TOKNNews — Director State (Persistent PD + Character Memory)
 Module C-7
 """
 
-import os, json, time
+import copy
+
+from script_engine.character_brain import character_store
 
 STATE_PATH = "/var/www/toknnews-live/backend/script_engine/director/director_state.json"
 
@@ -31,18 +33,15 @@ DEFAULT_STATE = {
 }
 
 
+# cached in character_store: one read per process (plus hot reload),
+# writes batched with the character memory
+character_store.register("director_state", STATE_PATH,
+                         default=lambda: copy.deepcopy(DEFAULT_STATE))
+
+
 def load_state():
-    if not os.path.exists(STATE_PATH):
-        return DEFAULT_STATE.copy()
-    try:
-        with open(STATE_PATH, "r") as f:
-            return json.load(f)
-    except:
-        return DEFAULT_STATE.copy()
+    return character_store.get_doc("director_state")
 
 
 def save_state(state):
-    tmp = STATE_PATH + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(state, f, indent=2)
-    os.replace(tmp, STATE_PATH)
+    character_store.save("director_state", state)
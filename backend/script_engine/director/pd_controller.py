@@ -12,11 +12,13 @@ Controls:
 """
 
 import time
+import threading
 
 # State + routing imports
 from script_engine.director.director_state import load_state, save_state
 from script_engine.director.segment_router import route_segment
 from script_engine.director.ad_logic import should_insert_ad
+from script_engine.keyword_matcher import first
 
 
 # =====================================================================
@@ -28,28 +30,11 @@ def select_anchors(state, headline):
     Basic domain-based anchor selection.
     PD may override this depending on suggested_anchor or breaking.
     """
-    h = headline.lower()
-
-    if "regulat" in h or "sec" in h or "lawsuit" in h:
-        return ["lawson"]
-
-    if "solana" in h or "defi" in h or "liquidity" in h:
-        return ["reef"]
-
-    if "market" in h or "macro" in h or "inflation" in h:
-        return ["bond"]
-
-    if "on-chain" in h or "blockchain data" in h:
-        return ["ledger"]
-
-    if "ai" in h or "compute" in h or "model" in h:
-        return ["neura"]
-
-    if "funding" in h or "venture" in h:
-        return ["cap"]
-
-    if "retail" in h or "meme" in h or "community" in h:
-        return ["penny"]
+    # keyword_matcher "pd_anchor" group, in priority order:
+    # lawson > reef > bond > ledger > neura > cap > penny
+    anchor = first(headline, "pd_anchor")
+    if anchor:
+        return [anchor]
 
     # Fallback: rotation pool
     return ["reef", "lawson", "bond"]
@@ -118,7 +103,17 @@ def apply_duo_anchor(anchors):
 # MAIN PD CONTROLLER
 # =====================================================================
 
+# run_pd is a load / modify / save of the shared director state
+# (intro_played, cycle rotation): one caller at a time.
+_pd_lock = threading.Lock()
+
+
 def run_pd(headline, suggested_anchor=None):
+    with _pd_lock:
+        return _run_pd(headline, suggested_anchor)
+
+
+def _run_pd(headline, suggested_anchor=None):
     state = load_state()
 
     # ------------------------------------------
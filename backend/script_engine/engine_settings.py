@@ -0,0 +1,6 @@
+# ------------------------------------------------------------
+# TOKNNews Engine — Global Toggle Settings
+# ------------------------------------------------------------
+
+# Global writer toggle (default False)
+USE_OPENAI_WRITER = True
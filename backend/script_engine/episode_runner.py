@@ -8,145 +8,202 @@ Builds a full episode:
 Then:
  - Generates ALL ElevenLabs audio blocks
  - Stitches them into ONE final .mp3 file
+
+Pipelined: scripts are written concurrently and ahead of TTS, audio
+renders segment by segment as scripts land, and the final stitch mixes
+the already-rendered block files instead of re-synthesizing them.
 """
 
 import time
-import json
 import os
+import contextvars
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
+from script_engine.jsonio import write_json, load_json
 from script_engine.knowledge.episode_builder import build_episode, save_episode
 from script_engine.script_engine_v3 import generate_script
-from script_engine.audio.audio_block_renderer import render_audio_blocks
+from script_engine.director.pd_controller import run_pd
+from script_engine.audio.audio_block_renderer import render_audio_stream, AUDIO_SERVICE, MIX_TIMEOUT
+from script_engine.llm_usage import usage_context
+from script_engine.openai_writer import persona_prompt_stats
 
 BROADCAST_DIR = "/var/www/toknnews-live/data/broadcast_blocks"
 
 
 # =====================================================================
-# MAIN EPISODE RUNNER
+# SEGMENT PLAN
 # =====================================================================
 
-def run_episode():
+# Script jobs run SCRIPT_WORKERS at a time, ahead of the audio stage, so
+# scripting segment N+1 (and every rundown story) overlaps TTS of
+# segment N. Audio renders one segment at a time, in air order.
+SCRIPT_WORKERS = int(os.getenv("TOKN_EPISODE_SCRIPT_WORKERS", "3"))
+AIR_WINDOW_SECONDS = 20 * 60
 
-    # 1. Build episode structure
-    episode = build_episode(rundown_count=6)
 
-    if "error" in episode:
-        print("[EpisodeRunner] No stories available.")
-        return None
-
-    # 2. Save episode metadata
-    ep_path = save_episode(episode)
-    print("[EpisodeRunner] Episode saved:", ep_path)
-
-    os.makedirs(BROADCAST_DIR, exist_ok=True)
-    block_files = []
-
-    # =================================================================
-    # 3. Generate all segment blocks
-    # =================================================================
+def plan_jobs(episode):
+    """Flatten segments into ordered script jobs: (seg_type, generate_script kwargs)."""
+    rundown_ctx = {
+        "rundown_headlines": [item["headline"] for item in episode["rundown"]],
+        "rundown_summaries": [item["summary"] for item in episode["rundown"]],
+    }
+    jobs = []
     for seg in episode["segments"]:
         seg_type = seg["type"]
 
         # -------------------------------------------------------------
-        # CHIP RUNDOWN
+        # CHIP RUNDOWN — one job per story
         # -------------------------------------------------------------
         if seg_type == "chip_rundown":
             for rd in seg["stories"]:
-                primary = "chip"
-                pkg = generate_script(
+                jobs.append((seg_type, dict(
                     headline=rd["headline"],
                     article_context=rd["summary"],
-                    cluster_articles=[],
-                    character=primary,
-                    pd_suggested_anchor=primary,
-                    rundown_headlines=[item["headline"] for item in episode["rundown"]],
-                    rundown_summaries=[item["summary"] for item in episode["rundown"]],
-
-                )
-
-                # save block
-                block_path = save_block(pkg)
-                block_files.append(block_path)
-
-                # render audio for this block
-                scene_id = pkg.get("scene_id", "manual_scene")
-                render_audio_blocks(scene_id, pkg["audio_blocks"])
+                    character="chip",
+                    pd_suggested_anchor="chip",
+                )))
 
         # -------------------------------------------------------------
         # DEEP DIVE
         # -------------------------------------------------------------
         elif seg_type == "deep_dive":
             dd = seg["story"]
-            anchors = dd.get("anchors", ["chip"])
-            primary = anchors[0]
-
-            pkg = generate_script(
+            primary = dd.get("anchors", ["chip"])[0]
+            jobs.append((seg_type, dict(
                 headline=dd["headline"],
                 article_context=dd["summary"],
-                cluster_articles=[],
                 character=primary,
                 pd_suggested_anchor=primary,
-                rundown_headlines=[item["headline"] for item in episode["rundown"]],
-                rundown_summaries=[item["summary"] for item in episode["rundown"]],
-
-            )
-
-            block_path = save_block(pkg)
-            block_files.append(block_path)
-
-            scene_id = pkg.get("scene_id", "manual_scene")
-            render_audio_blocks(scene_id, pkg["audio_blocks"])
+            )))
 
         # -------------------------------------------------------------
         # ANCHOR ANALYSIS
         # -------------------------------------------------------------
         elif seg_type == "anchor_analysis":
-            anchors = seg.get("anchors", ["chip"])
-            primary = anchors[0]
-
-            pkg = generate_script(
+            primary = seg.get("anchors", ["chip"])[0]
+            jobs.append((seg_type, dict(
                 headline=seg["headline"],
                 article_context=seg["summary"],
-                cluster_articles=[],
                 character=primary,
                 pd_suggested_anchor=primary,
-                rundown_headlines=[item["headline"] for item in episode["rundown"]],
-                rundown_summaries=[item["summary"] for item in episode["rundown"]],
+            )))
+
+    for _, kwargs in jobs:
+        kwargs.update(cluster_articles=[], **rundown_ctx)
+    return jobs
+
+
+def assign_pd(jobs):
+    """
+    Run the PD for every job serially, in air order, before scripting
+    fans out: the intro lands on the first segment and cycle / anchor
+    rotation advances in the order segments air, not finish.
+    """
+    for _, kwargs in jobs:
+        kwargs["pd_config"] = run_pd(kwargs["headline"],
+                                     suggested_anchor=kwargs.get("pd_suggested_anchor"))
+    return jobs
 
-            )
 
-            block_path = save_block(pkg)
-            block_files.append(block_path)
+def _script_job(seg_type, kwargs):
+    with usage_context(segment_type=seg_type):
+        t0 = time.perf_counter()
+        pkg = generate_script(**kwargs)
+        pkg["script_seconds"] = round(time.perf_counter() - t0, 2)
+        return pkg
 
-            scene_id = pkg.get("scene_id", "manual_scene")
-            render_audio_blocks(scene_id, pkg["audio_blocks"])
 
-        time.sleep(1)
+def _audio_job(scene_id, pkg, seq):
+    """TTS for one scripted segment; saves the block with its audio files."""
+    t0 = time.perf_counter()
+    result = render_audio_stream(scene_id, iter(pkg["timeline"]))
+    pkg["scene_id"] = scene_id
+    pkg["audio_blocks"] = result["audio_blocks"]
+    pkg["final_audio"] = result["final_audio"]
+    pkg["audio_seconds"] = round(time.perf_counter() - t0, 2)
+    return save_block(pkg, seq)
+
+
+# =====================================================================
+# MAIN EPISODE RUNNER
+# =====================================================================
+
+def run_episode():
+
+    # 1. Build episode structure
+    episode = build_episode(rundown_count=6)
+
+    if "error" in episode:
+        print("[EpisodeRunner] No stories available.")
+        return None
+
+    # 2. Save episode metadata
+    ep_path = save_episode(episode)
+    print("[EpisodeRunner] Episode saved:", ep_path)
+
+    os.makedirs(BROADCAST_DIR, exist_ok=True)
+    episode_id = episode["episode_id"]
+    jobs = assign_pd(plan_jobs(episode))
+    t_start = time.perf_counter()
+
+    # =================================================================
+    # 3. Script (concurrent, ahead) → audio (in order), pipelined
+    # =================================================================
+    block_files = []
+    with usage_context(episode=episode_id), \
+            ThreadPoolExecutor(max_workers=SCRIPT_WORKERS, thread_name_prefix="episode-script") as scripts, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="episode-audio") as audio:
+
+        script_futs = [
+            scripts.submit(contextvars.copy_context().run, _script_job, seg_type, kwargs)
+            for seg_type, kwargs in jobs
+        ]
+        audio_futs = []
+        for seq, ((seg_type, kwargs), fut) in enumerate(zip(jobs, script_futs)):
+            try:
+                pkg = fut.result()
+            except Exception as e:
+                print(f"[EpisodeRunner] ⚠️ script failed for {seg_type} '{kwargs['headline']}':", e)
+                continue
+            print(f"[EpisodeRunner] ✅ scripted {seq + 1}/{len(jobs)} {seg_type} "
+                  f"in {pkg['script_seconds']}s → audio")
+            audio_futs.append(audio.submit(_audio_job, f"{episode_id}_{seq:02d}", pkg, seq))
+
+        for fut in audio_futs:
+            try:
+                block_files.append(fut.result())
+            except Exception as e:
+                print("[EpisodeRunner] ⚠️ audio failed:", e)
 
     # =================================================================
-    # 4. STITCH ALL AUDIO INTO ONE FINAL EPISODE MP3
+    # 4. STITCH — mix the already-rendered block files (no re-synthesis)
     # =================================================================
+    block_paths = []
+    for fp in block_files:
+        seg = load_json(fp, {})
+        block_paths.extend(b["audio_file"] for b in seg.get("audio_blocks", []) if b.get("audio_file"))
+
     try:
-        final_payload = {
-            "scene_id": episode["episode_id"],
-            "audio_blocks": []
-        }
-
-        # collect EVERY audio block written
-        for fp in block_files:
-            with open(fp, "r") as f:
-                seg = json.load(f)
-                final_payload["audio_blocks"].extend(seg["audio_blocks"])
-
-        r = requests.post("http://localhost:8999/render_scene", json=final_payload)
+        r = requests.post(f"{AUDIO_SERVICE}/mix_scene",
+                          json={"scene_id": episode_id, "block_paths": block_paths},
+                          timeout=MIX_TIMEOUT)
         result = r.json()
-
         print("[EpisodeRunner] Final episode audio:", result)
-
     except Exception as e:
         print("[EpisodeRunner] ERROR stitching final audio:", e)
 
+    elapsed = time.perf_counter() - t_start
+    flag = "✅" if elapsed < AIR_WINDOW_SECONDS else "⚠️ over air window —"
+    print(f"[EpisodeRunner] {flag} {len(block_files)}/{len(jobs)} segments, "
+          f"{len(block_paths)} audio blocks in {elapsed:.0f}s (window {AIR_WINDOW_SECONDS}s)")
+
+    # persona prompt prefix reuse for this run (compiled once, reused per line)
+    pp = persona_prompt_stats()
+    top = ", ".join(f"{k}×{n}" for k, n in list(pp["prefixes"].items())[:3])
+    print(f"[EpisodeRunner] persona prompts: {pp.get('compiled', 0)} compiled, "
+          f"{pp.get('reused', 0)} reused across {len(pp['prefixes'])} prefixes ({top})")
+
     return block_files
 
 
@@ -155,13 +212,12 @@ def run_episode():
 # SAVE BLOCK HELPER
 # =====================================================================
 
-def save_block(pkg):
+def save_block(pkg, seq=None):
     ts = int(time.time())
-    fname = f"block_{ts}.json"
+    fname = f"block_{ts}.json" if seq is None else f"block_{ts}_{seq:02d}.json"
     path = os.path.join(BROADCAST_DIR, fname)
 
-    with open(path, "w") as f:
-        json.dump(pkg, f, indent=2)
+    write_json(path, pkg)
 
     print(f"[EpisodeRunner] Saved broadcast block: {path}")
     return path
@@ -10,22 +10,15 @@ It is the SINGLE entrypoint for all character speech.
 """
 
 import json
-import os
-from openai import OpenAI
+from script_engine.llm_client import chat
+from script_engine.llm_usage import usage_context
+from script_engine.character_brain import character_store
 
-# Load Persona DNA (character_brain.json)
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-BRAIN_PATH = os.path.join(BASE_DIR, "character_brain", "character_brain.json")
+# Persona DNA (character_brain.json), cached + hot-reloaded by character_store
+BRAIN_PATH = character_store.FILES["brain"]
 
 def load_brain():
-    try:
-        with open(BRAIN_PATH, "r") as f:
-            return json.load(f)
-    except:
-        return {}
-
-# Create GPT client
-client = OpenAI()
+    return character_store.get("brain")
 
 def generate_gpt_persona_line(character, enriched):
     """
@@ -81,15 +74,16 @@ A single spoken line for {character}.
 """
 
     # GPT call
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role":"system","content":"You generate natural TV-anchor dialogue."},
-            {"role":"user","content":prompt}
-        ],
-        max_tokens=80,
-        temperature=0.9
-    )
+    with usage_context(persona=character, line_type="persona_line"):
+        response = chat(
+            model="gpt-4o-mini",
+            messages=[
+                {"role":"system","content":"You generate natural TV-anchor dialogue."},
+                {"role":"user","content":prompt}
+            ],
+            max_tokens=80,
+            temperature=0.9
+        )
 
     line = response.choices[0].message.content.strip()
 
@@ -1,6 +1,8 @@
 # backend/script_engine/hybrid_tone/cluster_engine.py
 
-from .embedding_engine import embed_text, cosine_sim
+import numpy as np
+
+from .embedding_engine import embed_texts, cosine_sims
 
 def detect_story_cluster(current, recent_stories, similarity_threshold=0.83):
     """
@@ -9,22 +11,22 @@ def detect_story_cluster(current, recent_stories, similarity_threshold=0.83):
     - top_match
     - similarity_scores
     - cluster_line (Chip-ready)
-    """
-
-    current_vec = embed_text(current.get("headline", ""))
 
-    similarities = []
-    for s in recent_stories:
-        vec = embed_text(s.get("headline", ""))
-        score = cosine_sim(current_vec, vec)
-        similarities.append((s, score))
+    All headlines are embedded in one cached, batched call; similarities
+    are one matrix-vector product over the normalized vectors.
+    """
 
-    if not similarities:
+    if not recent_stories:
         return {"cluster_line": "", "cluster_strength": 0}
 
-    # Sort descending by similarity
-    similarities.sort(key=lambda x: x[1], reverse=True)
-    top_story, top_score = similarities[0]
+    vecs = embed_texts(
+        [current.get("headline", "")] + [s.get("headline", "") for s in recent_stories]
+    )
+    current_vec = vecs[0] if vecs.size and vecs[0].any() else None
+    scores = cosine_sims(current_vec, vecs[1:])
+
+    top = int(np.argmax(scores))
+    top_story, top_score = recent_stories[top], float(scores[top])
 
     # Strong match → same evolving story
     if top_score >= similarity_threshold:
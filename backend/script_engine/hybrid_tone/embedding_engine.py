@@ -4,28 +4,357 @@
 A-16 Embedding Engine
 Chip uses this to compute vector representations of headlines
 for clustering, similarity detection, and narrative tracking.
+
+Backends (TOKN_EMBED_BACKEND):
+ - "local"  : sentence-transformers on CPU (TOKN_EMBED_LOCAL_MODEL,
+              default all-MiniLM-L6-v2, 384-d), batch-encoded; served by
+              the resident embedding_service when it is running, else
+              loaded once in this process; TOKN_EMBED_ONNX=1 runs the ONNX
+              export (TOKN_EMBED_ONNX_FILE picks e.g. a quantized qint8 file)
+ - "openai" : text-embedding-3-small over llm_client; TOKN_EMBED_DIM
+              asks the API for shortened vectors
+embedding_dim() is the configured backend's vector size. Clustering,
+recall and dedupe work offline with the local backend.
+
+Embeddings are cached by (backend, model, dim, sha256 of text):
+ - small in-process LRU in front of an on-disk SQLite table
+ - vectors stored L2-normalized as float32 blobs, so a dot product
+   is the cosine similarity
+ - embed_texts() sends every miss in one embeddings request
+   (chunked at EMBED_BATCH inputs); hits make no network call
+
+TOKN_EMBED_CACHE=0 disables the cache.
+
+    python3 -m script_engine.hybrid_tone.embedding_engine --stats | --clear
+    python3 -m script_engine.hybrid_tone.embedding_engine --bench [local|openai]
 """
 
 import os
-import openai
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+EMBED_MODEL = "text-embedding-3-small"   # fast + cheap (remote backend)
+LOCAL_MODEL = os.getenv("TOKN_EMBED_LOCAL_MODEL", "all-MiniLM-L6-v2")
+BACKEND = os.getenv("TOKN_EMBED_BACKEND", "local")
+EMBED_DIM = int(os.getenv("TOKN_EMBED_DIM", "0")) or None
+USE_ONNX = os.getenv("TOKN_EMBED_ONNX", "0").lower() in ("1", "true", "yes")
+ONNX_FILE = os.getenv("TOKN_EMBED_ONNX_FILE", "")
+LOCAL_BATCH = int(os.getenv("TOKN_EMBED_LOCAL_BATCH", "64"))
+USE_SERVICE = os.getenv("TOKN_EMBED_SERVICE", "1").lower() not in ("0", "false", "no")
+SERVICE_RETRIES = int(os.getenv("TOKN_EMBED_SERVICE_RETRIES", "2"))
+
+# native sizes, so the dimension is known without loading a model
+MODEL_DIMS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "all-MiniLM-L6-v2": 384,
+    "all-MiniLM-L12-v2": 384,
+    "all-mpnet-base-v2": 768,
+}
+
+CACHE_PATH = os.getenv("TOKN_EMBED_CACHE_PATH", "/var/www/toknnews-live/data/embedding_cache.db")
+ENABLED = os.getenv("TOKN_EMBED_CACHE", "1").lower() not in ("0", "false", "no")
+EMBED_BATCH = int(os.getenv("TOKN_EMBED_BATCH", "256"))
+MEMORY_ENTRIES = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key     TEXT PRIMARY KEY,
+    model   TEXT NOT NULL,
+    dim     INTEGER NOT NULL,
+    vec     BLOB NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+_lock = threading.Lock()
+_conn = None
+_memory = OrderedDict()        # key -> normalized float32 vector
+
+STATS = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "requests": 0, "errors": 0}
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+class OpenAIBackend:
+    """Remote embeddings via the shared llm_client."""
+    name = "openai"
+
+    def __init__(self, model=EMBED_MODEL, dim=EMBED_DIM):
+        self.model = model
+        self.requested_dim = dim
+        self.dim = dim or MODEL_DIMS.get(model)
+
+    def encode(self, texts):
+        from script_engine.llm_client import embed
+        kwargs = {"dimensions": self.requested_dim} if self.requested_dim else {}
+        resp = embed(model=self.model, input=list(texts), **kwargs)
+        rows = [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
+        vecs = np.asarray(rows, dtype=np.float32)
+        self.dim = vecs.shape[1]
+        return vecs
+
+
+class LocalBackend:
+    """sentence-transformers on CPU, one model per process."""
+    name = "local"
+
+    def __init__(self, model=LOCAL_MODEL, onnx=USE_ONNX, onnx_file=ONNX_FILE):
+        self.model = model
+        self.onnx = onnx
+        self.onnx_file = onnx_file
+        self.dim = MODEL_DIMS.get(model)
+        self.resident = False        # True inside embedding_service itself
+        self.use_service = USE_SERVICE
+        self._st = None
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        if self._st is None:
+            with self._load_lock:
+                if self._st is None:
+                    from sentence_transformers import SentenceTransformer
+                    t0 = time.perf_counter()
+                    if self.onnx:
+                        kwargs = {"model_kwargs": {"file_name": self.onnx_file}} if self.onnx_file else {}
+                        st = SentenceTransformer(self.model, device="cpu", backend="onnx", **kwargs)
+                    else:
+                        st = SentenceTransformer(self.model, device="cpu")
+                    self.dim = st.get_sentence_embedding_dimension()
+                    self._st = st
+                    print(f"[EmbeddingEngine] ✅ loaded {self.model}"
+                          f"{' (onnx)' if self.onnx else ''} in {time.perf_counter() - t0:.1f}s")
+        return self._st
+
+    def encode(self, texts):
+        """Unit-length float32 vectors; a str gives one vector, a list a matrix."""
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        vecs = self._remote(batch)
+        if vecs is None:
+            vecs = self._load().encode(
+                batch,
+                batch_size=LOCAL_BATCH,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ).astype(np.float32, copy=False)
+        return vecs[0] if single else vecs
+
+    def _remote(self, batch):
+        """
+        Vectors from the resident service, or None to encode in-process.
+        Timeouts are retried (the service is up, just busy); only a
+        missing / refused socket or a different model falls back. The
+        service stays preferred even after an in-process load.
+        """
+        if not self.use_service or self.resident:
+            return None
+        from .embedding_service import remote_encode, ServiceUnavailable, ServiceBusy, ServiceMismatch
+        for attempt in range(SERVICE_RETRIES + 1):
+            try:
+                vecs = remote_encode(batch, model=self.model)
+                break
+            except ServiceBusy as e:
+                if attempt == SERVICE_RETRIES:
+                    print(f"[EmbeddingEngine] ⚠️ embed service busy ({e}); encoding this batch in-process")
+                else:
+                    print(f"[EmbeddingEngine] ⚠️ embed service busy ({e}), retry {attempt + 1}/{SERVICE_RETRIES}")
+            except ServiceMismatch as e:
+                print(f"[EmbeddingEngine] ⚠️ {e}; encoding {self.model} in-process")
+                self.use_service = False
+                return None
+            except ServiceUnavailable:
+                return None
+        else:
+            return None
+        if vecs.ndim == 2 and vecs.shape[1]:
+            self.dim = vecs.shape[1]
+        return vecs
+
+
+BACKENDS = {"local": LocalBackend, "openai": OpenAIBackend}
+_backends = {}
+
+
+def get_backend(name=None):
+    """Shared backend instance (created once per process)."""
+    name = name or BACKEND
+    backend = _backends.get(name)
+    if backend is None:
+        with _lock:
+            backend = _backends.get(name)
+            if backend is None:
+                if name not in BACKENDS:
+                    raise ValueError(f"unknown embedding backend: {name}")
+                backend = _backends[name] = BACKENDS[name]()
+    return backend
+
+
+def embedding_dim(name=None):
+    """Vector size of the configured backend (None if not yet known)."""
+    return get_backend(name).dim
+
+
+# ---------------------------------------------------------
+# Cache storage
+# ---------------------------------------------------------
+def _model_id(backend):
+    dim = getattr(backend, "requested_dim", None)
+    return f"{backend.name}:{backend.model}" + (f":{dim}" if dim else "")
+
+
+def cache_key(text, model_id):
+    return hashlib.sha256(f"{model_id}|{text}".encode("utf-8")).hexdigest()
+
+
+def _disable(e):
+    """Cache path missing / unwritable: embed uncached for this process."""
+    global ENABLED
+    if ENABLED:
+        print(f"[EmbeddingEngine] ⚠️ cache unavailable at {CACHE_PATH}, running uncached: {e}")
+    ENABLED = False
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, timeout=30, check_same_thread=False,
+                                isolation_level=None)
+        _conn.execute("PRAGMA journal_mode=WAL;")
+        _conn.execute("PRAGMA synchronous=NORMAL;")
+        _conn.executescript(SCHEMA)
+    return _conn
+
+
+def _remember(key, vec):
+    _memory[key] = vec
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _lookup(keys):
+    """{key: vec} for cached keys. Caller holds _lock."""
+    found = {}
+    missing = []
+    for key in keys:
+        vec = _memory.get(key)
+        if vec is not None:
+            _memory.move_to_end(key)
+            found[key] = vec
+            STATS["memory_hits"] += 1
+        else:
+            missing.append(key)
+
+    for i in range(0, len(missing), 500):
+        chunk = missing[i:i + 500]
+        rows = _db().execute(
+            f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+            chunk
+        ).fetchall()
+        for key, blob in rows:
+            vec = np.frombuffer(blob, dtype=np.float32)
+            _remember(key, vec)
+            found[key] = vec
+            STATS["disk_hits"] += 1
+    return found
+
+
+def _store(rows, model):
+    """rows: [(key, vec)]. Caller holds _lock."""
+    now = time.time()
+    _db().executemany(
+        "INSERT OR REPLACE INTO embeddings (key, model, dim, vec, created) VALUES (?, ?, ?, ?, ?)",
+        [(key, model, len(vec), vec.tobytes(), now) for key, vec in rows]
+    )
+    for key, vec in rows:
+        _remember(key, vec)
+
+
+def _normalize(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+def embed_texts(texts, backend=None):
+    """
+    (len(texts), dim) float32 matrix of L2-normalized embeddings.
+    Rows for empty texts, or texts that could not be embedded, are all
+    zeros (empty inputs are never sent: the API rejects the whole batch).
+    """
+    backend = backend if hasattr(backend, "encode") else get_backend(backend)
+    model = _model_id(backend)
+    texts = [t or "" for t in texts]
+    if not texts:
+        return np.zeros((0, backend.dim or 0), dtype=np.float32)
+
+    keys = [cache_key(t, model) for t in texts]
+    found = {}
+    if ENABLED:
+        with _lock:
+            try:
+                found = _lookup(set(keys))
+            except sqlite3.Error as e:
+                print("[EmbeddingEngine] ⚠️ cache lookup failed:", e)
+            except OSError as e:
+                _disable(e)
+
+    # unique non-empty misses, first-seen order
+    misses = list(dict.fromkeys(
+        (k, t) for k, t in zip(keys, texts) if k not in found and t.strip()
+    ))
+    for i in range(0, len(misses), EMBED_BATCH):
+        chunk = misses[i:i + EMBED_BATCH]
+        try:
+            vecs = backend.encode([t for _, t in chunk])
+        except Exception as e:
+            STATS["errors"] += 1
+            print(f"[EmbeddingEngine] ⚠️ {backend.name} embedding failed: {type(e).__name__}: {e}")
+            continue
+        STATS["requests"] += 1
+        STATS["misses"] += len(chunk)
+        rows = [(k, _normalize(v)) for (k, _), v in zip(chunk, vecs)]
+        found.update(rows)
+        if ENABLED:
+            with _lock:
+                try:
+                    _store(rows, model)
+                except sqlite3.Error as e:
+                    print("[EmbeddingEngine] ⚠️ cache store failed:", e)
+                except OSError as e:
+                    _disable(e)
+
+    dim = backend.dim or next((len(v) for v in found.values()), 0)
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, key in enumerate(keys):
+        vec = found.get(key)
+        if vec is not None and len(vec) == dim:
+            out[i] = vec
+    return out
 
-EMBED_MODEL = "text-embedding-3-small"   # fast + cheap
 
 def embed_text(text: str):
     """
-    Returns a numpy vector embedding for text.
+    Returns a normalized numpy vector embedding for text (None on failure).
     """
-    try:
-        resp = openai.embeddings.create(
-            model=EMBED_MODEL,
-            input=text
-        )
-        return np.array(resp.data[0].embedding)
-    except Exception:
+    vecs = embed_texts([text])
+    if not vecs.size or not vecs[0].any():
         return None
+    return vecs[0]
 
 
 def cosine_sim(a, b):
@@ -35,3 +364,61 @@ def cosine_sim(a, b):
     if a is None or b is None:
         return 0.0
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def cosine_sims(vec, matrix):
+    """
+    Cosine similarity of vec against every row of matrix, in one
+    matrix-vector product (rows from embed_texts are already unit length).
+    """
+    if vec is None or not len(matrix):
+        return np.zeros(len(matrix), dtype=np.float32)
+    return matrix @ vec
+
+
+def stats():
+    backend = get_backend()
+    with _lock:
+        s = dict(STATS)
+        s["backend"] = _model_id(backend)
+        s["dim"] = backend.dim
+        try:
+            s["entries"] = _db().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        except (sqlite3.Error, OSError):
+            s["entries"] = None
+    hits = s["memory_hits"] + s["disk_hits"]
+    s["hit_rate"] = round(hits / (hits + s["misses"]), 4) if hits + s["misses"] else 0.0
+    return s
+
+
+def clear():
+    with _lock:
+        _memory.clear()
+        _db().execute("DELETE FROM embeddings")
+
+
+def bench(n=256, name=None):
+    """Cold load + batched encode latency for a backend (bypasses the cache)."""
+    backend = get_backend(name)
+    texts = [f"Headline {i}: markets react to liquidity shifts in sector {i % 17}"
+             for i in range(n)]
+    t0 = time.perf_counter()
+    backend.encode(texts[:1])
+    first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vecs = backend.encode(texts)
+    batch = time.perf_counter() - t0
+    print(f"[EmbeddingEngine] {_model_id(backend)} dim={vecs.shape[1]}")
+    print(f"  first call (incl. load): {first * 1000:.0f} ms")
+    print(f"  batch of {n}: {batch * 1000:.0f} ms ({batch / n * 1000:.2f} ms/text)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--bench" in args:
+        names = [a for a in args if not a.startswith("--")]
+        bench(name=names[0] if names else None)
+        sys.exit(0)
+    if "--clear" in args:
+        clear()
+    print(json.dumps(stats(), indent=2))
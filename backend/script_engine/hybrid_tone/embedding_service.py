@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Resident Embedding Service
+One process keeps the local sentence-transformers model loaded and
+serves encode requests over a Unix socket, so the sandbox scripts and
+live components stop paying model load time and memory per process.
+
+ - Socket: TOKN_EMBED_SOCKET (default /tmp/toknnews-embed.sock)
+ - Micro-batching: requests arriving within TOKN_EMBED_BATCH_WAIT_MS of
+   each other are encoded together (up to TOKN_EMBED_MAX_BATCH texts)
+ - Wire format: 4-byte little-endian length + JSON request;
+   reply is a length-prefixed JSON header ({"n", "dim"} or {"error"})
+   followed by n * dim float32 values
+ - Client: remote_encode() raises ServiceUnavailable when the socket is
+   missing / refused (embedding_engine.LocalBackend then encodes
+   in-process and retries the service after RETRY_SECONDS),
+   ServiceMismatch when the service runs another model, and ServiceBusy
+   on a timeout / dropped reply (LocalBackend retries the service)
+
+    python3 -m script_engine.hybrid_tone.embedding_service --serve
+    python3 -m script_engine.hybrid_tone.embedding_service --stats | --bench [clients]
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import socket
+import struct
+import threading
+import socketserver
+
+import numpy as np
+
+from .embedding_engine import get_backend
+
+SOCKET_PATH = os.getenv("TOKN_EMBED_SOCKET", "/tmp/toknnews-embed.sock")
+BATCH_WAIT_MS = float(os.getenv("TOKN_EMBED_BATCH_WAIT_MS", "5"))
+MAX_BATCH = int(os.getenv("TOKN_EMBED_MAX_BATCH", "256"))
+CLIENT_TIMEOUT = float(os.getenv("TOKN_EMBED_SERVICE_TIMEOUT", "10"))
+RETRY_SECONDS = 30.0      # after a failed connect, use the fallback this long
+
+_LEN = struct.Struct("<I")
+
+STATS = {"requests": 0, "texts": 0, "batches": 0, "errors": 0, "max_batch": 0}
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+class ServiceBusy(ServiceUnavailable):
+    """Transient: the service is up but did not answer in time."""
+
+
+class ServiceMismatch(ServiceUnavailable):
+    """The service runs a different model than the caller wants."""
+
+
+# ---------------------------------------------------------
+# Framing
+# ---------------------------------------------------------
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise ConnectionError("socket closed mid-frame")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _send_frame(sock, obj):
+    data = json.dumps(obj).encode("utf-8")
+    sock.sendall(_LEN.pack(len(data)) + data)
+
+
+def _recv_frame(sock):
+    (n,) = _LEN.unpack(_recv_exact(sock, _LEN.size))
+    return json.loads(_recv_exact(sock, n))
+
+
+# ---------------------------------------------------------
+# Server
+# ---------------------------------------------------------
+class _Job:
+    __slots__ = ("texts", "done", "vecs", "error")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.done = threading.Event()
+        self.vecs = None
+        self.error = None
+
+
+class _Batcher(threading.Thread):
+    """Collects concurrent jobs for up to BATCH_WAIT_MS and encodes them at once."""
+
+    def __init__(self, backend):
+        super().__init__(daemon=True)
+        self.backend = backend
+        self.jobs = queue.Queue()
+
+    def submit(self, texts):
+        job = _Job(texts)
+        self.jobs.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.vecs
+
+    def run(self):
+        while True:
+            batch = [self.jobs.get()]
+            size = len(batch[0].texts)
+            deadline = time.monotonic() + BATCH_WAIT_MS / 1000.0
+            while size < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self.jobs.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(job)
+                size += len(job.texts)
+
+            try:
+                vecs = self.backend.encode([t for job in batch for t in job.texts])
+                start = 0
+                for job in batch:
+                    job.vecs = vecs[start:start + len(job.texts)]
+                    start += len(job.texts)
+            except Exception as e:
+                STATS["errors"] += 1
+                for job in batch:
+                    job.error = e
+            STATS["batches"] += 1
+            STATS["max_batch"] = max(STATS["max_batch"], size)
+            for job in batch:
+                job.done.set()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        sock = self.request
+        try:
+            req = _recv_frame(sock)
+        except (ConnectionError, ValueError, struct.error):
+            return
+        server = self.server
+        if req.get("op") == "stats":
+            _send_frame(sock, stats_local(server))
+            return
+        if req.get("model") not in (None, server.backend.model):
+            _send_frame(sock, {"error": f"service runs {server.backend.model}", "mismatch": True})
+            return
+
+        texts = [str(t) for t in req.get("texts", [])]
+        STATS["requests"] += 1
+        STATS["texts"] += len(texts)
+        try:
+            vecs = server.batcher.submit(texts) if texts else np.zeros((0, 0), np.float32)
+        except Exception as e:
+            _send_frame(sock, {"error": f"{type(e).__name__}: {e}"})
+            return
+        vecs = np.ascontiguousarray(vecs, dtype=np.float32)
+        dim = vecs.shape[1] if vecs.ndim == 2 else 0
+        try:
+            _send_frame(sock, {"n": len(texts), "dim": dim})
+            sock.sendall(vecs.tobytes())
+        except (BrokenPipeError, ConnectionResetError):
+            pass    # caller timed out and will retry
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 256      # default 5 refuses bursts of concurrent callers
+
+
+def serve(path=SOCKET_PATH):
+    """Load the model once and serve until interrupted."""
+    backend = get_backend("local")
+    backend.resident = True           # encode in-process, never via the socket
+    backend.encode(["warm up"])
+    if os.path.exists(path):
+        os.remove(path)
+    server = _Server(path, _Handler)
+    os.chmod(path, 0o660)
+    server.backend = backend
+    server.batcher = _Batcher(backend)
+    server.batcher.start()
+    server.started = time.time()
+    print(f"[EmbedService] ✅ {backend.model} (dim {backend.dim}) serving on {path}")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))   # pm2 stop -> clean up socket
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def stats_local(server):
+    s = dict(STATS)
+    s["model"] = server.backend.model
+    s["uptime_s"] = round(time.time() - server.started, 1)
+    s["avg_batch"] = round(s["texts"] / s["batches"], 2) if s["batches"] else 0.0
+    return s
+
+
+# ---------------------------------------------------------
+# Client
+# ---------------------------------------------------------
+_down_until = 0.0
+
+
+def _request(obj, timeout=CLIENT_TIMEOUT):
+    global _down_until
+    if time.monotonic() < _down_until or not os.path.exists(SOCKET_PATH):
+        raise ServiceUnavailable(SOCKET_PATH)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(SOCKET_PATH)
+        except (FileNotFoundError, ConnectionRefusedError):
+            # stale socket / service stopped: skip it for a while
+            _down_until = time.monotonic() + RETRY_SECONDS
+            raise
+        _send_frame(sock, obj)
+        header = _recv_frame(sock)
+        if "error" in header:
+            raise (ServiceMismatch if header.get("mismatch") else ServiceUnavailable)(header["error"])
+        if "n" not in header:
+            return header
+        n, dim = header["n"], header["dim"]
+        data = _recv_exact(sock, n * dim * 4)
+        return np.frombuffer(data, dtype=np.float32).reshape(n, dim)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ServiceUnavailable(f"{type(e).__name__}: {e}") from e
+    except OSError as e:
+        # timeout, full accept backlog, reply cut short: the service is up
+        raise ServiceBusy(f"{type(e).__name__}: {e}") from e
+    except (ValueError, struct.error) as e:
+        raise ServiceUnavailable(f"{type(e).__name__}: {e}") from e
+    finally:
+        sock.close()
+
+
+def remote_encode(texts, model=None):
+    """(len(texts), dim) float32 unit vectors from the resident service."""
+    return _request({"texts": list(texts), "model": model})
+
+
+def service_stats():
+    return _request({"op": "stats"})
+
+
+def bench(clients=16, per_client=20):
+    """Concurrent single-text callers against the running service."""
+    lat = []
+    lock = threading.Lock()
+
+    def worker(i):
+        for j in range(per_client):
+            t0 = time.perf_counter()
+            remote_encode([f"client {i} headline {j} about liquidity and rates"])
+            with lock:
+                lat.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    lat.sort()
+    print(f"[EmbedService] {clients} clients x {per_client} requests in {wall * 1000:.0f} ms")
+    print(f"  p50 {lat[len(lat) // 2]:.1f} ms, p95 {lat[int(0.95 * (len(lat) - 1))]:.1f} ms")
+    print(json.dumps(service_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--serve" in args:
+        serve()
+    elif "--bench" in args:
+        names = [a for a in args if not a.startswith("--")]
+        bench(int(names[0]) if names else 16)
+    else:
+        try:
+            print(json.dumps(service_stats(), indent=2))
+        except ServiceUnavailable as e:
+            print(f"[EmbedService] ❌ not running ({e})")
+            sys.exit(1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Import-Time Profiler + Cold-Start Budget
+Every subprocess that generates a script pays the package's import cost
+before its first line. This measures it in a fresh interpreter
+(python -X importtime) and enforces a budget.
+
+    python3 -m script_engine.import_profile [module] [--top 25]
+    python3 -m script_engine.import_profile --check        # exit 1 if over budget
+
+--check imports script_engine.script_engine_v3 (generate_script) cold,
+best of COLD_START_RUNS, and fails when it exceeds TOKN_COLD_START_BUDGET_MS
+or when any heavy dependency (OpenAI SDK, httpx, pydub, hvac, torch /
+sentence-transformers, asyncio) is imported before first use.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULE = "script_engine.script_engine_v3"
+BUDGET_MS = float(os.getenv("TOKN_COLD_START_BUDGET_MS", "250"))
+COLD_START_RUNS = 3
+
+# must stay lazy: loaded on first use, never by importing the engine
+HEAVY_MODULES = (
+    "openai", "httpx", "asyncio", "pydub", "hvac",
+    "sentence_transformers", "torch", "numpy", "requests",
+)
+
+
+def _run(code, importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(cmd, cwd=PACKAGE_ROOT, capture_output=True, text=True)
+
+
+def profile(module=DEFAULT_MODULE):
+    """[(self_us, cumulative_us, name)] in import order, or raises on ImportError."""
+    proc = _run(f"import {module}", importtime=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((int(self_us), int(cum_us), name.rstrip()))
+        except ValueError:
+            continue
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise ImportError(f"{module}: {tail[0]}")
+    return rows
+
+
+def heavy_loaded(module=DEFAULT_MODULE):
+    code = (f"import sys, json, {module}; "
+            f"print(json.dumps(sorted(m for m in {list(HEAVY_MODULES)!r} if m in sys.modules)))")
+    proc = _run(code)
+    if proc.returncode != 0:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def cold_start_ms(module=DEFAULT_MODULE, runs=COLD_START_RUNS):
+    """Best-of-N cumulative import time of module, in ms."""
+    best = None
+    for _ in range(runs):
+        rows = profile(module)
+        total = next((c for s, c, n in reversed(rows) if n.strip() == module), None)
+        if total is None:
+            total = sum(s for s, c, n in rows)
+        best = total if best is None else min(best, total)
+    return best / 1000.0
+
+
+def print_report(module=DEFAULT_MODULE, top=25):
+    rows = profile(module)
+    total = next((c for s, c, n in reversed(rows) if n.strip() == module), 0)
+    print(f"[ImportProfile] {module}: {total / 1000:.1f} ms cumulative, {len(rows)} modules")
+    print(f"{'self ms':>9} {'cum ms':>9}  module")
+    for s, c, n in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"{s / 1000:>9.1f} {c / 1000:>9.1f}  {n}")
+
+
+def check(module=DEFAULT_MODULE, budget_ms=BUDGET_MS):
+    """True if module imports within budget and loads no heavy deps."""
+    try:
+        ms = cold_start_ms(module)
+        heavy = heavy_loaded(module)
+    except ImportError as e:
+        print(f"[ImportProfile] ❌ cannot import: {e}")
+        return False
+    ok = ms <= budget_ms and not heavy
+    mark = "✅" if ok else "❌"
+    print(f"[ImportProfile] {mark} {module}: {ms:.1f} ms cold start (budget {budget_ms:.0f} ms)")
+    if heavy:
+        print(f"[ImportProfile] ❌ heavy modules loaded at import: {', '.join(heavy)}")
+    return ok
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    top = int(args[args.index("--top") + 1]) if "--top" in args else 25
+    names = [a for i, a in enumerate(args)
+             if not a.startswith("--") and (i == 0 or args[i - 1] != "--top")]
+    module = names[0] if names else DEFAULT_MODULE
+    if "--check" in args:
+        sys.exit(0 if check(module) else 1)
+    try:
+        print_report(module, top)
+    except ImportError as e:
+        print(f"[ImportProfile] ❌ cannot import: {e}")
+        sys.exit(1)
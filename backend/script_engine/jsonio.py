@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Artifact JSON Serialization
+Single place where dashboard / broadcast artifacts are (de)serialized.
+
+ - Compact output by default (no indent, no padding after separators)
+ - Backed by orjson when installed, stdlib json otherwise
+ - Pretty mode for debugging: pretty=True or TOKN_JSON_PRETTY=1
+ - write_json() writes atomically (tmp + os.replace) so readers never
+   see a half-written file
+
+Benchmark:
+    python3 -m script_engine.jsonio --bench [n_scenes]
+"""
+
+import os
+import sys
+import json
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PRETTY = os.getenv("TOKN_JSON_PRETTY", "0").lower() in ("1", "true", "yes")
+
+_COMPACT_SEPARATORS = (",", ":")
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+    _ORJSON_PRETTY = _ORJSON_OPTS | orjson.OPT_INDENT_2
+
+
+# ---------------------------------------------------------
+# Serialize
+# ---------------------------------------------------------
+def _stdlib_dumps(obj, pretty):
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(obj, separators=_COMPACT_SEPARATORS,
+                      ensure_ascii=False, default=str)
+
+
+def dumpb(obj, pretty=None):
+    """Serialize to UTF-8 bytes (compact unless pretty)."""
+    pretty = PRETTY if pretty is None else pretty
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str,
+                                option=_ORJSON_PRETTY if pretty else _ORJSON_OPTS)
+        except TypeError:
+            # e.g. ints beyond 64 bits — stdlib handles them
+            pass
+    return _stdlib_dumps(obj, pretty).encode("utf-8")
+
+
+def dumps(obj, pretty=None):
+    """Serialize to str (compact unless pretty)."""
+    return dumpb(obj, pretty).decode("utf-8")
+
+
+def dump(obj, fp, pretty=None):
+    """Drop-in for json.dump on a text or binary file object."""
+    data = dumpb(obj, pretty)
+    if "b" in getattr(fp, "mode", "w"):
+        fp.write(data)
+    else:
+        fp.write(data.decode("utf-8"))
+
+
+def write_json(path, obj, pretty=None, atomic=True):
+    """Write obj to path; atomic by default. Returns path."""
+    data = dumpb(obj, pretty)
+    if not atomic:
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+# ---------------------------------------------------------
+# Parse
+# ---------------------------------------------------------
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path, default=None):
+    """Read a JSON file; returns default if missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return default
+
+
+# ---------------------------------------------------------
+# Micro-benchmark
+# ---------------------------------------------------------
+def _synthetic_scenes(n):
+    scenes = []
+    for i in range(n):
+        scenes.append({
+            "id": 1700000000000 + i,
+            "time": f"2025-11-{(i % 28) + 1:02d}T12:{i % 60:02d}:00",
+            "source": ("CoinDesk", "Reddit", "DexScreener", "RSS")[i % 4],
+            "character": ("chip", "reef", "bond", "vega")[i % 4],
+            "topic": f"Bitcoin ETF flows turn positive for week {i % 52} — analysts react",
+            "status": "compiled",
+            "hash": f"{i:064x}",
+            "reply_to": None,
+            "script_ref": f"{i * 7919:064x}",
+            "tags": ["markets", "etf", "btc"],
+            "score": round((i % 100) / 7.0, 4),
+        })
+    return {"generated_at": "2025-11-20T12:00:00Z", "scenes": scenes}
+
+
+def _bench(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, len(out)
+
+
+def bench(n=10000, rounds=5):
+    doc = _synthetic_scenes(n)
+    cases = [
+        ("json indent=2 (old)", lambda: json.dumps(doc, indent=2).encode("utf-8")),
+        ("json compact", lambda: _stdlib_dumps(doc, False).encode("utf-8")),
+    ]
+    if orjson is not None:
+        cases.append(("orjson compact", lambda: orjson.dumps(doc, option=_ORJSON_OPTS)))
+        cases.append(("orjson indent=2", lambda: orjson.dumps(doc, option=_ORJSON_PRETTY)))
+
+    print(f"[JSONIO] {n} scenes, best of {rounds} (backend: {'orjson' if orjson else 'stdlib'})")
+    base_t, base_size = None, None
+    for name, fn in cases:
+        t, size = _bench(fn, rounds)
+        if base_t is None:
+            base_t, base_size = t, size
+        print(f"  {name:<22} {t * 1000:8.2f} ms  {size / 1024:9.1f} KiB"
+              f"  ×{base_t / t:5.1f} speed  {size / base_size * 100:5.1f}% size")
+
+    payload = dumpb(doc)
+    t0 = time.perf_counter()
+    json.loads(payload)
+    t_std = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    loads(payload)
+    t_new = time.perf_counter() - t0
+    print(f"  parse: json {t_std * 1000:.2f} ms → jsonio {t_new * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
+    else:
+        print("usage: python3 -m script_engine.jsonio --bench [n_scenes]")
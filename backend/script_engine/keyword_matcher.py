@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Keyword / Domain Matcher
+One shared keyword table, compiled once into a single word-boundary
+regex, used by every routing module (PD anchor pick, primary-anchor
+domain, enrich overrides, ingest domain, topic clusters, themes,
+synthesis keywords).
+
+ - One pass over the text returns the hits for every group
+ - Whole words only: "ai" no longer matches "said", "sec" no longer
+   matches "second", "eth" no longer matches "method"
+ - A plain term also matches its plural ("market" -> "markets");
+   a term ending in "*" is a stem ("regulat*" -> regulator, regulation)
+ - Within a group, labels keep the table's priority order, so
+   first(text, group) reproduces the old if / elif chains
+
+    from script_engine.keyword_matcher import scan, first
+    first("SEC sues exchange", "pd_anchor")        # -> "lawson"
+    scan(headline)["synthesis"]                     # -> ["btc", "etf"]
+
+    python3 -m script_engine.keyword_matcher "headline ..."  |  --bench
+
+Stdlib only, so backend/live can import it as backend.script_engine.
+"""
+
+import re
+import sys
+import time
+from functools import lru_cache
+
+# group -> [(label, terms)] in priority order
+KEYWORDS = {
+    # director/pd_controller.select_anchors
+    "pd_anchor": [
+        ("lawson", ("regulat*", "sec", "lawsuit")),
+        ("reef", ("solana", "defi", "liquidity")),
+        ("bond", ("market", "macro", "inflation")),
+        ("ledger", ("on-chain", "onchain", "blockchain data")),
+        ("neura", ("ai", "compute", "model")),
+        ("cap", ("funding", "venture")),
+        ("penny", ("retail", "meme", "community")),
+    ],
+    # persona/timeline_builder.select_primary_anchor
+    "headline_domain": [
+        ("altcoin", ("eth", "ethereum", "rollup", "l2", "altcoin")),
+        ("bitcoin", ("btc", "bitcoin", "halving", "mining")),
+        ("defi", ("defi", "liquidity", "protocol", "amm", "yield")),
+        ("security", ("hack*", "exploit", "bridge", "drain*")),
+    ],
+    # rest/routes/ingest_v2/enrich.determine_primary_secondary
+    "enrich_route": [
+        ("legal", ("sec", "ruling", "lawsuit", "regulator")),
+        ("funding", ("raises", "series", "funding", "startup")),
+        ("yield", ("staking", "apy", "yield", "liquidity")),
+        ("ai", ("ai", "llm", "model", "neural")),
+        ("meme", ("meme", "trend", "viral")),
+    ],
+    # rest/routes/ingest_v2/ingestion_aggregator.classify_domain
+    "ingest_domain": [
+        ("defi", ("defi", "liquidity", "protocol")),
+        ("regulation", ("sec", "regulat*", "legal")),
+        ("bitcoin", ("bitcoin", "btc")),
+        ("macro", ("macro", "fed", "interest")),
+        ("ai_tech", ("ai", "gpu", "model")),
+    ],
+    # live/topic_clusterer.cluster_articles
+    "cluster_topic": [
+        ("bitcoin", ("bitcoin", "btc")),
+        ("ethereum", ("ethereum", "eth")),
+        ("defi", ("defi",)),
+        ("ai", ("ai", "machine learning")),
+    ],
+    # hybrid_tone/theme_engine.extract_theme
+    "theme": [
+        ("bitcoin momentum and network dynamics", ("bitcoin", "btc")),
+        ("ethereum ecosystem and smart contract flows", ("ethereum", "eth")),
+        ("solana performance and validator activity", ("solana", "sol")),
+        ("institutional positioning and market structure", ("etf",)),
+        ("regulatory pressure and compliance impact", ("regulation", "sec")),
+        ("legal exposure and litigation risk", ("lawsuit",)),
+        ("yield pressure and liquidity incentives", ("yield",)),
+        ("macro inflation effects and rate sensitivity", ("inflation",)),
+        ("macro interest-rate expectations", ("interest",)),
+        ("stablecoin liquidity and peg confidence", ("stablecoin",)),
+        ("defi protocol flows and risk concentration", ("defi",)),
+        ("exchange activity and liquidity conditions", ("exchange",)),
+        ("staking flows and validator economics", ("staking",)),
+        ("market volatility and sentiment rotation", ("volatility",)),
+        ("security exposure and exploit impact", ("hack*", "exploit")),
+    ],
+    # synthesis_engine._extract_keywords (label == keyword)
+    "synthesis": [(k, (k,)) for k in (
+        "bitcoin", "btc", "ethereum", "eth", "solana", "sol",
+        "etf", "inflation", "rates", "regulation", "sec", "lawsuit",
+        "yield", "liquidity", "staking", "volatility", "volume",
+    )],
+}
+
+
+# ---------------------------------------------------------
+# Compile
+# ---------------------------------------------------------
+def _compile(table):
+    exact = {}      # term -> [(group, priority, label)]
+    stems = {}      # stem -> [(group, priority, label)]
+    for group, entries in table.items():
+        for priority, (label, terms) in enumerate(entries):
+            for term in terms:
+                term = term.lower()
+                target = stems if term.endswith("*") else exact
+                target.setdefault(term.rstrip("*"), []).append((group, priority, label))
+
+    alts = [re.escape(t) + r"(?:e?s)?" for t in exact]
+    alts += [re.escape(s) + r"[\w-]*" for s in stems]
+    # longest first so "ethereum" wins over "eth", "blockchain data" over "blockchain"
+    alts.sort(key=len, reverse=True)
+    pattern = re.compile(r"\b(?:" + "|".join(alts) + r")\b")
+    return pattern, exact, stems
+
+
+_PATTERN, _EXACT, _STEMS = _compile(KEYWORDS)
+
+
+@lru_cache(maxsize=4096)
+def _resolve(token):
+    """Every (group, priority, label) a matched token stands for."""
+    out = []
+    for key in (token, token[:-1] if token.endswith("s") else None,
+                token[:-2] if token.endswith("es") else None):
+        if key and key in _EXACT:
+            out.extend(_EXACT[key])
+            break
+    for stem, entries in _STEMS.items():
+        if token.startswith(stem):
+            out.extend(entries)
+    return tuple(out)
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+def find_terms(text):
+    """Matched tokens in text order (lowercased)."""
+    if not text:
+        return []
+    return _PATTERN.findall(text.lower())
+
+
+def scan(text):
+    """
+    One pass over text. Returns {group: [labels]} with each group's
+    labels de-duplicated and in table priority order.
+    """
+    found = {}
+    for token in find_terms(text):
+        for group, priority, label in _resolve(token):
+            found.setdefault(group, {})[priority] = label
+    return {g: [hits[p] for p in sorted(hits)] for g, hits in found.items()}
+
+
+def labels(text, group):
+    return scan(text).get(group, [])
+
+
+def first(text, group, default=None):
+    """Highest-priority label of group present in text (or default)."""
+    hits = labels(text, group)
+    return hits[0] if hits else default
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+def bench(n=20000):
+    headlines = [
+        "SEC said the second Bitcoin ETF ruling slips as markets wobble",
+        "Ethereum rollup liquidity dries up after bridge exploit drains $40M",
+        "AI startup raises Series B to train a new model on GPU clusters",
+        "Fed holds interest rates; macro desks eye inflation print",
+        "Meme coin community goes viral as retail piles in",
+    ] * (n // 5)
+
+    def substring(h):
+        h = h.lower()
+        out = []
+        for entries in KEYWORDS.values():
+            for label, terms in entries:
+                if any(t.rstrip("*") in h for t in terms):
+                    out.append(label)
+        return out
+
+    t0 = time.perf_counter()
+    for h in headlines:
+        substring(h)
+    old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for h in headlines:
+        scan(h)
+    new = time.perf_counter() - t0
+    print(f"[KeywordMatcher] {len(headlines)} headlines, all {len(KEYWORDS)} groups")
+    print(f"  substring scans : {old / len(headlines) * 1e6:.1f} µs/headline")
+    print(f"  compiled scan   : {new / len(headlines) * 1e6:.1f} µs/headline")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--bench" in args:
+        bench()
+    else:
+        text = " ".join(args) or "SEC said the second Bitcoin ETF ruling slips"
+        for group, hits in scan(text).items():
+            print(f"{group:>16}: {', '.join(hits)}")
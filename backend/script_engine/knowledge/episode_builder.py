@@ -17,6 +17,7 @@ import json
 import time
 import os
 from .rank_stories import rank_stories
+from script_engine.jsonio import write_json
 
 ROLLING_PATH = "/var/www/toknnews-live/data/rolling_stories.json"
 EPISODE_DIR = "/var/www/toknnews-live/data/episodes"
@@ -139,8 +140,7 @@ def save_episode(ep):
     os.makedirs(EPISODE_DIR, exist_ok=True)
     path = os.path.join(EPISODE_DIR, ep["episode_id"] + ".json")
 
-    with open(path, "w") as f:
-        json.dump(ep, f, indent=2)
+    write_json(path, ep)
 
     return path
 
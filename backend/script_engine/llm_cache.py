@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — LLM Completion Cache
+Persistent cache in front of chat completions.
+
+ - Key: (model, sha256 of messages, temperature, max_tokens, cache epoch)
+ - Storage: small in-process LRU in front of an on-disk SQLite table
+ - Eviction: TTL on read, LRU by last_used once MAX_ENTRIES is exceeded
+ - Singleflight: concurrent identical requests share one in-flight call
+ - Failures (exceptions / empty text) are never cached
+
+Bump TOKN_LLM_CACHE_EPOCH to invalidate everything after persona or
+prompt changes; TOKN_LLM_CACHE=0 disables the cache.
+
+    python3 -m script_engine.llm_cache --stats | --purge | --clear
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from script_engine.llm_usage import record, usage_context
+
+CACHE_PATH = os.getenv("TOKN_LLM_CACHE_PATH", "/var/www/toknnews-live/data/llm_cache.db")
+CACHE_EPOCH = os.getenv("TOKN_LLM_CACHE_EPOCH", "1")
+ENABLED = os.getenv("TOKN_LLM_CACHE", "1").lower() not in ("0", "false", "no")
+TTL_SECONDS = int(os.getenv("TOKN_LLM_CACHE_TTL", str(6 * 3600)))
+MAX_ENTRIES = int(os.getenv("TOKN_LLM_CACHE_MAX", "20000"))
+MEMORY_ENTRIES = 512
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key       TEXT PRIMARY KEY,
+    model     TEXT,
+    text      TEXT NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_last_used ON completions(last_used);
+"""
+
+_lock = threading.Lock()
+_conn = None
+_memory = OrderedDict()        # key -> (created, text)
+_inflight = {}                 # key -> _Flight
+_writes = 0
+_disabled = False              # set when the cache file cannot be opened
+
+STATS = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.text = None
+        self.error = None
+
+
+# ---------------------------------------------------------
+# Keys + storage
+# ---------------------------------------------------------
+def cache_key(model, messages, temperature, max_tokens):
+    prompt_hash = hashlib.sha256(
+        json.dumps(messages, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    raw = f"{model}|{prompt_hash}|{temperature}|{max_tokens}|{CACHE_EPOCH}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _disable(e):
+    """Cache path missing / unwritable: run uncached for this process."""
+    global _disabled
+    if not _disabled:
+        print(f"[LLMCache] ⚠️ cache unavailable at {CACHE_PATH}, running uncached: {e}")
+    _disabled = True
+
+
+def _db():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, timeout=30, check_same_thread=False,
+                                isolation_level=None)
+        _conn.execute("PRAGMA journal_mode=WAL;")
+        _conn.execute("PRAGMA synchronous=NORMAL;")
+        _conn.executescript(SCHEMA)
+    return _conn
+
+
+def _remember(key, created, text):
+    _memory[key] = (created, text)
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def _lookup(key, now):
+    """Cached text or None. Caller holds _lock."""
+    hit = _memory.get(key)
+    if hit and now - hit[0] < TTL_SECONDS:
+        _memory.move_to_end(key)
+        STATS["memory_hits"] += 1
+        return hit[1]
+
+    row = _db().execute(
+        "SELECT text, created FROM completions WHERE key = ?", (key,)
+    ).fetchone()
+    if row is None:
+        return None
+    text, created = row
+    if now - created >= TTL_SECONDS:
+        _db().execute("DELETE FROM completions WHERE key = ?", (key,))
+        _memory.pop(key, None)
+        return None
+    _db().execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+    _remember(key, created, text)
+    STATS["disk_hits"] += 1
+    return text
+
+
+def _store(key, model, text, now):
+    """Caller holds _lock."""
+    global _writes
+    _db().execute(
+        "INSERT OR REPLACE INTO completions (key, model, text, created, last_used) "
+        "VALUES (?, ?, ?, ?, ?)", (key, model, text, now, now)
+    )
+    _remember(key, now, text)
+    _writes += 1
+    if _writes % 100 == 0:
+        _evict(now)
+
+
+def _evict(now):
+    conn = _db()
+    conn.execute("DELETE FROM completions WHERE created < ?", (now - TTL_SECONDS,))
+    conn.execute(
+        "DELETE FROM completions WHERE key IN ("
+        " SELECT key FROM completions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+        (MAX_ENTRIES,)
+    )
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+def cached_completion(model, messages, temperature, max_tokens, create):
+    """
+    Return completion text for this request, calling create() (which
+    must return the text) only on a miss. Exceptions from create()
+    propagate to every caller sharing the flight.
+    """
+    if not ENABLED or _disabled:
+        return create()
+
+    key = cache_key(model, messages, temperature, max_tokens)
+    now = time.time()
+    t0 = time.perf_counter()
+
+    with _lock:
+        try:
+            text = _lookup(key, now)
+        except sqlite3.Error as e:
+            print("[LLMCache] ⚠️ lookup failed:", e)
+            text = None
+        except OSError as e:
+            _disable(e)
+        bypass = _disabled     # read under the lock: a leader never bails out
+        if not bypass:
+            if text is not None:
+                record("chat", model, (time.perf_counter() - t0) * 1000, cache="hit")
+                return text
+            flight = _inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _inflight[key] = _Flight()
+                STATS["misses"] += 1
+            else:
+                STATS["coalesced"] += 1
+
+    if bypass:
+        return create()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        record("chat", model, (time.perf_counter() - t0) * 1000, cache="coalesced")
+        return flight.text
+
+    try:
+        with usage_context(cache="miss"):
+            flight.text = create()
+    except Exception as e:
+        flight.error = e
+        with _lock:
+            STATS["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+            if flight.error is None and flight.text:
+                try:
+                    _store(key, model, flight.text, time.time())
+                except sqlite3.Error as e:
+                    print("[LLMCache] ⚠️ store failed:", e)
+                except OSError as e:
+                    _disable(e)
+        flight.done.set()
+    return flight.text
+
+
+def stats():
+    """Counters for this process plus on-disk size."""
+    with _lock:
+        s = dict(STATS)
+    hits = s["memory_hits"] + s["disk_hits"]
+    lookups = hits + s["misses"] + s["coalesced"]
+    s["hit_rate"] = round((hits + s["coalesced"]) / lookups, 4) if lookups else 0.0
+    s["inflight"] = len(_inflight)
+    try:
+        with _lock:
+            s["entries"] = _db().execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+    except (sqlite3.Error, OSError):
+        s["entries"] = None
+    s["epoch"] = CACHE_EPOCH
+    return s
+
+
+def purge():
+    """Drop expired rows and trim to MAX_ENTRIES."""
+    with _lock:
+        _evict(time.time())
+
+
+def clear():
+    with _lock:
+        _memory.clear()
+        _db().execute("DELETE FROM completions")
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "--stats"
+    if cmd == "--purge":
+        purge()
+    elif cmd == "--clear":
+        clear()
+    print(json.dumps(stats(), indent=2))
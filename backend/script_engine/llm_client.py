@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Shared OpenAI Client
+One place that owns the OpenAI connection for every LLM / embedding call.
+
+ - Shared sync (OpenAI) and async (AsyncOpenAI) clients, created lazily
+ - Pooled keep-alive connections (httpx limits)
+ - Per-call timeout (default TOKN_LLM_TIMEOUT)
+ - Bounded retries with exponential backoff + jitter on 429 / 5xx /
+   timeouts / connection errors (honours Retry-After)
+ - Global concurrency limiter shared by sync and async callers
+ - Every call is recorded by llm_usage (tokens, latency, tags)
+
+    from script_engine.llm_client import chat, embed
+    resp = chat(model="gpt-4o-mini", messages=[...], max_tokens=80)
+
+OPENAI_API_KEY / OPENAI_BASE_URL are read by the SDK as usual.
+"""
+
+import os
+import time
+import random
+import threading
+
+from script_engine.llm_usage import record
+
+TIMEOUT = float(os.getenv("TOKN_LLM_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("TOKN_LLM_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("TOKN_LLM_BACKOFF", "0.5"))
+BACKOFF_MAX = 20.0
+CONCURRENCY = int(os.getenv("TOKN_LLM_CONCURRENCY", "8"))
+POOL_SIZE = int(os.getenv("TOKN_LLM_POOL", "20"))
+
+_SLOTS = threading.BoundedSemaphore(CONCURRENCY)
+_init_lock = threading.Lock()
+_client = None
+_async_client = None
+
+
+# ---------------------------------------------------------
+# Clients
+# ---------------------------------------------------------
+def _limits():
+    import httpx
+    return httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE)
+
+
+def get_client():
+    """Shared synchronous client (SDK retries off — handled here)."""
+    global _client
+    if _client is None:
+        with _init_lock:
+            if _client is None:
+                import httpx
+                from openai import OpenAI
+                _client = OpenAI(
+                    timeout=TIMEOUT,
+                    max_retries=0,
+                    http_client=httpx.Client(limits=_limits(), timeout=TIMEOUT),
+                )
+    return _client
+
+
+def get_async_client():
+    """Shared asynchronous client."""
+    global _async_client
+    if _async_client is None:
+        with _init_lock:
+            if _async_client is None:
+                import httpx
+                from openai import AsyncOpenAI
+                _async_client = AsyncOpenAI(
+                    timeout=TIMEOUT,
+                    max_retries=0,
+                    http_client=httpx.AsyncClient(limits=_limits(), timeout=TIMEOUT),
+                )
+    return _async_client
+
+
+# ---------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------
+def _retry_delay(err, attempt):
+    """Seconds to wait before retrying err, or None if not retryable."""
+    import openai
+
+    status = getattr(err, "status_code", None)
+    if isinstance(err, (openai.APITimeoutError, openai.APIConnectionError)):
+        pass
+    elif status is None or (status != 429 and status < 500):
+        return None
+
+    headers = getattr(getattr(err, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+
+    delay = BACKOFF_BASE * (2 ** attempt)
+    return min(delay, BACKOFF_MAX) * random.uniform(0.5, 1.0)
+
+
+def _call(fn):
+    attempt = 0
+    while True:
+        with _SLOTS:
+            try:
+                return fn()
+            except Exception as e:
+                delay = _retry_delay(e, attempt) if attempt < MAX_RETRIES else None
+                if delay is None:
+                    raise
+                print(f"[LLMClient] ⚠️ {type(e).__name__} — retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+        time.sleep(delay)      # slot released while backing off
+        attempt += 1
+
+
+async def _acquire_slot():
+    import asyncio   # only async callers pay for it
+    # same semaphore as sync callers, polled so the event loop never blocks
+    while not _SLOTS.acquire(blocking=False):
+        await asyncio.sleep(0.01)
+
+
+async def _acall(make_coro):
+    import asyncio
+    attempt = 0
+    while True:
+        await _acquire_slot()
+        try:
+            return await make_coro()
+        except Exception as e:
+            delay = _retry_delay(e, attempt) if attempt < MAX_RETRIES else None
+            if delay is None:
+                raise
+            print(f"[LLMClient] ⚠️ {type(e).__name__} — retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+        finally:
+            _SLOTS.release()
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+# ---------------------------------------------------------
+# Public calls
+# ---------------------------------------------------------
+def _measured(kind, model, fn):
+    t0 = time.perf_counter()
+    try:
+        resp = fn()
+    except Exception as e:
+        record(kind, model, (time.perf_counter() - t0) * 1000,
+               status="error", error=type(e).__name__)
+        raise
+    record(kind, model, (time.perf_counter() - t0) * 1000, getattr(resp, "usage", None))
+    return resp
+
+
+async def _ameasured(kind, model, make_coro):
+    t0 = time.perf_counter()
+    try:
+        resp = await _acall(make_coro)
+    except Exception as e:
+        record(kind, model, (time.perf_counter() - t0) * 1000,
+               status="error", error=type(e).__name__)
+        raise
+    record(kind, model, (time.perf_counter() - t0) * 1000, getattr(resp, "usage", None))
+    return resp
+
+
+def chat(timeout=None, **kwargs):
+    """client.chat.completions.create with pooling, limiter and retries."""
+    kwargs["timeout"] = timeout or TIMEOUT
+    return _measured("chat", kwargs.get("model"),
+                     lambda: _call(lambda: get_client().chat.completions.create(**kwargs)))
+
+
+def embed(timeout=None, **kwargs):
+    """client.embeddings.create with pooling, limiter and retries."""
+    kwargs["timeout"] = timeout or TIMEOUT
+    return _measured("embedding", kwargs.get("model"),
+                     lambda: _call(lambda: get_client().embeddings.create(**kwargs)))
+
+
+async def achat(timeout=None, **kwargs):
+    kwargs["timeout"] = timeout or TIMEOUT
+    return await _ameasured("chat", kwargs.get("model"),
+                            lambda: get_async_client().chat.completions.create(**kwargs))
+
+
+async def aembed(timeout=None, **kwargs):
+    kwargs["timeout"] = timeout or TIMEOUT
+    return await _ameasured("embedding", kwargs.get("model"),
+                            lambda: get_async_client().embeddings.create(**kwargs))
+
+
+def message_text(resp):
+    """First choice's text (handles str or segmented content)."""
+    content = resp.choices[0].message.content
+    if isinstance(content, str):
+        return content.strip()
+
+    # New SDK: content is a list of segments
+    return "".join(
+        seg["text"] if isinstance(seg, dict) and "text" in seg else seg
+        for seg in content
+    ).strip()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — LLM Usage Accounting
+Append-only JSONL log of every chat / embedding call.
+
+Each record: ts, kind, model, persona, line_type, segment_type, episode,
+prompt/completion tokens, latency_ms, cache (hit|miss|coalesced|none),
+status, cost_usd.
+
+Tags come from usage_context() (a contextvar, so they follow the call
+into worker threads that copy the context):
+
+    with usage_context(episode=ep_id, segment_type="deep_dive"):
+        ...
+    with usage_context(persona="chip", line_type="chip_toss"):
+        _gpt(prompt)
+
+Summary:
+    python3 -m script_engine.llm_usage [--by segment_type|episode|persona|line_type|model]
+                                       [--since HOURS] [--log PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from collections import defaultdict
+
+USAGE_LOG = os.getenv("TOKN_LLM_USAGE_LOG", "/var/www/toknnews-live/data/logs/llm_usage.jsonl")
+ENABLED = os.getenv("TOKN_LLM_USAGE", "1").lower() not in ("0", "false", "no")
+
+# USD per 1M tokens (input, output)
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4o": (2.50, 10.00),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+TAG_FIELDS = ("persona", "line_type", "segment_type", "episode", "cache")
+
+_tags = contextvars.ContextVar("tokn_llm_usage_tags", default={})
+_write_lock = threading.Lock()
+
+
+# ---------------------------------------------------------
+# Tagging
+# ---------------------------------------------------------
+@contextmanager
+def usage_context(**tags):
+    """Tag every call made inside this block (inner tags win)."""
+    token = _tags.set({**_tags.get(), **{k: v for k, v in tags.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+@contextmanager
+def usage_defaults(**tags):
+    """Like usage_context, but never overrides tags set further out."""
+    current = _tags.get()
+    with usage_context(**{k: v for k, v in tags.items() if k not in current}):
+        yield
+
+
+def current_tags():
+    return dict(_tags.get())
+
+
+# ---------------------------------------------------------
+# Recording
+# ---------------------------------------------------------
+def cost_usd(model, prompt_tokens, completion_tokens):
+    price = PRICES.get(model)
+    if price is None:
+        # dated snapshots, e.g. gpt-4o-mini-2024-07-18
+        price = next((p for m, p in PRICES.items() if str(model).startswith(m)), None)
+    if price is None:
+        return None
+    return round((prompt_tokens * price[0] + completion_tokens * price[1]) / 1e6, 8)
+
+
+def record(kind, model, latency_ms, usage=None, status="ok", error=None, **tags):
+    """Append one call record. usage: SDK usage object or dict."""
+    if not ENABLED:
+        return
+    if usage is not None and not isinstance(usage, dict):
+        usage = {k: getattr(usage, k, 0) for k in ("prompt_tokens", "completion_tokens")}
+    usage = usage or {}
+    prompt_tokens = int(usage.get("prompt_tokens") or 0)
+    completion_tokens = int(usage.get("completion_tokens") or 0)
+
+    rec = {"ts": round(time.time(), 3), "kind": kind, "model": model}
+    rec.update({f: None for f in TAG_FIELDS})
+    rec["cache"] = "none"
+    rec.update(_tags.get())
+    rec.update({k: v for k, v in tags.items() if v is not None})
+    rec.update({
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "latency_ms": round(latency_ms, 1),
+        "status": status,
+        "cost_usd": cost_usd(model, prompt_tokens, completion_tokens) if status == "ok" else 0.0,
+    })
+    if error:
+        rec["error"] = error
+
+    line = json.dumps(rec, separators=(",", ":")) + "\n"
+    try:
+        with _write_lock:
+            os.makedirs(os.path.dirname(USAGE_LOG), exist_ok=True)
+            with open(USAGE_LOG, "a") as f:
+                f.write(line)
+    except OSError as e:
+        print("[LLMUsage] ⚠️ could not write usage log:", e)
+
+
+# ---------------------------------------------------------
+# Summary
+# ---------------------------------------------------------
+def _pct(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[idx]
+
+
+def load_records(path=USAGE_LOG, since_hours=None):
+    cutoff = time.time() - since_hours * 3600 if since_hours else 0
+    out = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec.get("ts", 0) >= cutoff:
+                    out.append(rec)
+    except FileNotFoundError:
+        pass
+    return out
+
+
+def summarize(records, by="segment_type"):
+    groups = defaultdict(list)
+    for rec in records:
+        groups[rec.get(by) or "—"].append(rec)
+
+    rows = []
+    for key, recs in groups.items():
+        network = [r for r in recs if r.get("cache") in ("miss", "none")]
+        lat = [r["latency_ms"] for r in network if r.get("status") == "ok"]
+        hits = sum(1 for r in recs if r.get("cache") in ("hit", "coalesced"))
+        rows.append({
+            by: key,
+            "calls": len(recs),
+            "api_calls": len(network),
+            "cache_hit_rate": round(hits / len(recs), 3) if recs else 0.0,
+            "errors": sum(1 for r in recs if r.get("status") != "ok"),
+            "p50_ms": _pct(lat, 0.50),
+            "p95_ms": _pct(lat, 0.95),
+            "prompt_tokens": sum(r.get("prompt_tokens", 0) for r in recs),
+            "completion_tokens": sum(r.get("completion_tokens", 0) for r in recs),
+            "cost_usd": round(sum(r.get("cost_usd") or 0 for r in recs), 6),
+        })
+    rows.sort(key=lambda r: r["cost_usd"], reverse=True)
+    return rows
+
+
+def print_summary(rows, by):
+    print(f"{by:<24} {'calls':>6} {'api':>5} {'hit%':>6} {'err':>4} "
+          f"{'p50ms':>8} {'p95ms':>8} {'in_tok':>9} {'out_tok':>8} {'cost$':>10}")
+    for r in rows:
+        print(f"{str(r[by])[:24]:<24} {r['calls']:>6} {r['api_calls']:>5} "
+              f"{r['cache_hit_rate'] * 100:>5.1f}% {r['errors']:>4} "
+              f"{r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} {r['prompt_tokens']:>9} "
+              f"{r['completion_tokens']:>8} {r['cost_usd']:>10.4f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def opt(name, default=None):
+        if name in args:
+            i = args.index(name)
+            return args[i + 1] if i + 1 < len(args) else default
+        return default
+
+    since = opt("--since")
+    records = load_records(opt("--log", USAGE_LOG), float(since) if since else None)
+    print(f"[LLMUsage] {len(records)} calls")
+    groupings = [opt("--by")] if opt("--by") else ["segment_type", "episode"]
+    for by in groupings:
+        print()
+        print_summary(summarize(records, by), by)
@@ -4,17 +4,12 @@
 # ------------------------------------------------------------
 
 import os
-from openai import OpenAI
 from script_engine.context_router import get_context_for_anchor
 
 
 if not os.getenv("OPENAI_API_KEY"):
     print("[OpenAIWriter] WARNING: OPENAI_API_KEY not set")
 
-# Load OpenAI key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 # ------------------------------------------------------------
 # PERSONA STYLE — Full TOKNNews Canon Profiles
 # ------------------------------------------------------------
@@ -349,33 +344,55 @@ Character Persona:
 # OPENAI WRITING ENGINE — HYBRID MODE w/ RKG + TONE GUARDRAILS
 # ============================================================
 
-import os, time, json
-from openai import OpenAI
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+import os, re, time, json
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from script_engine.llm_cache import cached_completion
+from script_engine.llm_client import chat, message_text
+from script_engine.llm_usage import usage_context
 
 
 # ------------------------------------------------------------
 # Core GPT Helper
 # ------------------------------------------------------------
-def _gpt(prompt: str) -> str:
-    try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=180,
-            temperature=0.78,
+def _complete(prompt: str, model: str, max_tokens: int, temperature: float,
+              persona: str = None, line_type: str = None, response_format: dict = None,
+              cache: bool = True) -> str:
+    """
+    One chat completion through the persistent completion cache.
+    Identical prompts (same model / temperature / max_tokens) are served
+    from cache, and concurrent identical prompts share one request.
+    cache=False samples fresh every call — for lines whose prompt repeats
+    but whose text must not (tosses, the show ident).
+    persona / line_type tag the call in the usage log. With a
+    response_format, replies that are not valid JSON raise (never cached).
+    """
+    messages = [{"role": "user", "content": prompt}]
+    extra = {"response_format": response_format} if response_format else {}
+
+    def create():
+        resp = chat(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **extra
         )
-        content = resp.choices[0].message.content
-        if isinstance(content, str):
-            return content.strip()
+        text = message_text(resp)
+        if response_format:
+            json.loads(text)
+        return text
+
+    with usage_context(persona=persona, line_type=line_type):
+        if not cache:
+            return create()
+        return cached_completion(model, messages, temperature, max_tokens, create)
 
-        # New SDK: content is a list of segments
-        return "".join(
-            seg["text"] if isinstance(seg, dict) and "text" in seg else seg
-            for seg in content
-        ).strip()
+
+def _gpt(prompt: str, persona: str = None, line_type: str = None, cache: bool = True) -> str:
+    try:
+        return _complete(prompt, "gpt-4o-mini", max_tokens=180, temperature=0.78,
+                         persona=persona, line_type=line_type, cache=cache)
 
     except Exception as e:
         print("[OpenAIWriter] ERROR:", e)
@@ -386,14 +403,33 @@ def _gpt(prompt: str) -> str:
 # HYBRID PERSONA PROMPT (news-safe + late-night-aware)
 # ============================================================
 
-def persona_prompt(anchor: str, brain: dict, mode="news", allow_multi=False) -> str:
-    """
-    Hybrid persona prompt:
-    - 1 sentence default
-    - Up to 3 sentences for allowed analytical modes
-    - Late-night mode exaggerates personality (bitsy/vega)
-    """
-
+# Compiled prompts are cached by (anchor, mode, allow_multi, tragic).
+# The static part (identity, fixed rules, RKG context) comes first so
+# provider-side prompt caching can reuse the prefix; the mode / guardrail
+# / sentence rules follow. The tragic flag is scanned once per brain
+# snapshot (snapshots are treated as immutable) and only matters for Bitsy.
+TRAGIC_TERMS = re.compile(r"death|dead|killed|shooting|explosion|terror|tragedy")
+
+_tragic_seen = OrderedDict()      # id(brain) -> (brain, flag)
+PERSONA_PROMPT_STATS = Counter()  # compiled / reused / tragic_scans
+PREFIX_REUSE = Counter()          # (anchor, mode, allow_multi, tragic) -> uses
+
+
+def _day_is_tragic(brain) -> bool:
+    hit = _tragic_seen.get(id(brain))
+    if hit is not None and hit[0] is brain:
+        return hit[1]
+    PERSONA_PROMPT_STATS["tragic_scans"] += 1
+    flag = bool(TRAGIC_TERMS.search(str(brain).lower()))
+    _tragic_seen[id(brain)] = (brain, flag)
+    while len(_tragic_seen) > 8:
+        _tragic_seen.popitem(last=False)
+    return flag
+
+
+@lru_cache(maxsize=256)
+def _compiled_persona(anchor: str, mode: str, allow_multi: bool, tragic: bool) -> str:
+    PERSONA_PROMPT_STATS["compiled"] += 1
     rkg = get_context_for_anchor(anchor)
 
     # Late-night persona amplification
@@ -403,10 +439,7 @@ def persona_prompt(anchor: str, brain: dict, mode="news", allow_multi=False) ->
         persona_mod = "Stay newsroom professional."
 
     # Bitsy tragic-event guardrail
-    tragic_terms = ["death", "dead", "killed", "shooting", "explosion", "terror", "tragedy"]
-    day_is_tragic = any(t in str(brain).lower() for t in tragic_terms)
-
-    if anchor == "bitsy" and day_is_tragic:
+    if anchor == "bitsy" and tragic:
         bitsy_mode = (
             "Avoid jokes. Speak with empathy and cultural sensitivity. "
             "Reflect the community mood gently. No comedy in tragic contexts."
@@ -423,20 +456,44 @@ def persona_prompt(anchor: str, brain: dict, mode="news", allow_multi=False) ->
     return f"""
 You are **{anchor}**, a TOKNNews anchor.
 
+Context Memory (RKG):
+{json.dumps(rkg, indent=2)}
+
 Persona rules:
+- Avoid repeating the other speaker’s nouns.
+- Use one meaningful conversational cue when responding in a duo exchange.
 - {persona_mod}
 - {bitsy_mode}
 - {sentence_rule}
-- Avoid repeating the other speaker’s nouns.
-- Use one meaningful conversational cue when responding in a duo exchange.
-
-Context Memory (RKG):
-{json.dumps(rkg, indent=2)}
 
 Respond with the raw line only. No narration. No labels.
 """
 
 
+def persona_prompt(anchor: str, brain: dict, mode="news", allow_multi=False) -> str:
+    """
+    Hybrid persona prompt:
+    - 1 sentence default
+    - Up to 3 sentences for allowed analytical modes
+    - Late-night mode exaggerates personality (bitsy/vega)
+    """
+    mode = "latenight" if mode == "latenight" else "news"
+    tragic = anchor == "bitsy" and _day_is_tragic(brain)
+    key = (anchor, mode, bool(allow_multi), tragic)
+    if PREFIX_REUSE[key]:
+        PERSONA_PROMPT_STATS["reused"] += 1
+    PREFIX_REUSE[key] += 1
+    return _compiled_persona(*key)
+
+
+def persona_prompt_stats() -> dict:
+    """Prefix-reuse counts for compiled persona prompts."""
+    return {
+        **PERSONA_PROMPT_STATS,
+        "prefixes": {"/".join(map(str, k)): n for k, n in PREFIX_REUSE.most_common()},
+    }
+
+
 # ============================================================
 # SOLO GPT ROUTINES (News-safe Hybrid)
 # ============================================================
@@ -449,7 +506,7 @@ def gpt_reaction(anchor: str, headline: str, brain: dict):
 Write a **single-sentence** reaction to this headline:
 "{headline}"
 """
-    return _gpt(prompt)
+    return _gpt(prompt, anchor, "reaction")
 
 
 def gpt_analysis(anchor: str, headline: str, synthesis: str, brain: dict):
@@ -461,7 +518,7 @@ Write up to **3 sentences** analyzing the headline:
 Headline: "{headline}"
 Synthesis: "{synthesis}"
 """
-    return _gpt(prompt)
+    return _gpt(prompt, anchor, "analysis")
 
 
 def gpt_transition(anchor: str, headline: str, brain: dict):
@@ -472,7 +529,7 @@ def gpt_transition(anchor: str, headline: str, brain: dict):
 Write **one sentence** transitioning to the next topic.
 Avoid repeating nouns in the prior sentence.
 """
-    return _gpt(prompt)
+    return _gpt(prompt, anchor, "transition")
 
 
 def gpt_anchor_react(anchor: str, headline: str, brain: dict):
@@ -482,7 +539,117 @@ def gpt_anchor_react(anchor: str, headline: str, brain: dict):
 
 Write a brief follow-up **single sentence** reacting to the headline’s tension.
 """
-    return _gpt(prompt)
+    return _gpt(prompt, anchor, "quick_react")
+
+
+# ============================================================
+# WHOLE-SEGMENT GPT ROUTINE (one structured call per anchor segment)
+# ============================================================
+
+# line type -> (max sentences, max words, instruction)
+SEGMENT_LINES = {
+    "reaction": (1, 40, "a single-sentence reaction to the headline"),
+    "analysis": (3, 90, "up to 3 sentences analyzing the headline using the synthesis"),
+    "transition": (1, 35, "one sentence transitioning to the next topic"),
+    "quick_react": (1, 35, "a brief single-sentence follow-up reacting to the headline’s tension"),
+}
+SEGMENT_TONES = ["neutral", "serious", "upbeat", "cautious", "skeptical", "urgent", "playful"]
+SEGMENT_STATS = Counter()   # calls / failed / lines_ok / lines_rejected
+
+_SENTENCE_END = re.compile(r"[.!?](?:\s|$)")
+
+
+def _segment_schema(anchor: str, line_types) -> dict:
+    line = {
+        "type": "object",
+        "properties": {
+            "type": {"type": "string", "enum": list(line_types)},
+            "speaker": {"type": "string", "enum": [anchor]},
+            "tone": {"type": "string", "enum": SEGMENT_TONES},
+            "text": {"type": "string"},
+        },
+        "required": ["type", "speaker", "tone", "text"],
+        "additionalProperties": False,
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "anchor_segment",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"lines": {"type": "array", "items": line}},
+                "required": ["lines"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _valid_segment_line(line, anchor, wanted, seen):
+    """Reason string if the line is unusable, else None."""
+    if not isinstance(line, dict):
+        return "not an object"
+    kind, text = line.get("type"), line.get("text")
+    if kind not in wanted or kind in seen:
+        return f"unexpected or repeated type {kind!r}"
+    if str(line.get("speaker", "")).lower() != anchor.lower():
+        return f"wrong speaker {line.get('speaker')!r}"
+    if not isinstance(text, str) or not text.strip():
+        return "empty text"
+    max_sentences, max_words, _ = SEGMENT_LINES[kind]
+    if len(text.split()) > max_words or len(_SENTENCE_END.findall(text.strip())) > max_sentences:
+        return "too long"
+    if "{" in text or text.lower().startswith(f"{anchor.lower()}:"):
+        return "labels or markup in text"
+    return None
+
+
+def gpt_anchor_segment(anchor: str, headline: str, synthesis: str, brain: dict,
+                       article_context: str = "", line_types=tuple(SEGMENT_LINES)):
+    """
+    The primary anchor's whole segment in one JSON-schema call.
+    Returns {line_type: {"text", "tone"}} holding only the lines that
+    passed validation; callers fall back per missing line.
+    """
+    wanted = [t for t in line_types if t in SEGMENT_LINES]
+    p = persona_prompt(anchor, brain, mode="news", allow_multi=True)
+    asks = "\n".join(f"{i}. {t}: {SEGMENT_LINES[t][2]}" for i, t in enumerate(wanted, 1))
+    prompt = f"""
+{p}
+
+Write your whole segment for this story as JSON (this replaces the
+raw-line rule above). One entry per line type, in this order:
+{asks}
+
+Headline: "{headline}"
+Synthesis: "{synthesis}"
+Context: "{article_context or ''}"
+
+Each entry: type, speaker ("{anchor}"), tone, text (spoken words only).
+Avoid repeating nouns between lines.
+"""
+    SEGMENT_STATS["calls"] += 1
+    try:
+        raw = _complete(prompt, "gpt-4o-mini", max_tokens=450, temperature=0.78,
+                        persona=anchor, line_type="anchor_segment",
+                        response_format=_segment_schema(anchor, wanted))
+        lines = json.loads(raw).get("lines", [])
+    except Exception as e:
+        SEGMENT_STATS["failed"] += 1
+        print("[OpenAIWriter] ERROR (anchor_segment):", e)
+        return {}
+
+    out = {}
+    for line in lines if isinstance(lines, list) else []:
+        reason = _valid_segment_line(line, anchor, wanted, out)
+        if reason:
+            SEGMENT_STATS["lines_rejected"] += 1
+            print(f"[OpenAIWriter] ⚠️ segment line rejected ({reason})")
+            continue
+        out[line["type"]] = {"text": line["text"].strip(), "tone": line.get("tone")}
+    SEGMENT_STATS["lines_ok"] += len(out)
+    return out
 
 
 # ============================================================
@@ -545,10 +712,105 @@ Rules:
 - No greetings or filler.
 
 Write the line exactly as {speaker}.
-""")
+""", speaker, "duo_react")
 
     return _gpt(prompt)
 
+
+# ============================================================
+# DUO BEAT ROUTINE — both turns of a crosstalk beat in one call
+# ============================================================
+DUO_BEAT_RULES = {
+    "react": "{first} reacts to the headline in 1 sentence; {second} answers with a different angle in 1 sentence.",
+    "analysis": "{first} analyzes the story in up to 2 sentences; {second} counters or extends it in up to 2 sentences.",
+    "transition": "{first} starts steering toward the wrap in 1 sentence; {second} hands it back in 1 sentence.",
+    "close": "{first} closes the exchange in 1 sentence.",
+}
+
+
+def gpt_duo_beat(
+    beat: str,
+    speakers: list,
+    headline: str,
+    synthesis: str,
+    domains: dict,
+    last_line: str,
+    brain: dict,
+    mode: str = "news",
+    avoid_terms=()
+):
+    """
+    One crosstalk beat (one or two turns) as a single JSON-schema call.
+    Returns [(speaker, text)] in speaking order, or [] on failure.
+    avoid_terms are nouns already used in the exchange.
+    """
+    if brain is None:
+        brain = {}
+    mode = "latenight" if mode == "latenight" else "news"
+    first, second = speakers[0], speakers[-1]
+    personas = "\n\n".join(
+        f"### {s}\n{persona_prompt(s, brain, mode=mode, allow_multi=(beat == 'analysis')).strip()}"
+        for s in speakers
+    )
+    avoid = ", ".join(sorted(avoid_terms)) or "(none yet)"
+    schema = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "duo_beat",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"lines": {"type": "array", "items": {
+                    "type": "object",
+                    "properties": {
+                        "speaker": {"type": "string", "enum": list(speakers)},
+                        "text": {"type": "string"},
+                    },
+                    "required": ["speaker", "text"],
+                    "additionalProperties": False,
+                }}},
+                "required": ["lines"],
+                "additionalProperties": False,
+            },
+        },
+    }
+    prompt = f"""
+{personas}
+
+# Duo crosstalk — beat: {beat} ({mode})
+Return JSON (this replaces the raw-line rule above): the lines for
+this beat, in speaking order, one entry per turn.
+
+{DUO_BEAT_RULES[beat].format(first=first, second=second)}
+
+Headline: "{headline}"
+Synthesis: "{synthesis}"
+Domains: {json.dumps(domains)}
+Last line spoken: "{last_line or ''}"
+
+Rules:
+- Each turn responds directly to the line before it.
+- Do NOT use these words, already said on air: {avoid}.
+- The two speakers never share a key noun.
+- Stay in character. No greetings, filler or speaker labels.
+"""
+    try:
+        raw = _complete(prompt, "gpt-4o-mini", max_tokens=260, temperature=0.8,
+                        persona=first, line_type=f"duo_{beat}", response_format=schema)
+        lines = json.loads(raw).get("lines", [])
+    except Exception as e:
+        print(f"[OpenAIWriter] ERROR (duo_beat {beat}):", e)
+        return []
+
+    out, expected = [], list(speakers)
+    for line in lines if isinstance(lines, list) else []:
+        if not expected or not isinstance(line, dict):
+            break
+        text = line.get("text")
+        if line.get("speaker") == expected[0] and isinstance(text, str) and text.strip():
+            out.append((expected.pop(0), text.strip()))
+    return out
+
 # ============================================================
 # CHIP FOLLOW-UP REACTION (Patch 8)
 # ============================================================
@@ -610,22 +872,8 @@ Examples:
 Return ONLY the sentence.
 """
 
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=80,
-            temperature=0.8
-        )
-
-        content = resp.choices[0].message.content
-        if isinstance(content, str):
-            return content.strip()
-
-        # New SDK: content is a list of segments
-        return "".join(
-            seg["text"] if isinstance(seg, dict) and "text" in seg else seg
-            for seg in content
-        ).strip()
+        return _complete(prompt, "gpt-4o-mini", max_tokens=80, temperature=0.8,
+                         persona="chip", line_type="chip_followup")
 
     except Exception as e:
         print("[OpenAIWriter] ERROR (chip_followup):", e)
@@ -676,21 +924,9 @@ Examples:
 Return ONLY the sentence.
 """
 
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=60,
-            temperature=0.8
-        )
-        content = resp.choices[0].message.content
-        if isinstance(content, str):
-            return content.strip()
-
-        # New SDK: content is a list of segments
-        return "".join(
-            seg["text"] if isinstance(seg, dict) and "text" in seg else seg
-            for seg in content
-        ).strip()
+        # opening and closing tosses share this prompt: sample each one
+        return _complete(prompt, "gpt-4o-mini", max_tokens=60, temperature=0.8,
+                         persona="chip", line_type="chip_toss", cache=False)
 
 
     except Exception as e:
@@ -730,22 +966,8 @@ RULES:
   "Next up — a shift worth tracking."
         """
 
-        resp = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=40,
-            temperature=0.7
-        )
-
-        content = resp.choices[0].message.content
-        if isinstance(content, str):
-            return content.strip()
-
-        # New SDK: content is a list of segments
-        return "".join(
-            seg["text"] if isinstance(seg, dict) and "text" in seg else seg
-            for seg in content
-        ).strip()
+        return _complete(prompt, "gpt-4.1-mini", max_tokens=40, temperature=0.7,
+                         persona="chip", line_type="story_transition")
 
     except Exception as e:
         print(f"[OpenAIWriter] ERROR (transition):", e)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Duo Crosstalk Engine
+Back-and-forth between two anchors, written beat by beat.
+
+The exchange is four beats — react, analysis, transition (two turns
+each) and close (one turn) — and each beat is one GPT call
+(openai_writer.gpt_duo_beat), so a duo costs 4 round trips instead of 7.
+A turn missing from a beat reply is filled with a single gpt_duo_line
+call for that turn only.
+
+Noun diversity is enforced, not filtered after the fact:
+ - every beat prompt lists the tracked nouns already said on air
+ - a turn that still repeats one has the noun swapped for a synonym
+   (noun uses only, with a/an fixed up), so no line (and no round trip)
+   is thrown away
+
+Each beat is timed; beat_stats() gives p50 / p95 per beat.
+"""
+
+import re
+import time
+from collections import deque
+
+from script_engine.openai_writer import gpt_duo_beat, gpt_duo_line
+from script_engine.character_brain.persona_loader import get_domain
+
+# (beat, both anchors speak)
+DUO_BEATS = [
+    ("react", True),
+    ("analysis", True),
+    ("transition", True),
+    ("close", False),
+]
+
+# tracked noun -> (singular, plural) replacement once it has been used
+TRACKED_TERMS = {
+    "liquidity": ("market depth", "market depth"),
+    "flow": ("money movement", "money movements"),
+    "imbalance": ("skew", "skews"),
+    "whale": ("large holder", "large holders"),
+    "protocol": ("platform", "platforms"),
+    "cluster": ("group", "groups"),
+    "yield": ("return", "returns"),
+    "volatility": ("price swings", "price swings"),
+    "pressure": ("strain", "strain"),
+    "anomaly": ("outlier", "outliers"),
+}
+_PLURALS = {"flows": "flow", "imbalances": "imbalance", "whales": "whale",
+            "protocols": "protocol", "clusters": "cluster", "yields": "yield",
+            "pressures": "pressure", "anomalies": "anomaly"}
+_FORMS = {**{t: t for t in TRACKED_TERMS}, **_PLURALS}
+# optional a/an in front, so the article can follow the synonym
+_TERM_RE = re.compile(r"\b(?:(an?)\s+)?(" + "|".join(sorted(_FORMS, key=len, reverse=True)) + r")\b",
+                      re.IGNORECASE)
+
+# terms that are also verbs / compound heads ("yields 5%", "cash flow"):
+# only swapped right after a determiner or preposition, i.e. as a noun
+_VERB_FORMS = {"flow", "flows", "yield", "yields", "pressure", "pressures", "cluster", "clusters"}
+_NOUN_CUES = {
+    "the", "this", "that", "these", "those", "its", "their", "our", "his", "her",
+    "some", "more", "less", "much", "any", "no", "of", "in", "on", "for", "from",
+    "with", "into", "and", "or",
+}
+_PREV_WORD_RE = re.compile(r"([\w'-]+)\W*$")
+
+BEAT_TIMINGS = deque(maxlen=1000)   # (beat, ms, calls)
+
+
+# ---------------------------------------------------------
+# Noun diversity
+# ---------------------------------------------------------
+def _is_noun_use(m):
+    if m.group(1):
+        return True
+    prev = _PREV_WORD_RE.search(m.string, 0, m.start(2))
+    return bool(prev) and prev.group(1).lower() in _NOUN_CUES
+
+
+def enforce_diversity(text, used):
+    """Swap tracked nouns already in `used` for synonyms; record new ones."""
+    seen_here = set()
+
+    def swap(m):
+        article, found = m.group(1), m.group(2)
+        word = found.lower()
+        term = _FORMS[word]
+        if term not in used or (word in _VERB_FORMS and not _is_noun_use(m)):
+            seen_here.add(term)
+            return m.group(0)
+
+        singular, plural = TRACKED_TERMS[term]
+        out = plural if word in _PLURALS else singular
+        if found[0].isupper() and not article:
+            out = out[0].upper() + out[1:]
+        if article:
+            fixed = "an" if out[0] in "aeiou" else "a"
+            out = (fixed.capitalize() if article[0].isupper() else fixed) + " " + out
+        return out
+
+    text = _TERM_RE.sub(swap, text)
+    used.update(seen_here)
+    return text
+
+
+# ---------------------------------------------------------
+# Crosstalk
+# ---------------------------------------------------------
+def iter_duo_crosstalk(
+    primary: str,
+    duo: str,
+    headline: str,
+    synthesis: str,
+    tone_shift: str,
+    last_solo_speaker: str,
+    show_mode: str = "news",
+    brain: dict = None,
+    last_line: str = None
+):
+    """Yield duo timeline entries beat by beat, as each beat lands."""
+    if brain is None:
+        brain = {}
+
+    # If the last solo speaker was the primary, the duo anchor opens
+    if last_solo_speaker == primary:
+        primary, duo = duo, primary
+    domains = {primary: get_domain(primary), duo: get_domain(duo)}
+    role = {primary: "primary", duo: "secondary"}
+
+    used = set()
+    for beat, both in DUO_BEATS:
+        speakers = [primary, duo] if both else [primary]
+        t0 = time.perf_counter()
+        turns = dict(gpt_duo_beat(
+            beat, speakers, headline, synthesis, domains, last_line,
+            brain, mode=show_mode, avoid_terms=used
+        ))
+        calls = 1
+
+        entries = []
+        for speaker in speakers:
+            text = turns.get(speaker)
+            if not text:
+                # fill just this turn
+                counter = duo if speaker == primary else primary
+                text = gpt_duo_line(
+                    speaker=speaker,
+                    counter=counter,
+                    headline=headline,
+                    domain=domains[speaker],
+                    mode=show_mode,
+                    last_counter_line=last_line,
+                    brain=brain,
+                    allow_multi=(beat == "analysis")
+                )
+                calls += 1
+            if not text:
+                continue
+            text = enforce_diversity(text, used)
+            last_line = text
+            entries.append({
+                "type": f"duo_{role[speaker]}_{beat}",
+                "speaker": speaker,
+                "text": text,
+                "tone_shift": tone_shift
+            })
+
+        ms = (time.perf_counter() - t0) * 1000
+        BEAT_TIMINGS.append((beat, ms, calls))
+        print(f"[DuoEngine] beat {beat}: {ms:.0f} ms, {calls} call(s)")
+        yield from entries
+
+
+def build_duo_crosstalk(*args, **kwargs):
+    """Whole exchange as a list of timeline entries."""
+    return list(iter_duo_crosstalk(*args, **kwargs))
+
+
+def beat_stats():
+    """p50 / p95 ms and calls per beat over recent exchanges."""
+    out = {}
+    for beat, _ in DUO_BEATS:
+        rows = [(ms, calls) for b, ms, calls in BEAT_TIMINGS if b == beat]
+        if not rows:
+            continue
+        ms = sorted(r[0] for r in rows)
+        out[beat] = {
+            "beats": len(rows),
+            "p50_ms": round(ms[len(ms) // 2], 1),
+            "p95_ms": round(ms[min(len(ms) - 1, int(0.95 * (len(ms) - 1) + 0.5))], 1),
+            "calls": sum(r[1] for r in rows),
+        }
+    return out
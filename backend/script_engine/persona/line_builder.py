@@ -40,6 +40,25 @@ def _clean(text):
     return " ".join(text.split()).strip()
 
 
+def apply_tone_shift(text: str, tone_shift: str = None) -> str:
+    """
+    PD tone shift modifier.
+    tone_shift can be: 'calm', 'urgent', 'hype', 'serious', 'breaking'
+    """
+    if not text or not tone_shift:
+        return text
+
+    mods = {
+        "calm":       f"In a calmer tone, {text}",
+        "urgent":     f"Urgent update — {text}",
+        "hype":       f"Big energy — {text}",
+        "serious":    f"On a serious note — {text}",
+        "breaking":   f"Breaking now — {text}"
+    }
+
+    return mods.get(tone_shift, text)
+
+
 # ---------------------------------------------------------
 # Persona-driven analysis line
 # ---------------------------------------------------------
@@ -47,7 +66,8 @@ def _clean(text):
 def build_analysis_line(character: str,
                         headline: str,
                         synthesis: str = "",
-                        article_context: str = "") -> str:
+                        article_context: str = "",
+                        tone_shift: str = None) -> str:
     """
     Deterministic persona-driven analysis line.
     Simplified for Script Engine v3.
@@ -92,20 +112,21 @@ def build_analysis_line(character: str,
     if cadence.get("sentence_style") == "Short → medium, crisp transitions.":
         base_line = _clean(base_line)
 
-    return _clean(base_line)
+    return apply_tone_shift(_clean(base_line), tone_shift)
 
 # ---------------------------------------------------------
 # Persona-driven transition line
 # ---------------------------------------------------------
 
 def build_transition_line(character: str,
-                          target_group: str = "anchor") -> str:
+                          target_group: str = "anchor",
+                          tone_shift: str = None) -> str:
     """
     Returns a transition phrase for Chip or an anchor.
     target_group: 'anchor' | 'vega' | 'reentry'
     """
     phr = get_transition_phrasing(character, target_group)
-    return _choose(phr)
+    return apply_tone_shift(_choose(phr), tone_shift)
 
 
 # ---------------------------------------------------------
@@ -164,7 +185,7 @@ def build_bitsy_interrupt() -> str:
 # Persona-driven quick reaction line (optional)
 # ---------------------------------------------------------
 
-def build_reaction_line(character: str, headline: str) -> str:
+def build_reaction_line(character: str, headline: str, tone_shift: str = None) -> str:
     """
     A short, persona-accurate reaction, useful for tosses or intros.
     """
@@ -183,4 +204,21 @@ def build_reaction_line(character: str, headline: str) -> str:
         if term in line.lower():
             line = line.replace(term, "")
 
-    return _clean(line)
+    return apply_tone_shift(_clean(line), tone_shift)
+
+
+# ---------------------------------------------------------
+# Anchor quick react (closes the anchor's solo run)
+# ---------------------------------------------------------
+
+def build_anchor_react(character: str, headline: str, tone_shift: str = None) -> str:
+    """
+    A one-beat follow-up after the anchor's analysis: a persona line
+    (other than the openers used by build_reaction_line) on the story.
+    """
+    persona_lines = get_persona_lines(character)
+    opener = _choose(persona_lines[3:] or persona_lines)
+    theme = " ".join(headline.split()[:5])
+
+    line = f"{opener} Keep an eye on {theme}." if opener else f"Keep an eye on {theme}."
+    return apply_tone_shift(_clean(line), tone_shift)
@@ -3,12 +3,17 @@
 TOKNNews — Timeline Builder (PD-Integrated Build, Revised Intro Logic)
 Module C-8
 """
+import os
 import random
 import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Patch imports (Chip follow-up + RKG)
 from script_engine.rolling_brain import get_brain_snapshot
-from script_engine.openai_writer import gpt_analysis, gpt_reaction, gpt_duo_line, persona_prompt, _gpt
+from script_engine.keyword_matcher import first as first_keyword
+from script_engine.openai_writer import gpt_analysis, gpt_reaction, gpt_duo_line, persona_prompt, _gpt, gpt_anchor_segment
+from script_engine.llm_usage import usage_defaults
 
 # ------------------------------------------------------------
 # Imports (Package Mode; tests run via `python -m script_engine.run_test`)
@@ -23,6 +28,7 @@ from script_engine.persona.line_builder import (
     build_anchor_react
 )
 from script_engine.character_brain.persona_loader import get_voice, get_domain
+from script_engine.persona.duo_engine import iter_duo_crosstalk
 
 # ------------------------------------------------------------
 # Global writer toggle import (Package vs Local)
@@ -39,18 +45,8 @@ def select_primary_anchor(headline: str, brain: dict):
     """
     Choose the best anchor for this headline (domain + memory weight).
     """
-    headline_l = headline.lower()
-    # Simple domain detection
-    if any(x in headline_l for x in ["eth", "ethereum", "rollup", "l2", "altcoin"]):
-        domain = "altcoin"
-    elif any(x in headline_l for x in ["btc", "bitcoin", "halving", "mining"]):
-        domain = "bitcoin"
-    elif any(x in headline_l for x in ["defi", "liquidity", "protocol", "amm", "yield"]):
-        domain = "defi"
-    elif any(x in headline_l for x in ["hacker", "exploit", "bridge", "hack", "drain"]):
-        domain = "security"
-    else:
-        domain = "general"
+    # Simple domain detection (keyword_matcher "headline_domain")
+    domain = first_keyword(headline, "headline_domain", "general")
     # Score anchors by domain match + brain memory weight
     scores = {}
     for anchor, data in brain["anchors"].items():
@@ -86,6 +82,80 @@ def _audio_block(text, character, block_type):
         "timestamp": time.time()
     }
 
+# ---------------------------------------------------------
+# Line graph — independent lines run concurrently
+# ---------------------------------------------------------
+# Each node is name -> (deps, fn). fn(results) receives the results dict
+# and may only read its own deps. Nodes start as soon as their deps are
+# done, so a segment costs roughly its critical path instead of the sum
+# of every GPT round trip. GPT nodes are wrapped in _soft() so a failed
+# call resolves to None and the static fallbacks take over, as before;
+# anything else that raises propagates to the caller. Nodes run in a
+# copy of the caller's context plus `tags`, so LLM usage records carry
+# the episode / segment they belong to.
+LINE_WORKERS = int(os.getenv("TOKN_LINE_WORKERS", "4"))
+
+# "structured": the primary anchor's four lines come from one JSON-schema
+# call (gpt_anchor_segment); lines that fail validation fall back to the
+# builders one by one. "lines" (default): builders only.
+SEGMENT_MODE = os.getenv("TOKN_SEGMENT_MODE", "lines").lower()
+ANCHOR_LINES = ("reaction", "analysis", "transition", "quick_react")
+_LINE_POOL = ThreadPoolExecutor(max_workers=LINE_WORKERS, thread_name_prefix="timeline-line")
+
+def _run_node(fn, results, tags):
+    with usage_defaults(**tags):
+        return fn(results)
+
+def _iter_lines(graph, tags=None):
+    """Yield (name, result) pairs in completion order."""
+    tags = tags or {}
+    results = {}
+    pending = dict(graph)
+    running = {}
+    while pending or running:
+        for name, (deps, fn) in list(pending.items()):
+            if all(d in results for d in deps):
+                ctx = contextvars.copy_context()
+                running[_LINE_POOL.submit(ctx.run, _run_node, fn, results, tags)] = name
+                del pending[name]
+        if not running:
+            raise ValueError(f"[TimelineBuilder] unresolvable line deps: {sorted(pending)}")
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            name = running.pop(fut)
+            results[name] = fut.result()
+            yield name, results[name]
+
+def _resolve_lines(graph, tags=None):
+    return dict(_iter_lines(graph, tags))
+
+def _stream_slots(graph, slots, tags=None):
+    """
+    Resolve graph and yield timeline entries in slot order as soon as
+    every earlier slot is final. slots: [(name, make_entry)] where
+    make_entry(text) returns the entry, or None to skip the slot.
+    """
+    results = {}
+    i = 0
+    for name, value in _iter_lines(graph, tags):
+        results[name] = value
+        while i < len(slots) and slots[i][0] in results:
+            slot, make_entry = slots[i]
+            i += 1
+            entry = make_entry(results[slot])
+            if entry is not None:
+                yield entry
+
+def _soft(label, fn):
+    """GPT node: log and resolve to None on failure."""
+    def run(results):
+        try:
+            return fn(results)
+        except Exception as e:
+            print(f"[TimelineBuilder] {label} error:", e)
+            return None
+    return run
+
 # ---------------------------------------------------------
 # Intro Helpers — Vega Ident & Chip Opening (Static fallback)
 # ---------------------------------------------------------
@@ -107,7 +177,106 @@ def _chip_opening_line():
 # ============================================================
 # Main — Build timeline based on PD instructions (Step 3-G)
 # ============================================================
-def build_timeline(
+def _gpt_vega_ident(brain):
+    """Vega's GPT-generated welcome (one-liner, vibe only)."""
+    persona_v = persona_prompt("vega", brain, mode="news", allow_multi=False)
+    vega_prompt = (
+        f"{persona_v.strip()}\n\n"
+        "You are Vega Watt, the booth announcer. "
+        "In one sentence, warmly welcome the audience to TOKN News to kick off the show."
+    )
+    # fixed prompt — cached, every show would open with the same line
+    return _gpt(vega_prompt, "vega", "vega_ident", cache=False)
+
+def _gpt_chip_greeting(headline, cluster_articles, brain):
+    """Chip's GPT-generated greeting and rundown (2-3 sentences)."""
+    tm = time.localtime()
+    hour = tm.tm_hour
+    if 5 <= hour < 12:
+        part_of_day = "morning"
+    elif 12 <= hour < 18:
+        part_of_day = "afternoon"
+    else:
+        part_of_day = "evening"
+    day_name = time.strftime("%A", tm)
+    date_str = time.strftime("%B %d, %Y", tm)
+    # Basic holiday awareness (extendable)
+    holiday = None
+    if tm.tm_mon == 1 and tm.tm_mday == 1:
+        holiday = "New Year's Day"
+    elif tm.tm_mon == 7 and tm.tm_mday == 4:
+        holiday = "Independence Day"
+    elif tm.tm_mon == 10 and tm.tm_mday == 31:
+        holiday = "Halloween"
+    elif tm.tm_mon == 12 and tm.tm_mday == 25:
+        holiday = "Christmas"
+    elif tm.tm_mon == 11 and tm.tm_wday == 3 and 22 <= tm.tm_mday <= 28:
+        holiday = "Thanksgiving"
+    persona_c = persona_prompt("chip", brain, mode="news", allow_multi=True)
+    chip_prompt = (
+        f"{persona_c.strip()}\n\n"
+        f"You are Chip, the host. It's {part_of_day} on {day_name}, {date_str}."
+    )
+    if holiday:
+        chip_prompt += f" Today is {holiday},"
+    chip_prompt += (
+        " welcome the audience and introduce the top stories of the day.\n"
+        f"Main Headline: \"{headline}\"\n"
+    )
+    if cluster_articles:
+        chip_prompt += "Other Top Headlines:\n"
+        for h in cluster_articles:
+            chip_prompt += f"- {h}\n"
+    chip_prompt += (
+        "\nGuidelines:\n"
+        "- Start with a friendly greeting (reflect time of day"
+        + (", and mention the holiday)" if holiday else ")")
+        + ".\n- Transition into the main headline and briefly tease upcoming stories.\n"
+        "- Keep it concise (max 3 sentences) and engaging."
+    )
+    return _gpt(chip_prompt, "chip", "chip_open")
+
+def _gpt_toss(next_anchor, headline, brain):
+    from script_engine.openai_writer import gpt_chip_toss
+    return gpt_chip_toss(
+        next_anchor=next_anchor,
+        headline=headline,
+        brain=brain,
+        show_mode="news",
+        pd_flags={}
+    )
+
+def _from_segment(block_type, build):
+    """Line node for structured mode: the segment's line, else the builder."""
+    def run(results):
+        line = (results.get("anchor_segment") or {}).get(block_type)
+        return line if line else build()
+    return run
+
+def _entry(block_type, speaker, tone_shift, fallback=None, required=False):
+    """
+    Slot builder: timeline entry for a finished line (or skip it).
+    A structured line ({"text", "tone"}) supplies its own tone when the
+    PD gave none.
+    """
+    def make(text):
+        tone = tone_shift
+        if isinstance(text, dict):
+            tone = tone_shift or text.get("tone")
+            text = text.get("text")
+        if not text and fallback:
+            text = fallback()
+        if not text and not required:
+            return None
+        return {
+            "type": block_type,
+            "speaker": speaker,
+            "text": text,
+            "tone_shift": tone
+        }
+    return make
+
+def iter_timeline(
     headline: str,
     synthesis: str = "",
     article_context: str = "",
@@ -117,293 +286,160 @@ def build_timeline(
     allow_vega=False,
     show_intro=False,
     segment_type="headline",
-    tone_shift=None
+    tone_shift=None,
+    character=None,
+    pd_config=None
 ):
-    timeline = []
-    audio_blocks = []
-
+    """
+    Streaming build: yields timeline entries in final order as soon as
+    each one (and everything before it) is written, so TTS can start on
+    the first line while later lines are still with the LLM.
+    """
     # Snapshot the rolling brain state for context
     brain = get_brain_snapshot()
 
     # 1. Select primary anchor (Chip decides who leads this story)
     primary_anchor, primary_domain = select_primary_anchor(headline, brain)
-    duo_anchor = None  # PD may assign a secondary anchor (duo) based on context
+    # PD assigns the duo: the second anchor in its lineup (apply_duo_anchor),
+    # skipped when it is the anchor already leading this story
+    pd_anchors = (pd_config or {}).get("anchors") or anchors or []
+    duo_anchor = next((a for a in pd_anchors[1:] if a not in (primary_anchor, "chip")), None)
     speaker = primary_anchor  # primary speaker for this segment
 
     # --------------------------------------------------------
-    # SHOW INTRO SEQUENCE — Vega ident (booth voice) + Chip greeting
+    # Round 1 — lines that don't depend on each other's text:
+    # intro (Vega ident + Chip greeting) or Chip's remark, the opening
+    # toss, and the primary anchor's reaction / analysis / transition /
+    # quick react. All run concurrently on the line pool.
     # --------------------------------------------------------
-    if show_intro:
-        # Vega opens the show
-        vega_line = None
-        chip_line = None
-        if USE_OPENAI_WRITER:
-            try:
-                # Vega's GPT-generated welcome (one-liner, vibe only)
-                persona_v = persona_prompt("vega", brain, mode="news", allow_multi=False)
-                vega_prompt = (
-                    f"{persona_v.strip()}\n\n"
-                    "You are Vega Watt, the booth announcer. "
-                    "In one sentence, warmly welcome the audience to TOKN News to kick off the show."
-                )
-                vega_line = _gpt(vega_prompt)
-            except Exception as e:
-                print("[TimelineBuilder] Vega intro generation error:", e)
-                vega_line = None
-            try:
-                # Chip's GPT-generated greeting and rundown (2-3 sentences)
-                tm = time.localtime()
-                hour = tm.tm_hour
-                if 5 <= hour < 12:
-                    part_of_day = "morning"
-                elif 12 <= hour < 18:
-                    part_of_day = "afternoon"
-                else:
-                    part_of_day = "evening"
-                day_name = time.strftime("%A", tm)
-                date_str = time.strftime("%B %d, %Y", tm)
-                # Basic holiday awareness (extendable)
-                holiday = None
-                if tm.tm_mon == 1 and tm.tm_mday == 1:
-                    holiday = "New Year's Day"
-                elif tm.tm_mon == 7 and tm.tm_mday == 4:
-                    holiday = "Independence Day"
-                elif tm.tm_mon == 10 and tm.tm_mday == 31:
-                    holiday = "Halloween"
-                elif tm.tm_mon == 12 and tm.tm_mday == 25:
-                    holiday = "Christmas"
-                elif tm.tm_mon == 11 and tm.tm_wday == 3 and 22 <= tm.tm_mday <= 28:
-                    holiday = "Thanksgiving"
-                persona_c = persona_prompt("chip", brain, mode="news", allow_multi=True)
-                chip_prompt = (
-                    f"{persona_c.strip()}\n\n"
-                    f"You are Chip, the host. It's {part_of_day} on {day_name}, {date_str}."
-                )
-                if holiday:
-                    chip_prompt += f" Today is {holiday},"
-                chip_prompt += (
-                    " welcome the audience and introduce the top stories of the day.\n"
-                    f"Main Headline: \"{headline}\"\n"
-                )
-                if cluster_articles:
-                    chip_prompt += "Other Top Headlines:\n"
-                    for h in cluster_articles:
-                        chip_prompt += f"- {h}\n"
-                chip_prompt += (
-                    "\nGuidelines:\n"
-                    "- Start with a friendly greeting (reflect time of day"
-                    + (", and mention the holiday)" if holiday else ")")
-                    + ".\n- Transition into the main headline and briefly tease upcoming stories.\n"
-                    "- Keep it concise (max 3 sentences) and engaging."
-                )
-                chip_line = _gpt(chip_prompt)
-            except Exception as e:
-                print("[TimelineBuilder] Chip greeting generation error:", e)
-                chip_line = None
-
-        # Fallback to static lines if GPT was not used or failed
-        if not vega_line:
-            vega_line = _vega_ident_line()
-        if not chip_line:
-            chip_line = _chip_opening_line()
-
-        # Append Vega ident first (booth voice over intro music)
-        timeline.append({
-            "type": "vega_ident",
-            "speaker": "vega",
-            "text": vega_line,
-            "tone_shift": None
-        })
-        # Append Chip’s greeting + rundown second (on-camera lead anchor)
-        timeline.append({
-            "type": "chip_open",
-            "speaker": "chip",
-            "text": chip_line,
-            "tone_shift": tone_shift
-        })
-
-        # If Chip is **not** the primary anchor for the story, have Chip toss to the anchor
-        if primary_anchor != "chip":
-            toss_line = None
-            if USE_OPENAI_WRITER:
-                from script_engine.openai_writer import gpt_chip_toss
-                try:
-                    toss_line = gpt_chip_toss(
-                        next_anchor=primary_anchor,
-                        headline=headline,
-                        brain=brain,
-                        show_mode="news",
-                        pd_flags={}
-                    )
-                except Exception as e:
-                    print("[TimelineBuilder] Chip toss generation error:", e)
-                    toss_line = None
-            if toss_line:
-                timeline.append({
-                    "type": "chip_toss",
-                    "speaker": "chip",
-                    "text": toss_line,
-                    "tone_shift": tone_shift
-                })
+    builders = {
+        "reaction": lambda: build_reaction_line(speaker, headline, tone_shift=tone_shift),
+        "analysis": lambda: build_analysis_line(speaker, headline, synthesis, article_context, tone_shift=tone_shift),
+        "transition": lambda: build_transition_line(speaker, target_group="anchor", tone_shift=tone_shift),
+        "quick_react": lambda: build_anchor_react(speaker, headline, tone_shift=tone_shift),
+    }
+    if SEGMENT_MODE == "structured" and USE_OPENAI_WRITER:
+        # One round trip for the whole anchor segment; each line node only
+        # runs its builder if the structured reply had no valid line for it.
+        graph = {"anchor_segment": ((), _soft("Anchor segment generation",
+                                              lambda r: gpt_anchor_segment(speaker, headline, synthesis, brain,
+                                                                           article_context=article_context)))}
+        for block_type in ANCHOR_LINES:
+            graph[block_type] = (("anchor_segment",), _from_segment(block_type, builders[block_type]))
     else:
-        # No show intro (mid-show segment) — Chip directly tosses to the primary anchor if needed
-        if primary_anchor != "chip":
-            toss_line = None
-            if USE_OPENAI_WRITER:
-                from script_engine.openai_writer import gpt_chip_toss
-                try:
-                    toss_line = gpt_chip_toss(
-                        next_anchor=primary_anchor,
-                        headline=headline,
-                        brain=brain,
-                        show_mode="news",
-                        pd_flags={}
-                    )
-                except Exception as e:
-                    print("[TimelineBuilder] Chip toss generation error:", e)
-                    toss_line = None
-            if toss_line:
-                timeline.append({
-                    "type": "chip_toss",
-                    "speaker": "chip",
-                    "text": toss_line,
-                    "tone_shift": tone_shift
-                })
-        else:
-            # If Chip is the primary anchor and there's no intro, he can start with a quick remark on the headline
-            if USE_OPENAI_WRITER:
-                try:
-                    chip_remark = gpt_reaction("chip", headline, brain)
-                except Exception as e:
-                    chip_remark = None
-                    print("[TimelineBuilder] Chip self-intro remark error:", e)
-            else:
-                chip_remark = None
-            if chip_remark:
-                timeline.append({
-                    "type": "chip_open",
-                    "speaker": "chip",
-                    "text": chip_remark,
-                    "tone_shift": tone_shift
-                })
+        graph = {block_type: ((), lambda r, b=builders[block_type]: b()) for block_type in ANCHOR_LINES}
+    slots = []
 
     # --------------------------------------------------------
-    # Primary Anchor's Reaction Line
+    # SHOW INTRO SEQUENCE — Vega ident (booth voice) + Chip greeting
+    # (static fallback lines if GPT was not used or failed)
     # --------------------------------------------------------
-    reaction_text = build_reaction_line(speaker, headline, tone_shift=tone_shift)
-    timeline.append({
-        "type": "reaction",
-        "speaker": speaker,
-        "text": reaction_text,
-        "tone_shift": tone_shift
-    })
+    if show_intro:
+        if USE_OPENAI_WRITER:
+            graph["vega_ident"] = ((), _soft("Vega intro generation",
+                                             lambda r: _gpt_vega_ident(brain)))
+            graph["chip_open"] = ((), _soft("Chip greeting generation",
+                                            lambda r: _gpt_chip_greeting(headline, cluster_articles, brain)))
+        else:
+            graph["vega_ident"] = ((), lambda r: None)
+            graph["chip_open"] = ((), lambda r: None)
+        # Vega ident first (booth voice over intro music), then Chip’s greeting + rundown
+        slots.append(("vega_ident", _entry("vega_ident", "vega", None, fallback=_vega_ident_line)))
+        slots.append(("chip_open", _entry("chip_open", "chip", tone_shift, fallback=_chip_opening_line)))
+    elif primary_anchor == "chip" and USE_OPENAI_WRITER:
+        # Chip leads with no intro — a quick remark on the headline
+        graph["chip_open"] = ((), _soft("Chip self-intro remark",
+                                        lambda r: gpt_reaction("chip", headline, brain)))
+        slots.append(("chip_open", _entry("chip_open", "chip", tone_shift)))
 
-    # --------------------------------------------------------
-    # Primary Anchor's Analysis Line
-    # --------------------------------------------------------
-    analysis_text = build_analysis_line(speaker, headline, synthesis, article_context, tone_shift=tone_shift)
-    timeline.append({
-        "type": "analysis",
-        "speaker": speaker,
-        "text": analysis_text,
-        "tone_shift": tone_shift
-    })
+    # If Chip is **not** the primary anchor for the story, Chip tosses to the anchor
+    if primary_anchor != "chip" and USE_OPENAI_WRITER:
+        graph["chip_toss"] = ((), _soft("Chip toss generation",
+                                        lambda r: _gpt_toss(primary_anchor, headline, brain)))
+        slots.append(("chip_toss", _entry("chip_toss", "chip", tone_shift)))
 
-    # --------------------------------------------------------
-    # Transition Line (anchors)
-    # --------------------------------------------------------
-    transition_text = build_transition_line(speaker, target_group="anchor", tone_shift=tone_shift)
-    timeline.append({
-        "type": "transition",
-        "speaker": speaker,
-        "text": transition_text,
-        "tone_shift": tone_shift
-    })
+    # Primary Anchor — reaction, analysis, transition, quick react
+    for block_type in ANCHOR_LINES:
+        slots.append((block_type, _entry(block_type, speaker, tone_shift, required=True)))
 
-    # --------------------------------------------------------
-    # Quick React (primary anchor follow-up)
-    # --------------------------------------------------------
-    react_text = build_anchor_react(speaker, headline, tone_shift=tone_shift)
-    timeline.append({
-        "type": "quick_react",
-        "speaker": speaker,
-        "text": react_text,
-        "tone_shift": tone_shift
-    })
+    tags = {"segment_type": segment_type}
+    last = None
+    for last in _stream_slots(graph, slots, tags):
+        yield last
 
     # ------------------------------------------------------------
     # Duo Logic — Round 1 (if a secondary anchor is present)
     # ------------------------------------------------------------
     if duo_anchor:
-        last_solo_speaker = timeline[-1]["speaker"] if timeline else None
-        duo_blocks = _build_duo_crosstalk(
+        last_solo_speaker = last["speaker"] if last else None
+        duo_lines = iter_duo_crosstalk(
             primary_anchor,
             duo_anchor,
             headline,
             synthesis,
             tone_shift,
-            last_solo_speaker
+            last_solo_speaker,
+            show_mode="news",
+            brain=brain,
+            last_line=last["text"] if last else None
         )
-        timeline.extend(duo_blocks)
+        while True:
+            # tags applied per step — never held across a yield
+            with usage_defaults(**tags):
+                entry = next(duo_lines, None)
+            if entry is None:
+                break
+            last = entry
+            yield last
 
     # ============================================================
     # Chip Follow-Up (Patch 7) — Chip reacts after anchors finish
     # ============================================================
+    # The follow-up needs the last spoken line; the next-segment toss does
+    # not, so it runs alongside and is only used if the follow-up lands.
     if primary_anchor != "chip":
-        from script_engine.openai_writer import gpt_chip_followup, gpt_chip_toss
+        from script_engine.openai_writer import gpt_chip_followup
         chip_domain = get_domain("chip")
-        chip_follow = None
-        try:
-            chip_follow = gpt_chip_followup(
+        last_line = last["text"] if last else ""
+        next_anchor = primary_anchor  # default to primary anchor (no PD flags used here for brevity)
+        closing = {
+            "chip_followup": ((), _soft("Chip follow-up", lambda r: gpt_chip_followup(
                 headline=headline,
                 synthesis=synthesis,
                 primary=primary_anchor,
                 duo=duo_anchor,
-                last_line=timeline[-1]["text"] if timeline else "",
+                last_line=last_line,
                 pd_flags={},
                 show_mode="news",
                 brain=brain,
                 chip_domain=chip_domain
-            )
-        except Exception as e:
-            print("[TimelineBuilder] Chip follow-up error:", e)
-            chip_follow = None
-        if chip_follow:
-            timeline.append({
-                "type": "chip_followup",
-                "speaker": "chip",
-                "text": chip_follow,
-                "tone_shift": tone_shift
-            })
-            # Chip smart-toss to next anchor (determine who speaks next)
-            next_anchor = primary_anchor  # default to primary anchor (no PD flags used here for brevity)
-            toss_line = None
-            try:
-                toss_line = gpt_chip_toss(
-                    next_anchor=next_anchor,
-                    headline=headline,
-                    brain=brain,
-                    show_mode="news",
-                    pd_flags={}
-                )
-            except Exception as e:
-                toss_line = None
-                print("[TimelineBuilder] Next-segment toss error:", e)
-            if toss_line:
-                timeline.append({
-                    "type": "chip_toss",
-                    "speaker": "chip",
-                    "text": toss_line,
-                    "tone_shift": tone_shift
-                })
-            # Removed the placeholder segment_reset line to avoid static script text
-            # (Next anchor will continue in the following segment without a spoken cue)
+            ))),
+            "next_toss": ((), _soft("Next-segment toss",
+                                    lambda r: _gpt_toss(next_anchor, headline, brain))),
+        }
+        followed = []
+        def follow_entry(text):
+            entry = _entry("chip_followup", "chip", tone_shift)(text)
+            followed.append(entry is not None)
+            return entry
+        def toss_entry(text):
+            # Chip smart-toss to next anchor — only after a follow-up
+            return _entry("chip_toss", "chip", tone_shift)(text) if followed[0] else None
+        yield from _stream_slots(closing, [("chip_followup", follow_entry),
+                                           ("next_toss", toss_entry)], tags)
+        # Removed the placeholder segment_reset line to avoid static script text
+        # (Next anchor will continue in the following segment without a spoken cue)
 
     # (Patch 3+ additional follow-up question, round2 duo, Bitsy/Vega cameos, montage insertion omitted for brevity)
 
+
+def build_timeline(headline: str, **kwargs):
+    """Non-streaming build: the whole timeline at once."""
+    timeline = list(iter_timeline(headline, **kwargs))
+
     # Return timeline and audio_blocks (audio will be rendered separately)
     return {
         "timeline": timeline,
-        "audio_blocks": audio_blocks,
+        "audio_blocks": [],
         "unreal": {}
     }
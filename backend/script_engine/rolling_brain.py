@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Rolling Brain
+Live, decaying view of what the news cycle is about, fed incrementally
+by ingestion (ingest_v2 enrich + ingestion_aggregator).
+
+ - Anchor weights: static base weight + a decayed activity boost for
+   anchors whose domain (or primary assignment) matches recent stories
+ - Trending topics: decayed scores per domain / category
+ - Sentiment: decayed weighted mean, overall and per domain
+ - Recent events: last RECENT_EVENTS headlines
+
+Every counter decays exponentially with TOKN_BRAIN_HALF_LIFE_HOURS and
+is updated in O(1) per story (lazy decay: value + last-touched time).
+
+Readers get a frozen snapshot (copy-on-write): observe_*() publishes a
+new one, get_brain_snapshot() just returns the current reference, so
+build_timeline / select_primary_anchor / persona_prompt can call it as
+often as they like. The state is persisted to TOKN_ROLLING_BRAIN_PATH
+so the script engine picks up what the ingest process observed.
+
+    python3 -m script_engine.rolling_brain [--show | --bench]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+
+from script_engine.jsonio import load_json, write_json
+from script_engine.character_brain.character_store import freeze
+
+BRAIN_PATH = os.getenv("TOKN_ROLLING_BRAIN_PATH", "/var/www/toknnews-live/data/rolling_brain.json")
+HALF_LIFE_SECONDS = float(os.getenv("TOKN_BRAIN_HALF_LIFE_HOURS", "6")) * 3600
+CHECK_SECONDS = float(os.getenv("TOKN_BRAIN_CHECK_SECONDS", "5"))
+REFRESH_SECONDS = 60.0      # rebuild for decay even without new stories
+ANCHOR_BOOST_CAP = 3.0      # activity can add at most this to a base weight
+RECENT_EVENTS = 25
+TOPICS_MAX = 10
+MIN_SCORE = 0.05
+SEEN_MAX = 1000
+
+# anchor -> (domains, base weight)
+BASE_ANCHORS = {
+    "chip":   (["general", "macro", "breaking"], 8),
+    "reef":   (["defi", "altcoin"], 7),
+    "lawson": (["macro", "policy", "legal", "regulation"], 6),
+    "bond":   (["security", "macro"], 7),
+    "ledger": (["onchain", "flows"], 7),
+    "cap":    (["trading", "venture"], 5),
+    "neura":  (["ai"], 5),
+    "ivy":    (["narrative", "ethics"], 5),
+    "cash":   (["funding", "markets"], 4),
+    "rex":    (["volatility", "nightline"], 5),
+    "penny":  (["retail"], 6),
+    "vega":   (["vibe"], 2),
+    "bitsy":  (["sentiment", "culture"], 3),
+}
+
+SENTIMENT_SCORES = {
+    "very positive": 1.0, "positive": 0.6, "bullish": 0.8, "optimistic": 0.5,
+    "neutral": 0.0, "mixed": 0.0,
+    "negative": -0.6, "bearish": -0.8, "very negative": -1.0, "fearful": -0.7,
+}
+
+_lock = threading.Lock()
+_state = None           # raw decayed counters (see _empty_state)
+_sig = None             # (mtime_ns, size) of BRAIN_PATH as last read / written
+_snapshot = None        # frozen, published copy
+_built = 0.0            # monotonic time of the last snapshot build
+_next_check = 0.0
+
+STATS = {"reads": 0, "builds": 0, "observed": 0, "duplicates": 0, "reloads": 0}
+
+
+# ---------------------------------------------------------
+# Decayed counters
+# ---------------------------------------------------------
+def _empty_state():
+    return {"topics": {}, "anchors": {}, "sentiment": {}, "recent": [], "seen": [],
+            "updated": 0.0}
+
+
+def _decay(value, t, now):
+    if now <= t:
+        return value
+    return value * 0.5 ** ((now - t) / HALF_LIFE_SECONDS)
+
+
+def _bump(table, key, amount, now):
+    value, t = table.get(key, (0.0, now))
+    table[key] = [_decay(value, t, now) + amount, now]
+
+
+def _bump_sentiment(table, key, score, weight, now):
+    total, w, t = table.get(key, (0.0, 0.0, now))
+    f = _decay(1.0, t, now)
+    table[key] = [total * f + score * weight, w * f + weight, now]
+
+
+def _sentiment_score(value):
+    if isinstance(value, (int, float)):
+        return max(-1.0, min(1.0, float(value)))
+    return SENTIMENT_SCORES.get(str(value or "").strip().lower())
+
+
+def _importance(value):
+    """0..1 from either a 1-10 or a 0-100 importance scale."""
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return 0.5
+    v = v / 100.0 if v > 10 else v / 10.0
+    return max(0.0, min(1.0, v))
+
+
+def _anchor_key(name):
+    return (name or "").split()[0].lower() if name else None
+
+
+def _story_id(story):
+    return story.get("hash") or hashlib.md5(
+        story.get("headline", "").strip().lower().encode()).hexdigest()
+
+
+# ---------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------
+def _signature():
+    try:
+        st = os.stat(BRAIN_PATH)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load():
+    """Caller holds _lock."""
+    global _state, _sig
+    _sig = _signature()
+    data = load_json(BRAIN_PATH) if _sig else None
+    _state = data if isinstance(data, dict) else _empty_state()
+    for key, default in _empty_state().items():
+        _state.setdefault(key, default)
+
+
+def _persist():
+    """Caller holds _lock."""
+    global _sig
+    try:
+        write_json(BRAIN_PATH, _state)
+        _sig = _signature()
+    except OSError as e:
+        print(f"[RollingBrain] ⚠️ could not persist state: {e}")
+
+
+# ---------------------------------------------------------
+# Snapshot
+# ---------------------------------------------------------
+def _build(now):
+    """Freeze the current state into a snapshot. Caller holds _lock."""
+    global _snapshot, _built
+    anchors = {}
+    for name, (domains, base) in BASE_ANCHORS.items():
+        value, t = _state["anchors"].get(name, (0.0, now))
+        boost = min(ANCHOR_BOOST_CAP, _decay(value, t, now))
+        anchors[name] = {"domain": domains, "weight": round(base + boost, 2),
+                         "activity": round(boost, 2)}
+
+    topics = sorted(
+        ((k, _decay(v, t, now)) for k, (v, t) in _state["topics"].items()),
+        key=lambda kv: kv[1], reverse=True,
+    )
+    trending = [{"topic": k, "score": round(s, 2)} for k, s in topics[:TOPICS_MAX]
+                if s >= MIN_SCORE]
+
+    sentiment = {}
+    for key, (total, w, t) in _state["sentiment"].items():
+        f = _decay(1.0, t, now)
+        if w * f >= MIN_SCORE:
+            sentiment[key] = round(total / w, 3) if w else 0.0
+    overall = sentiment.get("overall", 0.0)
+    mood = "bullish" if overall > 0.2 else "bearish" if overall < -0.2 else "neutral"
+
+    recent = _state["recent"][-RECENT_EVENTS:]
+    summary = "; ".join(filter(None, [
+        "Trending: " + ", ".join(t["topic"] for t in trending[:5]) if trending else "",
+        f"Mood: {mood} ({overall:+.2f})" if "overall" in sentiment else "",
+        "Latest: " + " | ".join(e["headline"] for e in recent[-3:]) if recent else "",
+    ]))
+
+    _snapshot = freeze({
+        "anchors": anchors,
+        "trending_topics": trending,
+        "recent_events": recent,
+        "sentiment": {"overall": overall, "mood": mood,
+                      "domains": {k: v for k, v in sentiment.items() if k != "overall"}},
+        "summary": summary,
+        "metadata": {"version": "1.0-rolling", "updated": _state["updated"],
+                     "built": time.time()},
+    })
+    _built = time.monotonic()
+    STATS["builds"] += 1
+    return _snapshot
+
+
+def get_brain_snapshot():
+    """
+    Current brain as a frozen dict. The same object is returned until
+    new stories arrive (or decay is refreshed), so callers may hold it
+    and key caches on its identity.
+    """
+    global _next_check
+    STATS["reads"] += 1
+    snap = _snapshot
+    if snap is not None and time.monotonic() < _next_check:
+        return snap
+
+    with _lock:
+        now_m = time.monotonic()
+        if _snapshot is not None and now_m < _next_check:
+            return _snapshot
+        _next_check = now_m + CHECK_SECONDS
+        if _state is None or _signature() != _sig:
+            reload = _state is not None
+            _load()
+            if reload:
+                STATS["reloads"] += 1
+            return _build(time.time())
+        if _snapshot is None or now_m - _built >= REFRESH_SECONDS:
+            return _build(time.time())
+        return _snapshot
+
+
+# ---------------------------------------------------------
+# Ingestion hooks
+# ---------------------------------------------------------
+def observe_stories(stories, persist=True):
+    """
+    Fold enriched stories into the brain. Stories already seen (by
+    headline hash) are ignored, so enrich and the aggregator can both
+    report the same item. Returns the number of new stories.
+    """
+    global _next_check
+    added = 0
+    with _lock:
+        if _state is None or _signature() != _sig:
+            _load()
+        now = time.time()
+        seen = set(_state["seen"])
+        for story in stories:
+            if not story or not story.get("headline"):
+                continue
+            sid = _story_id(story)
+            if sid in seen:
+                STATS["duplicates"] += 1
+                continue
+            seen.add(sid)
+            _state["seen"].append(sid)
+            _observe(story, now)
+            added += 1
+
+        if not added:
+            return 0
+        _state["seen"] = _state["seen"][-SEEN_MAX:]
+        _state["recent"] = _state["recent"][-RECENT_EVENTS:]
+        _state["updated"] = now
+        STATS["observed"] += added
+        if persist:
+            _persist()
+        _build(now)
+        _next_check = time.monotonic() + CHECK_SECONDS
+    return added
+
+
+def observe_story(story, persist=True):
+    return observe_stories([story], persist=persist)
+
+
+def _observe(story, now):
+    """Caller holds _lock."""
+    weight = 0.5 + _importance(story.get("importance"))
+    domain = (story.get("domain") or "general").lower()
+
+    _bump(_state["topics"], domain, weight, now)
+    category = (story.get("category") or "").strip().lower()
+    if category and category != domain:
+        _bump(_state["topics"], category, 0.5 * weight, now)
+
+    primary = _anchor_key(story.get("primary_character"))
+    secondary = _anchor_key(story.get("secondary_character"))
+    for name, (domains, _) in BASE_ANCHORS.items():
+        amount = 0.0
+        if name == primary:
+            amount += weight
+        elif name == secondary:
+            amount += 0.5 * weight
+        if domain in domains:
+            amount += 0.5 * weight
+        if amount:
+            _bump(_state["anchors"], name, amount, now)
+
+    score = _sentiment_score(story.get("sentiment"))
+    if score is not None:
+        _bump_sentiment(_state["sentiment"], "overall", score, weight, now)
+        _bump_sentiment(_state["sentiment"], domain, score, weight, now)
+
+    _state["recent"].append({
+        "headline": story["headline"],
+        "domain": domain,
+        "sentiment": story.get("sentiment", "neutral"),
+        "importance": story.get("importance", 5),
+        "ts": story.get("ts") or story.get("timestamp") or now,
+    })
+
+
+def stats():
+    return {**STATS, "path": BRAIN_PATH, "half_life_h": HALF_LIFE_SECONDS / 3600}
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+def bench(n_stories=2000, reads=200000):
+    import random
+    global BRAIN_PATH, _state, _snapshot, _next_check
+    BRAIN_PATH = os.path.join("/tmp", f"rolling_brain_bench_{os.getpid()}.json")
+    _state, _snapshot, _next_check = None, None, 0.0
+    rng = random.Random(7)
+    domains = ["defi", "macro", "ai", "onchain", "legal", "markets", "culture"]
+    stories = [{"headline": f"story {i}", "domain": rng.choice(domains),
+                "sentiment": rng.choice(list(SENTIMENT_SCORES)),
+                "importance": rng.randint(1, 10)} for i in range(n_stories)]
+    try:
+        t0 = time.perf_counter()
+        for i in range(0, n_stories, 20):
+            observe_stories(stories[i:i + 20])
+        ingest = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(reads):
+            get_brain_snapshot()
+        read = time.perf_counter() - t0
+    finally:
+        if os.path.exists(BRAIN_PATH):
+            os.remove(BRAIN_PATH)
+    print(f"[RollingBrain] ingest {n_stories} stories in batches of 20: "
+          f"{ingest * 1000:.1f} ms ({ingest / n_stories * 1e6:.1f} µs/story incl. persist)")
+    print(f"[RollingBrain] {reads} snapshot reads: {read * 1000:.1f} ms "
+          f"({read / reads * 1e9:.0f} ns/read, {STATS['builds']} builds)")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        bench()
+    else:
+        print(json.dumps(get_brain_snapshot(), indent=2, ensure_ascii=False))
+        print(json.dumps(stats(), indent=2))
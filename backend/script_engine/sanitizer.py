@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Feed Text Sanitizer
+Shared by the live compiler, sandbox compilers and content_cleaner.
+
+One precompiled tokenizer pass removes, in a single scan:
+ - HTML tags            <p>, <a href=...>, <img ...>
+ - URLs                 https://..., http://..., www....
+Entities are decoded afterwards (only when an '&' is present), so text
+such as "S&amp;P 500 &lt; 4,000" keeps its decoded '<' instead of
+having it matched as the start of a tag; unknown entities that survive
+decoding are dropped. Bare image file
+names (chart.png) are only scanned for when an image extension survives
+the main pass — most of them sit inside URLs that are already gone.
+Whitespace is collapsed with str.split / join.
+
+Benchmark against the old per-file re.sub chains:
+    python3 -m script_engine.sanitizer --bench [rss_latest.json]
+"""
+
+import re
+import sys
+import html
+import time
+import json
+
+MAX_LEN = 1000
+
+_JUNK = re.compile(
+    r"<[^>]*>"                                      # tags
+    r"|(?:https?://|www\.)[^\s)<]+"                 # urls
+)
+_ENTITY = re.compile(r"&[a-z]+;")                   # left over after unescaping
+_IMG_EXT = re.compile(r"\.(?:jpe?g|png|gif|webp|svg)\b", re.IGNORECASE)
+_IMG_NAME = re.compile(
+    r"(?<![^\s>])(?:[^\s<>.]++\.)++(?:jpe?g|png|gif|webp|svg)\b", re.IGNORECASE
+)
+
+
+def sanitize(raw, limit=MAX_LEN):
+    """Plain readable text from a feed title / summary, trimmed to limit."""
+    if not raw:
+        return ""
+    # tags before entities: a decoded '<' is text, not markup
+    s = _JUNK.sub(" ", raw)
+    if "&" in s:
+        s = _ENTITY.sub(" ", html.unescape(s))
+    if _IMG_EXT.search(s):
+        s = _IMG_NAME.sub(" ", s)
+    s = " ".join(s.split())
+    return s[:limit] if limit else s
+
+
+# names used by the compilers and content_cleaner
+strip_html = sanitize
+clean_text = sanitize
+
+
+# ---------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------
+RSS_PATH = "/var/www/toknnews/data/raw/rss_latest.json"
+
+
+def _legacy_strip_html(s):
+    if not s: return ""
+    s = re.sub(r'<[^>]+>', '', s)
+    s = re.sub(r'https?://\S+', '', s)
+    s = re.sub(r'\b\S+\.(jpg|jpeg|png|gif|webp|svg)\b', '', s, flags=re.IGNORECASE)
+    s = re.sub(r'\s+', ' ', s).strip()
+    return s[:1000]
+
+
+def _legacy_clean_text(raw):
+    if not raw:
+        return ""
+    s = html.unescape(raw)
+    s = re.sub(r"<[^>]+>", " ", s)
+    s = re.sub(r"https?://[^\s)]+", " ", s)
+    s = re.sub(r"www\.[^\s)]+", " ", s)
+    s = re.sub(r"&[a-z]+;", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s[:1000]
+
+
+def _feed_texts(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        items = data.get("items", data) if isinstance(data, dict) else data
+        texts = [i.get("summary") or i.get("description") or i.get("title") or ""
+                 for i in items if isinstance(i, dict)]
+        texts = [t for t in texts if t]
+        if texts:
+            return texts, path
+    except Exception:
+        pass
+    sample = (
+        '<p><img src="https://cdn.example.com/uploads/2025/11/btc-chart-1200x630.png" '
+        'alt="chart" /></p><p>Bitcoin&#8217;s rally stalled near $98,000 as ETF '
+        'outflows hit &quot;risk-off&quot; desks &amp; traders eyed the Fed. '
+        'Read more at https://www.coindesk.com/markets/2025/11/20/bitcoin-rally-stalls '
+        'or www.theblock.co/post/123456.</p>\n\n<p>The post <a href="https://example.com">'
+        'Bitcoin stalls</a> appeared first on&nbsp;Example News.</p>'
+    )
+    return [sample] * 500, "synthetic RSS summaries"
+
+
+def bench(path=RSS_PATH, rounds=20):
+    texts, origin = _feed_texts(path)
+    cases = [("strip_html (old)", _legacy_strip_html),
+             ("clean_text (old)", _legacy_clean_text),
+             ("sanitize", sanitize)]
+    print(f"[Sanitizer] {len(texts)} texts from {origin}, best of {rounds}")
+    for name, fn in cases:
+        best = None
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            for t in texts:
+                fn(t)
+            dt = time.perf_counter() - t0
+            best = dt if best is None else min(best, dt)
+        print(f"  {name:<18} {best * 1000:8.2f} ms  ({best / len(texts) * 1e6:6.1f} µs/text)")
+    print(f"  sample → {sanitize(texts[0])[:160]!r}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--bench":
+        bench(sys.argv[2] if len(sys.argv) > 2 else RSS_PATH)
+    else:
+        print("usage: python3 -m script_engine.sanitizer --bench [rss_latest.json]")
@@ -9,15 +9,15 @@ import json
 import time
 
 # === Persona + Tone + Timeline Engines ===
-from script_engine.persona.timeline_builder import build_timeline
+from script_engine.persona.timeline_builder import iter_timeline
 from script_engine.synthesis_engine import build_synthesis
 from script_engine.director.pd_controller import run_pd
 
 # =====================================================================
-#  MASTER ENTRYPOINT
+#  STREAMING ENTRYPOINT
 # =====================================================================
 
-def generate_script(
+def stream_script(
     headline,
     article_context=None,
     cluster_articles=None,
@@ -25,20 +25,21 @@ def generate_script(
     pd_suggested_anchor=None,
     rundown_headlines=None,
     rundown_summaries=None,
+    pd_config=None,
 ):
     """
-    Master entrypoint for Script Engine V3 + PD Integration.
+    Streaming Script Engine V3 entrypoint.
+    pd_config: a run_pd() result computed by the caller (e.g. in air
+    order before scripting segments concurrently); run_pd is called
+    here when omitted.
 
-    Returns:
-      {
-        timestamp,
-        headline,
-        character,
-        synthesis,
-        timeline[],
-        audio_blocks[],
-        unreal{}
-      }
+    Returns (script, lines):
+      script — the payload without its timeline yet
+               {timestamp, headline, character, segment_type, synthesis,
+                timeline[] (empty), audio_blocks[], unreal{}}
+      lines  — iterator of timeline entries in final order, each yielded
+               as soon as it is written (feed it to the TTS consumer)
+    The caller fills script["timeline"] from the lines it consumed.
     """
 
     # -----------------------------------------------------
@@ -52,43 +53,80 @@ def generate_script(
     # -----------------------------------------------------
     # 2. PD routing — determines segment type and rules
     # -----------------------------------------------------
-    pd_config = run_pd(headline, suggested_anchor=pd_suggested_anchor)
+    if pd_config is None:
+        pd_config = run_pd(headline, suggested_anchor=pd_suggested_anchor)
 
     segment_type = pd_config["segment_type"]
-    anchors = pd_config["anchors"]
-    allow_bitsy = pd_config["allow_bitsy"]
-    allow_vega = pd_config["allow_vega"]
-    show_intro = pd_config["show_intro"]
 
     # -----------------------------------------------------
-    # 3. Build timeline using persona + tone engine
+    # 3. Timeline stream using persona + tone engine
     # -----------------------------------------------------
-    package = build_timeline(
+    lines = iter_timeline(
         character=character,
         headline=headline,
         synthesis=synthesis,
         article_context=article_context,
-        anchors=anchors,
-        allow_bitsy=allow_bitsy,
-        allow_vega=allow_vega,
-        show_intro=show_intro,
+        anchors=pd_config["anchors"],
+        allow_bitsy=pd_config["allow_bitsy"],
+        allow_vega=pd_config["allow_vega"],
+        show_intro=pd_config["show_intro"],
         segment_type=segment_type,
         pd_config=pd_config,
     )
 
-    # -----------------------------------------------------
-    # 4. Final return structure
-    # -----------------------------------------------------
-    return {
+    script = {
         "timestamp": time.time(),
         "headline": headline,
         "character": character,
         "segment_type": segment_type,
         "synthesis": synthesis,
-        "timeline": package["timeline"],
-        "audio_blocks": package["audio_blocks"],
-        "unreal": package["unreal"],
+        "timeline": [],
+        "audio_blocks": [],
+        "unreal": {},
     }
+    return script, lines
+
+
+# =====================================================================
+#  MASTER ENTRYPOINT
+# =====================================================================
+
+def generate_script(
+    headline,
+    article_context=None,
+    cluster_articles=None,
+    character="chip",
+    pd_suggested_anchor=None,
+    rundown_headlines=None,
+    rundown_summaries=None,
+    pd_config=None,
+):
+    """
+    Master entrypoint for Script Engine V3 + PD Integration.
+
+    Returns:
+      {
+        timestamp,
+        headline,
+        character,
+        synthesis,
+        timeline[],
+        audio_blocks[],
+        unreal{}
+      }
+    """
+    script, lines = stream_script(
+        headline,
+        article_context=article_context,
+        cluster_articles=cluster_articles,
+        character=character,
+        pd_suggested_anchor=pd_suggested_anchor,
+        rundown_headlines=rundown_headlines,
+        rundown_summaries=rundown_summaries,
+        pd_config=pd_config,
+    )
+    script["timeline"] = list(lines)
+    return script
 
 
 # =====================================================================
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+TOKNNews — Offline LLM / TTS Stand-in Server
+Local replacement for OpenAI and ElevenLabs so generate_script,
+run_episode and /render_scene can be load-tested on an offline box.
+
+Endpoints (stdlib HTTP server, one thread per request):
+ - POST /v1/chat/completions            OpenAI shape, seeded text, usage counts;
+                                        honours response_format json_object / json_schema
+ - POST /v1/embeddings                  seeded unit vectors (1536-d)
+ - POST /v1/text-to-speech/{voice_id}   ElevenLabs shape; MP3 (silent MPEG frames)
+                                        or raw PCM (?output_format=pcm_22050) whose
+                                        length follows the text at TOKN_STANDIN_WPM
+
+Output depends only on (TOKN_STANDIN_SEED, request body), so two runs
+produce identical scripts and audio. Latency, jitter and error injection
+are configurable:
+
+    TOKN_STANDIN_LATENCY_MS    base latency per request         (300)
+    TOKN_STANDIN_JITTER_MS     uniform +/- jitter                (100)
+    TOKN_STANDIN_TOKEN_MS      extra per completion token        (8)
+    TOKN_STANDIN_TTS_RTF       TTS seconds per second of audio   (0.15)
+    TOKN_STANDIN_ERROR_RATE    fraction answered with an error   (0)
+    TOKN_STANDIN_ERROR_CODES   codes to pick from                (429,500,503)
+
+Point the engine at it:
+
+    python3 -m script_engine.standin_server --port 8788
+    export OPENAI_BASE_URL=http://127.0.0.1:8788/v1 OPENAI_API_KEY=standin
+    export ELEVEN_API_BASE=http://127.0.0.1:8788 ELEVEN_API_KEY=standin
+
+Benchmark generate_script end to end (server started in-process):
+
+    python3 -m script_engine.standin_server --bench 20
+
+The bench runs against a temp dir: director state, TTS output and the
+LLM usage log are redirected there and the dir is removed afterwards,
+so production state, AUDIO_DIR and llm_usage.jsonl are left untouched.
+"""
+
+import os
+import re
+import sys
+import copy
+import math
+import time
+import array
+import random
+import shutil
+import hashlib
+import tempfile
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from script_engine.jsonio import dumpb, loads
+
+SEED = os.getenv("TOKN_STANDIN_SEED", "tokn")
+LATENCY_MS = float(os.getenv("TOKN_STANDIN_LATENCY_MS", "300"))
+JITTER_MS = float(os.getenv("TOKN_STANDIN_JITTER_MS", "100"))
+TOKEN_MS = float(os.getenv("TOKN_STANDIN_TOKEN_MS", "8"))
+TTS_RTF = float(os.getenv("TOKN_STANDIN_TTS_RTF", "0.15"))
+ERROR_RATE = float(os.getenv("TOKN_STANDIN_ERROR_RATE", "0"))
+ERROR_CODES = [int(c) for c in os.getenv("TOKN_STANDIN_ERROR_CODES", "429,500,503").split(",") if c.strip()]
+WPM = float(os.getenv("TOKN_STANDIN_WPM", "160"))
+EMBED_DIM = 1536
+
+# error injection draws from one seeded stream, so a run's failure
+# pattern repeats for the same request order
+_error_rng = random.Random(f"{SEED}:errors")
+_error_lock = threading.Lock()
+
+STATS = {"chat": 0, "embeddings": 0, "tts": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+
+# ---------------------------------------------------------
+# Deterministic content
+# ---------------------------------------------------------
+OPENERS = [
+    "Here's the part that matters", "Zoom out for a second", "The tape tells the story",
+    "Look past the headline", "This is where it gets interesting", "Let's be clear",
+    "Builders should pay attention", "The market is already pricing this",
+]
+SUBJECTS = [
+    "liquidity", "the order book", "ETF flows", "on-chain activity", "funding rates",
+    "retail sentiment", "validator yields", "stablecoin supply", "regulators", "whales",
+    "the derivatives desk", "developer momentum", "macro pressure", "the treasury curve",
+]
+VERBS = [
+    "is shifting", "keeps tightening", "is quietly rotating", "just flipped",
+    "is running ahead of", "is lagging", "is absorbing", "is testing",
+]
+OBJECTS = [
+    "last week's range", "the broader risk appetite", "the narrative", "key support",
+    "every short-term trader", "the long-term thesis", "the next catalyst", "real demand",
+]
+CLOSERS = [
+    "and that's the signal to watch.", "so patience wins here.", "which changes the playbook.",
+    "and nobody should ignore that.", "so watch the follow-through.", "and the next move decides it.",
+]
+DOMAINS = ["breaking", "markets", "macro", "volatility", "onchain", "legal", "defi",
+           "ai", "ethics", "venture", "culture", "retail", "nightline"]
+
+
+def _rng(*parts):
+    digest = hashlib.sha256("|".join([SEED, *map(str, parts)]).encode("utf-8")).digest()
+    return random.Random(digest)
+
+
+def _sentence(rng):
+    return (f"{rng.choice(OPENERS)}: {rng.choice(SUBJECTS)} {rng.choice(VERBS)} "
+            f"{rng.choice(OBJECTS)}, {rng.choice(CLOSERS)}")
+
+
+def _text(rng, max_tokens):
+    # one to three sentences, kept under max_tokens (~1.3 tokens / word)
+    budget = int((max_tokens or 180) / 1.3)
+    out = []
+    for _ in range(rng.choice((1, 1, 2, 3))):
+        s = _sentence(rng)
+        if out and len(" ".join(out + [s]).split()) > budget:
+            break
+        out.append(s)
+    words = " ".join(out).split()
+    return " ".join(words[:max(budget, 4)])
+
+
+def _tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _from_schema(schema, rng, key=""):
+    """Seeded instance of a JSON schema (object / array / enum / scalars)."""
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type", "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "string")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {k: _from_schema(v, rng, k) for k, v in props.items()}
+    if kind == "array":
+        items = schema.get("items", {})
+        props = items.get("properties") or {}
+        field = next((f for f in ("type", "speaker") if "enum" in props.get(f, {})), None)
+        if field:
+            # typed / per-speaker entries (anchor segment, duo beat): one per value, in order
+            rows = []
+            for value in props[field]["enum"]:
+                row = _from_schema(items, rng, key)
+                row[field] = value
+                rows.append(row)
+            return rows
+        lo = schema.get("minItems", 1)
+        hi = schema.get("maxItems", max(lo, 4))
+        return [_from_schema(schema.get("items", {}), rng, key) for _ in range(rng.randint(lo, hi))]
+    if kind == "integer":
+        return rng.randint(schema.get("minimum", 0), schema.get("maximum", 100))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0), schema.get("maximum", 1)), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return _value_for(key, rng)
+
+
+def _value_for(key, rng):
+    if key == "domain":
+        return rng.choice(DOMAINS)
+    if key in ("sentiment", "tone", "chip_tone"):
+        return rng.choice(["bullish", "bearish", "neutral", "cautious"])
+    if key in ("speaker", "anchor", "character"):
+        return rng.choice(["chip", "rex", "lawson", "ivy", "bitsy"])
+    return _sentence(rng)
+
+
+def _json_template(prompt, rng):
+    """Fill the last {...} template in a json_object prompt."""
+    blocks = re.findall(r"\{[^{}]*\}", prompt)
+    keys = re.findall(r'"([A-Za-z_]+)"\s*:', blocks[-1]) if blocks else []
+    out = {}
+    for k in keys or ["text"]:
+        out[k] = rng.randint(0, 100) if k in ("importance", "score") else _value_for(k, rng)
+    return out
+
+
+def chat_completion(body):
+    messages = body.get("messages") or []
+    model = body.get("model", "gpt-4o-mini")
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    rng = _rng("chat", model, prompt, body.get("temperature"), body.get("max_tokens"))
+
+    fmt = (body.get("response_format") or {}).get("type")
+    if fmt == "json_schema":
+        schema = body["response_format"].get("json_schema", {}).get("schema", {})
+        content = dumpb(_from_schema(schema, rng)).decode("utf-8")
+    elif fmt == "json_object":
+        content = dumpb(_json_template(prompt, rng)).decode("utf-8")
+    else:
+        content = _text(rng, body.get("max_tokens"))
+
+    prompt_tokens, completion_tokens = _tokens(prompt), _tokens(content)
+    return {
+        "id": "chatcmpl-standin-" + hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16],
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def embeddings(body):
+    inputs = body.get("input") or []
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    model = body.get("model", "text-embedding-3-small")
+    data = []
+    for i, text in enumerate(inputs):
+        rng = _rng("embed", model, text)
+        vec = [rng.gauss(0, 1) for _ in range(EMBED_DIM)]
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        data.append({"object": "embedding", "index": i, "embedding": [v / norm for v in vec]})
+    tokens = sum(_tokens(str(t)) for t in inputs)
+    return {"object": "list", "data": data, "model": model,
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+
+# ---------------------------------------------------------
+# Deterministic audio
+# ---------------------------------------------------------
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, mono. A frame whose side info is
+# all zero decodes to 1152 samples of silence, so the file has the exact
+# duration and bitrate of a real ElevenLabs mp3_44100_128 response.
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC0]) + bytes(417 - 4)
+MP3_FRAME_SECONDS = 1152 / 44100
+
+
+def speech_seconds(text, rng=None):
+    words = max(1, len(text.split()))
+    seconds = words * 60.0 / WPM + 0.35        # lead-in / tail
+    if rng is not None:
+        seconds *= rng.uniform(0.92, 1.08)
+    return seconds
+
+
+def mp3_audio(seconds):
+    return MP3_FRAME * max(1, math.ceil(seconds / MP3_FRAME_SECONDS))
+
+
+def pcm_audio(seconds, rate, rng):
+    """16-bit LE mono: a voiced tone with a syllable-rate envelope."""
+    n = int(seconds * rate)
+    pitch = rng.uniform(95, 220)
+    syllable = rng.uniform(3.5, 5.0)
+    two_pi = 2 * math.pi
+    samples = array.array("h", (
+        int(6000 * max(0.0, math.sin(two_pi * syllable * i / rate))
+            * (math.sin(two_pi * pitch * i / rate) + 0.4 * math.sin(two_pi * 2 * pitch * i / rate)))
+        for i in range(n)
+    ))
+    if sys.byteorder != "little":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def text_to_speech(voice_id, body, output_format):
+    text = body.get("text", "")
+    rng = _rng("tts", voice_id, text, body.get("model_id"))
+    seconds = speech_seconds(text, rng)
+    if output_format.startswith("pcm_"):
+        rate = int(output_format.split("_")[1])
+        return pcm_audio(seconds, rate, rng), "audio/pcm", seconds
+    return mp3_audio(seconds), "audio/mpeg", seconds
+
+
+# ---------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------
+def _delay(seconds):
+    jitter = random.uniform(-JITTER_MS, JITTER_MS) / 1000.0
+    time.sleep(max(0.0, seconds + jitter))
+
+
+def _inject_error():
+    if ERROR_RATE <= 0 or not ERROR_CODES:
+        return None
+    with _error_lock:
+        if _error_rng.random() >= ERROR_RATE:
+            return None
+        return _error_rng.choice(ERROR_CODES)
+
+
+def _count(name):
+    with _stats_lock:
+        STATS[name] += 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, payload, content_type="application/json", headers=None):
+        body = payload if isinstance(payload, bytes) else dumpb(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, code):
+        _count("errors")
+        headers = {"Retry-After": "1"} if code == 429 else None
+        self._send(code, {"error": {"message": f"stand-in injected {code}",
+                                    "type": "standin_error", "code": code}}, headers=headers)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("", "/health"):
+            with _stats_lock:
+                self._send(200, {"status": "ok", "stats": dict(STATS)})
+        else:
+            self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = loads(self.rfile.read(length)) if length else {}
+        except ValueError:
+            return self._send(400, {"error": {"message": "invalid JSON"}})
+
+        path = url.path.rstrip("/")
+        if path.endswith("/chat/completions"):
+            _count("chat")
+            resp = chat_completion(body)
+            code = _inject_error()
+            _delay(LATENCY_MS / 1000.0 + resp["usage"]["completion_tokens"] * TOKEN_MS / 1000.0)
+            return self._error(code) if code else self._send(200, resp)
+
+        if path.endswith("/embeddings"):
+            _count("embeddings")
+            resp = embeddings(body)
+            code = _inject_error()
+            _delay(LATENCY_MS / 1000.0)
+            return self._error(code) if code else self._send(200, resp)
+
+        m = re.search(r"/text-to-speech/([^/]+)(?:/stream)?$", path)
+        if m:
+            _count("tts")
+            fmt = parse_qs(url.query).get("output_format", ["mp3_44100_128"])[0]
+            audio, content_type, seconds = text_to_speech(m.group(1), body, fmt)
+            code = _inject_error()
+            _delay(LATENCY_MS / 1000.0 + seconds * TTS_RTF)
+            if code:
+                return self._error(code)
+            return self._send(200, audio, content_type,
+                              {"x-character-count": str(len(body.get("text", "")))})
+
+        self._send(404, {"error": {"message": f"no stand-in for {url.path}"}})
+
+
+def serve(host="127.0.0.1", port=8788, background=False):
+    """Start the stand-in; returns the server (its thread runs if background)."""
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    print(f"[Standin] ✅ listening on http://{host}:{server.server_port} "
+          f"(latency {LATENCY_MS:.0f}±{JITTER_MS:.0f} ms, error rate {ERROR_RATE})")
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+
+def point_engine_at(server):
+    """Env for the OpenAI SDK and the TTS renderers (set before they are used)."""
+    base = f"http://127.0.0.1:{server.server_port}"
+    os.environ["OPENAI_BASE_URL"] = base + "/v1"
+    os.environ["OPENAI_API_KEY"] = "standin"
+    os.environ["ELEVEN_API_BASE"] = base
+    os.environ["ELEVEN_API_KEY"] = "standin"
+    return base
+
+
+# ---------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------
+BENCH_HEADLINES = [
+    ("Solana ETFs surge in early trading", "Strong rotational flows into risk-on assets."),
+    ("SEC delays ruling on spot ether staking", "Regulators pushed the decision to next quarter."),
+    ("Bridge exploit drains $40M from L2 protocol", "Attackers used a forged proof on the bridge."),
+    ("Bitcoin miners sell as hashprice hits low", "Post-halving margins squeeze public miners."),
+    ("AI startup raises $55M for LLM hardware", "An AI company raised capital for faster chips."),
+]
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+
+@contextlib.contextmanager
+def _scratch_paths():
+    """Point director state, TTS output and the usage log at a temp dir."""
+    from script_engine.audio import tts_renderer
+    from script_engine.director import director_state
+    from script_engine.character_brain import character_store
+    from script_engine import llm_usage
+
+    tmp = tempfile.mkdtemp(prefix="toknnews-bench-")
+    saved = (director_state.STATE_PATH, tts_renderer.AUDIO_DIR, llm_usage.USAGE_LOG)
+    default = lambda: copy.deepcopy(director_state.DEFAULT_STATE)
+    character_store.register("director_state", os.path.join(tmp, "director_state.json"), default=default)
+    director_state.STATE_PATH = os.path.join(tmp, "director_state.json")
+    tts_renderer.AUDIO_DIR = os.path.join(tmp, "audio")
+    os.makedirs(tts_renderer.AUDIO_DIR, exist_ok=True)
+    llm_usage.USAGE_LOG = os.path.join(tmp, "llm_usage.jsonl")
+    try:
+        yield tmp
+    finally:
+        character_store.flush()      # pending bench writes land in tmp, not at exit
+        director_state.STATE_PATH, tts_renderer.AUDIO_DIR, llm_usage.USAGE_LOG = saved
+        character_store.register("director_state", director_state.STATE_PATH, default=default)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench(n=10, tts=True):
+    server = serve(port=0, background=True)
+    point_engine_at(server)
+    os.environ.setdefault("TOKN_LLM_CACHE", "0")   # measure the pipeline, not the cache
+
+    from script_engine.script_engine_v3 import generate_script
+    from script_engine.audio.tts_renderer import render_block
+    from script_engine.character_brain.persona_loader import get_voice
+
+    try:
+        with _scratch_paths():
+            _run_bench(n, tts, generate_script, render_block, get_voice)
+    finally:
+        server.shutdown()
+
+
+def _run_bench(n, tts, generate_script, render_block, get_voice):
+    script_ms, tts_ms, lines = [], [], 0
+    for i in range(n):
+        headline, context = BENCH_HEADLINES[i % len(BENCH_HEADLINES)]
+        t0 = time.perf_counter()
+        pkg = generate_script(headline=headline, article_context=context, cluster_articles=[])
+        script_ms.append((time.perf_counter() - t0) * 1000)
+        lines += len(pkg["timeline"])
+        if tts:
+            t0 = time.perf_counter()
+            for seq, entry in enumerate(pkg["timeline"]):
+                render_block({"voice_id": get_voice(entry["speaker"]), "text": entry["text"],
+                              "block_type": entry["type"], "timestamp": time.time(), "seq": seq},
+                             f"standin_bench_{i}")
+            tts_ms.append((time.perf_counter() - t0) * 1000)
+
+    print(f"[Standin] {n} scripts, {lines} lines, stand-in calls {STATS}")
+    print(f"  generate_script  p50 {_pct(script_ms, 0.5):8.0f} ms   p95 {_pct(script_ms, 0.95):8.0f} ms")
+    if tts_ms:
+        print(f"  tts (serial)     p50 {_pct(tts_ms, 0.5):8.0f} ms   p95 {_pct(tts_ms, 0.95):8.0f} ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--bench":
+        bench(int(args[1]) if len(args) > 1 else 10, tts="--no-tts" not in args)
+    else:
+        port = int(args[args.index("--port") + 1]) if "--port" in args else 8788
+        host = args[args.index("--host") + 1] if "--host" in args else "127.0.0.1"
+        serve(host, port)
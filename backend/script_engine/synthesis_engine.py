@@ -9,7 +9,8 @@ It produces a safe, concise, deterministic summary
 that blends the headline with optional cluster articles.
 """
 
-import re
+from script_engine.keyword_matcher import labels
+
 
 def _clean(text: str) -> str:
     if not text:
@@ -25,24 +26,8 @@ def _extract_keywords(text: str):
     if not text:
         return []
 
-    text = text.lower()
-    keys = []
-
-    KEYWORDS = [
-        "bitcoin", "btc",
-        "ethereum", "eth",
-        "solana", "sol",
-        "etf", "inflation", "rates",
-        "regulation", "sec", "lawsuit",
-        "yield", "liquidity", "staking",
-        "volatility", "volume"
-    ]
-
-    for k in KEYWORDS:
-        if k in text:
-            keys.append(k)
-
-    return list(dict.fromkeys(keys))  # unique, deterministic order
+    # unique, in keyword_matcher.KEYWORDS["synthesis"] order
+    return labels(text, "synthesis")
 
 
 def build_synthesis(headline: str, cluster_articles: list):
@@ -4,7 +4,9 @@ TOKNNews — Unreal Export Bridge (Module C-9)
 Creates a standardized export JSON for Unreal Engine.
 """
 
-import os, json, time
+import time
+
+from script_engine.jsonio import write_json
 
 EXPORT_PATH = "/var/www/toknnews/data/unreal_export.json"
 
@@ -29,10 +31,7 @@ def export_unreal_package(scene_dict):
 
         }
 
-        tmp = EXPORT_PATH + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(package, f, indent=2)
-        os.replace(tmp, EXPORT_PATH)
+        write_json(EXPORT_PATH, package)
 
         print(f"[UnrealExport] ✔ Exported → {EXPORT_PATH}")
     except Exception as e: